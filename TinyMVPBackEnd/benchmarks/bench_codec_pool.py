@@ -0,0 +1,104 @@
+# benchmarks/bench_codec_pool.py
+"""
+Phrase decode / section encode throughput: one ffmpeg process per file
+(ffmpeg_stream.iter_decode / StreamingEncoder, sequential and from a
+thread pool) vs CodecPool's batches of files per ffmpeg process.
+
+Inputs are synthetic MP3 phrases (2-4 s, 24 kHz mono, like the speech
+endpoint's); encodes write every phrase back out as MP3.
+
+Run from TinyMVPBackEnd/:
+    python -m benchmarks.bench_codec_pool
+    python -m benchmarks.bench_codec_pool --phrases 300 --workers 4 --batch-size 16
+"""
+
+import argparse
+import os
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from benchmarks.mock_speech import FRAME_RATE
+from benchmarks.bench_time_stretch import synthetic_speech
+from src.core.codec_pool import CodecPool
+from src.core.ffmpeg_stream import StreamingEncoder, iter_decode
+
+
+def make_phrases(workdir: Path, n: int, pool: CodecPool) -> list[Path]:
+    speech = synthetic_speech(n * 3 / 60)
+    frame_bytes = 2
+    jobs, pos = [], 0
+    for i in range(n):
+        length = (2 + i % 3) * FRAME_RATE * frame_bytes
+        jobs.append({"pcm": speech[pos:pos + length], "output": workdir / f"phrase_{i:03d}.mp3",
+                     "frame_rate": FRAME_RATE, "channels": 1})
+        pos = (pos + length) % max(1, len(speech) - 4 * FRAME_RATE * frame_bytes)
+    return pool.encode_many(jobs)
+
+
+def decode_one(path: Path) -> bytes:
+    return b"".join(iter_decode(path, FRAME_RATE, 1))
+
+
+def encode_one(job: tuple[bytes, Path]):
+    pcm, output = job
+    with StreamingEncoder(output, FRAME_RATE, 1) as enc:
+        enc.write(pcm)
+
+
+def timed(fn, *args):
+    started = time.perf_counter()
+    result = fn(*args)
+    return time.perf_counter() - started, result
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--phrases", type=int, default=120)
+    ap.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    ap.add_argument("--batch-size", type=int, default=32)
+    args = ap.parse_args()
+
+    pool = CodecPool(args.workers, args.batch_size)
+    with tempfile.TemporaryDirectory(prefix="bench_codec_") as tmp:
+        workdir = Path(tmp)
+        files = make_phrases(workdir, args.phrases, pool)
+        n = len(files)
+
+        rows = []
+        seconds, reference = timed(lambda: [decode_one(f) for f in files])
+        rows.append(("decode: spawn per file", seconds, n))
+        with ThreadPoolExecutor(args.workers) as threads:
+            seconds, _ = timed(lambda: list(threads.map(decode_one, files)))
+        rows.append((f"decode: spawn per file x{args.workers} threads", seconds, n))
+        before = pool.spawns
+        seconds, pcms = timed(pool.decode_many, files, FRAME_RATE, 1)
+        rows.append(("decode: CodecPool", seconds, pool.spawns - before))
+        if pcms != reference:
+            print("WARNING: CodecPool decode differs from iter_decode")
+
+        out_dir = workdir / "out"
+        out_dir.mkdir()
+        jobs = [(pcm, out_dir / f"spawn_{i:03d}.mp3") for i, pcm in enumerate(reference)]
+        seconds, _ = timed(lambda: [encode_one(job) for job in jobs])
+        rows.append(("encode: spawn per file", seconds, n))
+        with ThreadPoolExecutor(args.workers) as threads:
+            seconds, _ = timed(lambda: list(threads.map(encode_one, jobs)))
+        rows.append((f"encode: spawn per file x{args.workers} threads", seconds, n))
+        before = pool.spawns
+        seconds, _ = timed(pool.encode_many, [
+            {"pcm": pcm, "output": out_dir / f"pool_{i:03d}.mp3", "frame_rate": FRAME_RATE, "channels": 1}
+            for i, pcm in enumerate(reference)
+        ])
+        rows.append(("encode: CodecPool", seconds, pool.spawns - before))
+    pool.shutdown()
+
+    print(f"{n} phrases, {args.workers} workers, batches of <= {args.batch_size}\n")
+    print(f"{'method':<36} {'seconds':>8} {'ms / file':>10} {'ffmpeg runs':>12}")
+    for name, seconds, spawns in rows:
+        print(f"{name:<36} {seconds:>8.3f} {seconds / n * 1000:>10.2f} {spawns:>12}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+# benchmarks/bench_concat.py
+"""
+Concatenation scaling: repeated `combined += phrase + silence` vs the
+preallocated PCMConcatenator, on synthetic lessons.
+
+Works on raw PCM bytes (the same operation pydub performs inside
+AudioSegment.__add__), so it runs without pydub/ffmpeg.
+
+Run from TinyMVPBackEnd/:
+    python -m benchmarks.bench_concat
+    python -m benchmarks.bench_concat --sizes 100 1000 5000 --naive-max 1000
+"""
+
+import argparse
+import random
+import time
+
+from src.core.pcm_buffer import PCMConcatenator
+
+FRAME_RATE = 24000      # gpt-4o-mini-tts output rate
+SAMPLE_WIDTH = 2
+SILENCE_MS = 4500
+
+
+def synthetic_lesson(n_phrases: int, seed: int = 0) -> list[bytes]:
+    """Phrases of 1-4 s of PCM; content is irrelevant, only sizes matter."""
+    rng = random.Random(seed)
+    pool = [rng.randbytes(int(FRAME_RATE * s) * SAMPLE_WIDTH) for s in (1.0, 1.8, 2.5, 4.0)]
+    return [pool[rng.randrange(len(pool))] for _ in range(n_phrases)]
+
+
+def naive(chunks: list[bytes], silence_ms: int) -> bytes:
+    silence = b"\0" * (int(FRAME_RATE * silence_ms / 1000) * SAMPLE_WIDTH)
+    combined = b""
+    for chunk in chunks:
+        combined += chunk + silence       # what `combined += seg + silence` does
+    return combined
+
+
+def preallocated(chunks: list[bytes], silence_ms: int) -> bytearray:
+    return PCMConcatenator(FRAME_RATE, 1, SAMPLE_WIDTH).concat_raw(chunks, silence_ms)
+
+
+def timed(fn, *args):
+    started = time.perf_counter()
+    out = fn(*args)
+    return time.perf_counter() - started, len(out)
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 5000])
+    ap.add_argument("--naive-max", type=int, default=1000,
+                    help="skip the quadratic baseline above this many phrases")
+    args = ap.parse_args()
+
+    print(f"{'phrases':>8} {'audio (min)':>12} {'MB':>8} {'naive (s)':>10} {'prealloc (s)':>13} {'speedup':>8}")
+    for n in args.sizes:
+        chunks = synthetic_lesson(n)
+        t_fast, size = timed(preallocated, chunks, SILENCE_MS)
+        minutes = size / (FRAME_RATE * SAMPLE_WIDTH) / 60
+
+        if n <= args.naive_max:
+            t_naive, _ = timed(naive, chunks, SILENCE_MS)
+            naive_col, speedup = f"{t_naive:10.3f}", f"{t_naive / t_fast:7.1f}x"
+        else:
+            naive_col, speedup = f"{'skipped':>10}", f"{'-':>8}"
+
+        print(f"{n:>8} {minutes:>12.1f} {size / 1e6:>8.1f} {naive_col} {t_fast:>13.3f} {speedup}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,204 @@
+# benchmarks/bench_suite.py
+"""
+End-to-end lesson build benchmark against a mock speech endpoint.
+
+Scenarios, per lesson size:
+  parse       PhraseParser on a synthetic lesson file
+  synthesize  TTSEngine.synthesize_many fan-out against MockSpeechBackend
+              (latency, jitter, error rate and payload are configurable)
+  decode      phrase WAVs -> PCM
+  stitch      PCMConcatenator: phrases + silences -> lesson PCM
+  slow        WSOLA time stretch of the whole lesson (SLOW_FACTOR)
+  export      lesson -> WAV, and -> MP3 through ffmpeg when it is installed
+
+Nothing touches the network and every input is seeded, so runs are
+comparable. Results go to a JSON file; pass a previous one as --baseline
+to print the change per scenario.
+
+Run from TinyMVPBackEnd/:
+    python -m benchmarks.bench_suite
+    python -m benchmarks.bench_suite --sizes 20 100 --latency 0.5 --error-rate 0.05
+    python -m benchmarks.bench_suite --out benchmarks/results/new.json \\
+        --baseline benchmarks/results/baseline.json
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import shutil
+import tempfile
+import time
+import wave
+from datetime import datetime
+from pathlib import Path
+
+from benchmarks.mock_speech import FRAME_RATE, MockSpeechBackend, synthetic_lesson_text
+from src.core.ffmpeg_stream import FFMPEG, StreamingEncoder
+from src.core.pcm_buffer import PCMConcatenator
+from src.core.phrase_parser import PhraseParser
+from src.core.time_stretch import stretch_pcm
+from src.core.tts_engine import TTSEngine
+
+SILENCE_MS = 4500       # config.SILENCE_BETWEEN_PHRASES_MS
+SLOW_FACTOR = 0.90      # config.SLOW_FACTOR
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+
+
+def timed(fn, *args, repeat: int = 1, **kwargs):
+    """Best of `repeat` runs -> (seconds, last return value)."""
+    best, out = float("inf"), None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        out = fn(*args, **kwargs)
+        best = min(best, time.perf_counter() - started)
+    return best, out
+
+
+def read_pcm(path: Path) -> bytes:
+    with wave.open(str(path), "rb") as w:
+        return w.readframes(w.getnframes())
+
+
+def write_wav(path: Path, pcm: bytes):
+    with wave.open(str(path), "wb") as w:
+        w.setnchannels(1)
+        w.setsampwidth(2)
+        w.setframerate(FRAME_RATE)
+        w.writeframes(pcm)
+
+
+def export_mp3(path: Path, pcm: bytes):
+    with StreamingEncoder(path, FRAME_RATE, 1) as enc:
+        enc.write(pcm)
+
+
+def run_size(n: int, args, workdir: Path) -> dict:
+    results = {}
+    audio_s = lambda pcm: len(pcm) / (FRAME_RATE * 2)
+
+    # parse
+    text = synthetic_lesson_text(n, seed=args.seed)
+    t, parsed = timed(PhraseParser().parse, text, repeat=5)
+    phrases = [p["en"] for p in parsed["phrases"]] + [p["es"] for p in parsed["spanish_spoken"]]
+    results["parse"] = {"seconds": t, "phrases": len(phrases), "bytes": len(text.encode("utf-8"))}
+
+    # synthesize
+    backend = MockSpeechBackend(
+        latency_s=args.latency, jitter_s=args.jitter, error_rate=args.error_rate,
+        payload_s=args.payload_s, seed=args.seed,
+    )
+    tts = TTSEngine(backend=backend, voice="mock", max_concurrency=args.concurrency,
+                    max_retries=8, backoff_base_s=args.latency / 4 or 0.01, backoff_cap_s=2.0)
+    jobs = [{"text": p, "out": workdir / f"phrase_{i:04d}.wav"} for i, p in enumerate(phrases)]
+    with contextlib.redirect_stdout(io.StringIO()):
+        t, synth = timed(tts.synthesize_many, jobs)
+    latencies = sorted(r["latency_s"] for r in synth)
+    results["synthesize"] = {
+        "seconds": t,
+        "phrases_per_s": len(jobs) / t,
+        "p50_s": latencies[len(latencies) // 2],
+        "max_s": latencies[-1],
+        "requests": backend.requests,
+        "errors": backend.errors,
+        "concurrency": args.concurrency,
+    }
+
+    # decode
+    t, chunks = timed(lambda: [read_pcm(j["out"]) for j in jobs])
+    results["decode"] = {"seconds": t, "bytes": sum(map(len, chunks))}
+
+    # stitch
+    concat = PCMConcatenator(FRAME_RATE, 1, 2)
+    t, lesson = timed(concat.concat_raw, chunks, SILENCE_MS, repeat=3)
+    lesson = bytes(lesson)
+    results["stitch"] = {"seconds": t, "bytes": len(lesson), "audio_s": audio_s(lesson)}
+
+    # slow
+    if audio_s(lesson) <= args.slow_max_s:
+        t, slowed = timed(stretch_pcm, lesson, [SLOW_FACTOR], FRAME_RATE, 1)
+        results["slow"] = {"seconds": t, "audio_s": audio_s(lesson),
+                           "x_realtime": audio_s(lesson) / t}
+    else:
+        results["slow"] = {"skipped": f"lesson longer than --slow-max-s {args.slow_max_s}"}
+
+    # export
+    t, _ = timed(write_wav, workdir / "full_normal.wav", lesson)
+    results["export_wav"] = {"seconds": t, "bytes": (workdir / "full_normal.wav").stat().st_size}
+    if shutil.which(FFMPEG):
+        t, _ = timed(export_mp3, workdir / "full_normal.mp3", lesson)
+        results["export_mp3"] = {"seconds": t, "bytes": (workdir / "full_normal.mp3").stat().st_size,
+                                 "x_realtime": audio_s(lesson) / t}
+    else:
+        results["export_mp3"] = {"skipped": "ffmpeg not found"}
+
+    return results
+
+
+def compare(current: dict, baseline: dict):
+    print(f"\n{'scenario':<22} {'baseline s':>11} {'now s':>9} {'change':>8}")
+    for size, scenarios in current["results"].items():
+        for name, row in scenarios.items():
+            old = baseline.get("results", {}).get(size, {}).get(name, {})
+            if "seconds" not in row or "seconds" not in old:
+                continue
+            change = (row["seconds"] - old["seconds"]) / old["seconds"] if old["seconds"] else 0.0
+            # Ignore noise on sub-5ms scenarios
+            flag = "  <- slower" if change > 0.10 and row["seconds"] - old["seconds"] > 0.005 else ""
+            print(f"{size + '/' + name:<22} {old['seconds']:>11.4f} {row['seconds']:>9.4f} {change:>+8.0%}{flag}")
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--sizes", type=int, nargs="+", default=[20, 100, 300], help="phrases per lesson")
+    ap.add_argument("--latency", type=float, default=0.3, help="mock request latency (s)")
+    ap.add_argument("--jitter", type=float, default=0.2, help="extra uniform latency (s)")
+    ap.add_argument("--error-rate", type=float, default=0.02, help="fraction of failed requests")
+    ap.add_argument("--payload-s", type=float, default=None,
+                    help="fixed seconds of audio per phrase (default: follows text length)")
+    ap.add_argument("--concurrency", type=int, default=6)
+    ap.add_argument("--slow-max-s", type=float, default=3600, help="skip WSOLA above this lesson length")
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--out", type=Path, default=RESULTS_DIR / "latest.json")
+    ap.add_argument("--baseline", type=Path, default=None, help="previous results to compare against")
+    args = ap.parse_args()
+
+    report = {
+        "meta": {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "args": {k: v for k, v in vars(args).items() if k not in ("out", "baseline")},
+        },
+        "results": {},
+    }
+
+    for n in args.sizes:
+        print(f"Running {n} phrases...")
+        with tempfile.TemporaryDirectory(prefix="bench_suite_") as tmp:
+            rows = run_size(n, args, Path(tmp))
+        report["results"][str(n)] = rows
+
+        for name, row in rows.items():
+            if "skipped" in row:
+                print(f"  {name:<12} skipped ({row['skipped']})")
+                continue
+            extra = ", ".join(
+                f"{k}={v:.2f}" if isinstance(v, float) else f"{k}={v}"
+                for k, v in row.items() if k != "seconds"
+            )
+            print(f"  {name:<12} {row['seconds']:>9.4f}s  {extra}")
+
+    args.out.parent.mkdir(parents=True, exist_ok=True)
+    args.out.write_text(json.dumps(report, indent=2), encoding="utf-8")
+    print(f"\nResults: {args.out}")
+
+    if args.baseline:
+        compare(report, json.loads(args.baseline.read_text(encoding="utf-8")))
+
+
+if __name__ == "__main__":
+    main()
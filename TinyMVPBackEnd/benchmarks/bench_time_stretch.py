@@ -0,0 +1,73 @@
+# benchmarks/bench_time_stretch.py
+"""
+Slow-down throughput: legacy frame-rate rewrite + resample (what
+AudioPostProcessor.slow_down did, via audioop.ratecv like pydub's
+set_frame_rate) vs the pitch-preserving WSOLA stretcher, single factor
+and several factors in one pass.
+
+Run from TinyMVPBackEnd/:
+    python -m benchmarks.bench_time_stretch
+    python -m benchmarks.bench_time_stretch --minutes 10 --factors 0.75 0.85 0.9
+"""
+
+import argparse
+import audioop
+import time
+
+import numpy as np
+
+from src.core.time_stretch import float_to_pcm, stretch_pcm
+
+FRAME_RATE = 24000
+
+
+def synthetic_speech(minutes: float, seed: int = 0) -> bytes:
+    """Harmonic 'voice' with syllable-rate amplitude modulation and pauses."""
+    rng = np.random.default_rng(seed)
+    t = np.arange(int(minutes * 60 * FRAME_RATE)) / FRAME_RATE
+    f0 = 140 + 20 * np.sin(2 * np.pi * 0.3 * t)
+    phase = 2 * np.pi * np.cumsum(f0) / FRAME_RATE
+    voice = sum(np.sin(k * phase) / k for k in range(1, 8))
+    envelope = np.clip(np.sin(2 * np.pi * 4 * t), 0, None) * (np.sin(2 * np.pi * 0.2 * t) > -0.3)
+    noise = 0.01 * rng.standard_normal(len(t))
+    return float_to_pcm((0.2 * voice * envelope + noise).astype(np.float32)[:, None])
+
+
+def legacy_resample(pcm: bytes, factor: float) -> bytes:
+    out, _ = audioop.ratecv(pcm, 2, 1, int(FRAME_RATE * factor), FRAME_RATE, None)
+    return out
+
+
+def timed(fn, *args):
+    started = time.perf_counter()
+    fn(*args)
+    return time.perf_counter() - started
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--minutes", type=float, default=5.0, help="length of the synthetic lesson")
+    ap.add_argument("--factors", type=float, nargs="+", default=[0.75, 0.85, 0.90])
+    args = ap.parse_args()
+
+    pcm = synthetic_speech(args.minutes)
+    first = args.factors[0]
+
+    rows = [
+        (f"legacy resample x1 ({first})", 1, timed(legacy_resample, pcm, first)),
+        (f"wsola x1 ({first})", 1, timed(stretch_pcm, pcm, [first], FRAME_RATE)),
+        (f"legacy resample x{len(args.factors)}", len(args.factors),
+         timed(lambda: [legacy_resample(pcm, f) for f in args.factors])),
+        (f"wsola x{len(args.factors)} (one pass)", len(args.factors),
+         timed(stretch_pcm, pcm, args.factors, FRAME_RATE)),
+    ]
+
+    print(f"{args.minutes:g} min of 24 kHz mono input\n")
+    print(f"{'method':<28} {'seconds':>8} {'s / audio-min / factor':>23} {'x realtime':>11}")
+    for name, n_factors, seconds in rows:
+        per_min = seconds / args.minutes / n_factors
+        print(f"{name:<28} {seconds:>8.3f} {per_min:>23.4f} {60 / per_min:>10.0f}x")
+
+
+if __name__ == "__main__":
+    main()
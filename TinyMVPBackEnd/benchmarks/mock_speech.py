@@ -0,0 +1,135 @@
+# benchmarks/mock_speech.py
+"""
+Local stand-in for the speech endpoint, plus synthetic lessons.
+
+MockSpeechBackend plugs into TTSEngine(backend=...) exactly where
+OpenAIBackend does, so synthesize_many's fan-out, batching, retries and
+the synthesis cache are exercised without network or API credits:
+
+    backend = MockSpeechBackend(latency_s=0.4, jitter_s=0.2, error_rate=0.05)
+    tts = TTSEngine(backend=backend, max_concurrency=6, backoff_base_s=0.05)
+
+Payload is either a canned file (e.g. a real MP3 from a previous build,
+returned for every phrase) or a generated 24 kHz PCM WAV whose length
+follows the text, like real speech.
+"""
+
+import io
+import random
+import threading
+import time
+import wave
+from pathlib import Path
+
+import numpy as np
+
+from src.core.tts_backends import TTSBackend
+
+FRAME_RATE = 24000      # gpt-4o-mini-tts output rate
+
+
+class MockSpeechError(Exception):
+    """Simulated 429 / 5xx; TTSEngine retries it like the real ones."""
+
+    response = None
+
+
+class MockSpeechBackend(TTSBackend):
+    """
+    - latency_s / jitter_s: per request, uniform in [latency, latency + jitter]
+    - error_rate:           probability a request fails with MockSpeechError
+    - seconds_per_char:     generated audio length (~15 chars/s of speech)
+    - payload_s:            fixed audio length per phrase instead
+    - payload_file:         canned MP3/WAV returned for every phrase instead
+    - paragraph_pause_s:    silence at each blank line of the input, like the
+                            real voices (packed requests, see phrase_packing)
+    """
+
+    model_id = "mock-tts"
+    retryable_errors = (MockSpeechError,)
+    supports_instructions = True      # any voice / instructions, like the speech API
+
+    def __init__(self, latency_s: float = 0.3, jitter_s: float = 0.2, error_rate: float = 0.0,
+                 seconds_per_char: float = 0.065, payload_s: float | None = None,
+                 payload_file: str | Path | None = None, seed: int = 0,
+                 paragraph_pause_s: float = 0.5):
+        self.latency_s = latency_s
+        self.jitter_s = jitter_s
+        self.error_rate = error_rate
+        self.seconds_per_char = seconds_per_char
+        self.payload_s = payload_s
+        self.paragraph_pause_s = paragraph_pause_s
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.errors = 0
+
+        self._canned = None
+        if payload_file:
+            payload_file = Path(payload_file)
+            self._canned = payload_file.read_bytes()
+            self.file_suffix = payload_file.suffix
+        else:
+            self.file_suffix = ".wav"
+            # One second of a quiet tone, tiled to the wanted length
+            t = np.arange(FRAME_RATE) / FRAME_RATE
+            self._tone = (0.2 * 32767 * np.sin(2 * np.pi * 220 * t)).astype("<i2")
+
+    def synthesize_to_file(self, text: str, voice: str, target: Path, instructions: str | None = None):
+        with self._lock:
+            self.requests += 1
+            delay = self.latency_s + self._rng.uniform(0, self.jitter_s)
+            fail = self._rng.random() < self.error_rate
+            if fail:
+                self.errors += 1
+
+        time.sleep(delay)
+        if fail:
+            raise MockSpeechError(f"simulated failure for {text[:30]!r}")
+
+        Path(target).write_bytes(self._canned if self._canned is not None else self.wav_bytes(text))
+
+    def wav_bytes(self, text: str) -> bytes:
+        pause = np.zeros(int(FRAME_RATE * self.paragraph_pause_s), dtype="<i2")
+        parts = []
+        for paragraph in text.split("\n\n"):
+            seconds = self.payload_s if self.payload_s is not None else len(paragraph) * self.seconds_per_char
+            parts += [np.resize(self._tone, max(1, int(FRAME_RATE * seconds))), pause]
+        pcm = np.concatenate(parts[:-1])
+
+        buf = io.BytesIO()
+        with wave.open(buf, "wb") as w:
+            w.setnchannels(1)
+            w.setsampwidth(2)
+            w.setframerate(FRAME_RATE)
+            w.writeframes(pcm.tobytes())
+        return buf.getvalue()
+
+
+# ----------------------------------------
+# Synthetic lessons (PhraseParser format)
+# ----------------------------------------
+_EN = ["I", "we", "they", "my client", "the architect", "our team"]
+_VERB = ["need", "prefer", "design", "review", "deliver", "choose"]
+_OBJ = ["the kitchen layout", "a custom sofa", "natural materials", "the lighting plan",
+        "a larger window", "the final budget", "oak flooring", "the delivery date"]
+_TAIL = ["this week.", "before Friday.", "for the new flat.", "with more detail.", "as soon as possible."]
+_ES = ["Necesitamos revisar", "Prefiero elegir", "Vamos a diseñar", "Hay que entregar"]
+
+
+def synthetic_lesson_text(n_phrases: int, n_spanish: int = 3, seed: int = 0) -> str:
+    """
+    A lesson file with `n_spanish` ¿¿ intro lines and `n_phrases`
+    English / Spanish pairs. Phrases are unique, so nothing is served
+    from the synthesis cache by accident.
+    """
+    rng = random.Random(seed)
+    lines = [f"# synthetic lesson: {n_phrases} phrases (seed {seed})"]
+    for i in range(n_spanish):
+        lines.append(f"¿¿ {rng.choice(_ES)} el proyecto número {i + 1} con calma.")
+    lines.append("")
+    for i in range(n_phrases):
+        en = f"{rng.choice(_EN)} {rng.choice(_VERB)} {rng.choice(_OBJ)} {rng.choice(_TAIL)}"
+        es = f"{rng.choice(_ES)} {rng.choice(_OBJ)} (frase {i + 1})."
+        lines.append(f"{en[0].upper()}{en[1:-1]} ({i + 1}). / {es}")
+    return "\n".join(lines)
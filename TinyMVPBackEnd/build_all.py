@@ -0,0 +1,211 @@
+# build_all.py
+"""
+Builds every lesson file in config.TXT_INPUT_DIR in one run.
+
+  1. Plan all lessons (parse + diff against each lesson's build manifest)
+  2. Synthesize every new phrase once, even if several lessons share it,
+     with TTSEngine.synthesize_many (network-bound, threads)
+  3. Render lessons in parallel across a process pool (CPU-bound decode,
+     stitch, encode). Each lesson only writes inside its own
+     lesson_output/<name>/ folder, and only this parent process touches
+     the synthesis cache, so N workers never clobber each other.
+
+Usage (from TinyMVPBackEnd/):
+    python build_all.py
+    python build_all.py --workers 4 --pattern "W*.txt"
+    python build_all.py --preview      # lesson lengths only, nothing synthesized
+"""
+
+import argparse
+import os
+import shutil
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+from src.core import instrumentation as trace
+from src.core.tts_engine import TTSEngine
+from src.core.synthesis_cache import SynthesisCache
+from src.core.lesson_builder import plan_lesson, preview_lesson, render_plan_worker
+from src import config
+
+
+def discover_lessons(input_dir: Path, pattern: str) -> list[Path]:
+    files = sorted(p for p in input_dir.glob(pattern) if p.is_file())
+
+    # Output folders are named after the file stem: refuse collisions
+    seen = {}
+    for f in files:
+        if f.stem in seen:
+            raise SystemExit(f"Lesson name collision: {seen[f.stem]} and {f} both map to '{f.stem}'")
+        seen[f.stem] = f
+    return files
+
+
+def synthesize_deduplicated(tts: TTSEngine, cache: SynthesisCache, plans: list[dict]) -> dict:
+    """
+    Synthesizes each distinct phrase (by content key) once across all
+    lessons, then materializes the duplicates from the cache.
+    """
+    first_by_key = {}
+    duplicates = []
+    for plan in plans:
+        for job in plan["pending"]:
+            if job["key"] in first_by_key:
+                duplicates.append(job)
+            else:
+                first_by_key[job["key"]] = job
+
+    started = time.perf_counter()
+    if first_by_key:
+        tts.synthesize_many(list(first_by_key.values()))
+
+    for job in duplicates:
+        if cache.fetch(job["key"], job["out"]) is None:
+            # Evicted in between (tiny cache): copy the sibling lesson's file
+            shutil.copy2(first_by_key[job["key"]]["out"], job["out"])
+
+    return {
+        "unique": len(first_by_key),
+        "duplicates": len(duplicates),
+        "seconds": time.perf_counter() - started,
+    }
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Build every lesson in the Txts directory.")
+    ap.add_argument("--input-dir", type=Path, default=config.TXT_INPUT_DIR)
+    ap.add_argument("--pattern", default="*.txt", help="glob for lesson files (default: *.txt)")
+    ap.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                    help="render processes (default: CPU count)")
+    ap.add_argument("--preview", action="store_true",
+                    help="print planned lesson lengths (pause profiles applied) and exit")
+    args = ap.parse_args()
+
+    lesson_files = discover_lessons(args.input_dir, args.pattern)
+    if not lesson_files:
+        print(f"No lesson files matching {args.pattern} in {args.input_dir}")
+        return
+
+    print(f"Found {len(lesson_files)} lesson files in {args.input_dir}")
+
+    if args.preview:
+        preview(lesson_files)
+        return
+
+    build_trace = trace.start("build_all", config.TRACE_DIR) if config.TRACE_ENABLED else None
+    try:
+        with trace.profiled(config.PROFILER, config.TRACE_DIR / "profile_build_all"):
+            failed = build(lesson_files, args.workers, build_trace)
+    finally:
+        trace.finish()
+
+    if failed:
+        print(f"\n{len(failed)} lesson(s) failed: {', '.join(failed)}")
+        sys.exit(1)
+
+
+def preview(lesson_files: list[Path]):
+    """Planned length of every lesson, from cached durations (or text estimates)."""
+    tts = TTSEngine.from_config(None)
+    total = total_slow = 0.0
+    print(f"\n{'lesson':<28} {'phrases':>8} {'estimated':>10} {'pauses':>8} {'normal':>8} {'slow':>8}")
+    for f in lesson_files:
+        row = preview_lesson(f, tts)
+        if row is None:
+            print(f"{f.stem:<28} {'no valid phrases':>8}")
+            continue
+        total += row["duration_ms"]
+        total_slow += row["slow_duration_ms"]
+        print(
+            f"{row['name']:<28} {row['phrases']:>8} {row['estimated']:>10} "
+            f"{_mmss(row['pauses_ms']):>8} {_mmss(row['duration_ms']):>8} {_mmss(row['slow_duration_ms']):>8}"
+        )
+    print(f"\nCourse: {_mmss(total)} normal, {_mmss(total_slow)} slow "
+          f"(estimated = phrases never synthesized, sized from their text)")
+
+
+def _mmss(ms: float) -> str:
+    seconds = int(round(ms / 1000))
+    return f"{seconds // 60}:{seconds % 60:02d}"
+
+
+def build(lesson_files: list[Path], workers: int, build_trace=None) -> list[str]:
+    """Plans, synthesizes and renders `lesson_files`; returns the names that failed."""
+    cache = SynthesisCache(config.TTS_CACHE_DIR, max_bytes=config.TTS_CACHE_MAX_BYTES)
+    tts = TTSEngine.from_config(cache)
+
+    # -----------------------------------------------------------
+    # 1. Plan every lesson
+    # -----------------------------------------------------------
+    plans = []
+    summary = {}
+    for f in lesson_files:
+        started = time.perf_counter()
+        plan = plan_lesson(f, tts)
+        elapsed = time.perf_counter() - started
+        if plan is None:
+            print(f" → {f.name}: no valid phrases, skipped")
+            continue
+        plans.append(plan)
+        summary[plan["name"]] = {
+            "phrases": len(plan["normal_jobs"]) + len(plan["spanish_jobs"]),
+            "new": len(plan["pending"]),
+            "plan_s": elapsed,
+        }
+
+    # -----------------------------------------------------------
+    # 2. Synthesize (network, deduplicated across lessons)
+    # -----------------------------------------------------------
+    print("\nSynthesizing new phrases...")
+    synth = synthesize_deduplicated(tts, cache, plans)
+    print(
+        f" → {synth['unique']} unique phrases synthesized, "
+        f"{synth['duplicates']} shared with another lesson, {synth['seconds']:.1f}s"
+    )
+
+    # -----------------------------------------------------------
+    # 3. Render (CPU, process pool)
+    # -----------------------------------------------------------
+    print(f"\nRendering {len(plans)} lessons on {workers} workers...")
+    started = time.perf_counter()
+    failed = []
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(render_plan_worker, plan): plan["name"] for plan in plans}
+        for future in as_completed(futures):
+            name = futures[future]
+            try:
+                result = future.result()
+            except Exception as e:
+                print(f"[build_all] ERROR rendering {name}: {e}")
+                failed.append(name)
+                continue
+            if build_trace is not None:
+                build_trace.merge(result["trace"])
+            summary[name]["render_s"] = result["render_s"]
+            summary[name]["outputs"] = len(result["rendered"])
+            print(f" → {name}: {len(result['rendered'])} outputs in {result['render_s']:.1f}s")
+
+    render_wall = time.perf_counter() - started
+
+    # -----------------------------------------------------------
+    # 4. Summary
+    # -----------------------------------------------------------
+    print(f"\n{'lesson':<28} {'phrases':>8} {'new':>5} {'outputs':>8} {'plan s':>7} {'render s':>9}")
+    for name, row in summary.items():
+        render_s = f"{row['render_s']:9.2f}" if "render_s" in row else f"{'FAILED':>9}"
+        print(
+            f"{name:<28} {row['phrases']:>8} {row['new']:>5} {row.get('outputs', 0):>8} "
+            f"{row['plan_s']:>7.2f} {render_s}"
+        )
+    print(f"\nSynthesis: {synth['seconds']:.1f}s, render wall time: {render_wall:.1f}s")
+
+    stats = cache.stats()
+    print(f"TTS cache: {stats['hits']} hits, {stats['misses']} misses")
+    return failed
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+# cli.py
+"""
+One entry point for every tool, fast to start: each command imports what
+it needs when it runs, so `plan` never loads openai, pydub, numpy or an
+audio backend, and nothing opens a network connection until a phrase
+has to be synthesized.
+
+Usage (from TinyMVPBackEnd/):
+    python cli.py plan                          # config.DEFAULT_LESSON_FILE
+    python cli.py plan Txts/text1.txt Txts/pdf  # files and/or folders of lessons
+    python cli.py plan Txts --json              # one JSON row per lesson
+    python cli.py build [Txts/text1.txt]        # main.py
+    python cli.py build-all [--workers 4 ...]   # build_all.py
+    python cli.py ingest [--pattern ...]        # ingest_pdfs.py
+    python cli.py previews                      # generate_voices_previews.py
+
+`plan` is a dry run: it parses each lesson (PhraseParser), reads its last
+build manifest and the synthesis cache index, and reports phrase counts,
+characters and speech requests still to pay for, cache hits, and the
+planned lesson lengths. Nothing is written.
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+
+def plan(args):
+    from src.core.lesson_builder import dry_run_lesson
+    from src.core.synthesis_cache import SynthesisCache
+    from src.core.tts_engine import TTSEngine
+    from src import config
+
+    lesson_files = _lesson_files(args.paths or [config.DEFAULT_LESSON_FILE], args.pattern)
+    if not lesson_files:
+        print("No lesson files found.")
+        return 1
+
+    tts = TTSEngine.from_config(None)   # phrase keys only: no client, no model loaded
+    cached = SynthesisCache.indexed_keys(config.TTS_CACHE_DIR)
+    rows = []
+    for f in lesson_files:
+        row = dry_run_lesson(f, tts, cached)
+        rows.append(row if row is not None else {"name": f.stem, "phrases": 0})
+
+    if args.json:
+        for row in rows:
+            print(json.dumps(row, ensure_ascii=False))
+        return 0
+
+    print(f"{'lesson':<28} {'phrases':>8} {'¿¿':>4} {'unchanged':>10} {'cached':>7} "
+          f"{'requests':>9} {'chars':>8} {'normal':>7} {'slow':>7}")
+    for row in rows:
+        if not row["phrases"]:
+            print(f"{row['name']:<28} {'no valid phrases':>17}")
+            continue
+        print(
+            f"{row['name']:<28} {row['phrases']:>8} {row['spanish']:>4} {row['unchanged']:>10} "
+            f"{row['cache_hits']:>7} {row['requests']:>9} {row['characters']:>8} "
+            f"{_mmss(row['duration_ms']):>7} {_mmss(row['slow_duration_ms']):>7}"
+        )
+
+    built = [r for r in rows if r["phrases"]]
+    print(
+        f"\n{len(built)} lesson(s): {sum(r['requests'] for r in built)} speech request(s), "
+        f"{sum(r['characters'] for r in built)} characters to synthesize, "
+        f"{sum(r['cache_hits'] for r in built)} phrase(s) from the cache"
+    )
+    return 0
+
+
+def build(args):
+    import main as build_main
+
+    build_main.main(args.lesson)
+    return 0
+
+
+def forward(module: str):
+    """Runs a script's own main() with the remaining arguments (its argparse parses them)."""
+    def run(args):
+        sys.argv = [f"{module}.py"] + args.extra
+        __import__(module).main()
+        return 0
+    return run
+
+
+def _lesson_files(paths: list, pattern: str) -> list[Path]:
+    files = []
+    for p in map(Path, paths):
+        if p.is_dir():
+            files += sorted(f for f in p.glob(pattern) if f.is_file())
+        else:
+            files.append(p)
+    return files
+
+
+def _mmss(ms: float) -> str:
+    seconds = int(round(ms / 1000))
+    return f"{seconds // 60}:{seconds % 60:02d}"
+
+
+def main(argv: list[str] | None = None) -> int:
+    ap = argparse.ArgumentParser(description="Language course audio tools.")
+    commands = ap.add_subparsers(dest="command", required=True)
+
+    p = commands.add_parser("plan", help="dry run: what building the lessons would synthesize and produce")
+    p.add_argument("paths", nargs="*", help="lesson files or folders (default: config.DEFAULT_LESSON_FILE)")
+    p.add_argument("--pattern", default="*.txt", help="glob for lesson files inside folders (default: *.txt)")
+    p.add_argument("--json", action="store_true", help="one JSON object per lesson")
+    p.set_defaults(run=plan)
+
+    p = commands.add_parser("build", help="build one lesson (main.py)")
+    p.add_argument("lesson", nargs="?", type=Path, help="lesson file (default: config.DEFAULT_LESSON_FILE)")
+    p.set_defaults(run=build)
+
+    for name, module, help_text in (
+        ("build-all", "build_all", "build every lesson of a folder (build_all.py)"),
+        ("ingest", "ingest_pdfs", "generate lesson files from the course PDFs (ingest_pdfs.py)"),
+        ("previews", "generate_voices_previews", "synthesize a sample of every voice profile"),
+    ):
+        p = commands.add_parser(name, help=help_text, add_help=False)
+        p.set_defaults(run=forward(module), forwards=True)
+
+    # Forwarded commands hand every argument to the script's own parser
+    args, extra = ap.parse_known_args(argv)
+    if extra and not getattr(args, "forwards", False):
+        ap.error(f"unrecognized arguments: {' '.join(extra)}")
+    args.extra = extra
+    return args.run(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
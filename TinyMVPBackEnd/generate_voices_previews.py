@@ -19,23 +19,28 @@ def main():
 
     preview_map = {}
 
+    # One engine; every profile (voice, instructions, model) is a per-job
+    # override, so all previews run concurrently through synthesize_many
+    tts = TTSEngine(
+        model=config.DEFAULT_TTS_MODEL,
+        api_key=config.OPENAI_API_KEY,
+        max_concurrency=config.TTS_MAX_CONCURRENCY,
+        max_retries=config.TTS_MAX_RETRIES,
+    )
+    jobs = []
+
     for name, profile in VOICE_PROFILES.items():
         lang = profile["language"]
         folder = "english" if lang == "en" else "spanish"
         out_path = base_dir / folder / f"{name}.mp3"
 
-        tts = TTSEngine(
-            model=profile["model"],
-            voice=profile["voice"],
-            api_key=config.OPENAI_API_KEY,
-            #instructions=profile["instructions"]
-        )
-
-        print(f" → Generating preview for {name} -> {out_path}")
-        tts.synthesize(PREVIEW_TEXT[lang], out_path)
+        print(f" → Queued preview for {name} -> {out_path}")
+        jobs.append({"text": PREVIEW_TEXT[lang], "out": out_path, **tts.voice_settings(profile)})
 
         preview_map[name] = str(out_path)
 
+    tts.synthesize_many(jobs)
+
     # Save mapping
     with open(base_dir / "previews.json", "w", encoding="utf-8") as f:
         json.dump(preview_map, f, indent=2, ensure_ascii=False)
@@ -0,0 +1,67 @@
+# ingest_pdfs.py
+"""
+Generates lesson files from the course PDFs (see src/core/pdf_ingest.py).
+
+  1. Hash every PDF in config.PDF_INPUT_DIR (stat index: unchanged files
+     are not even re-read)
+  2. Extract the text of new / changed PDFs across a process pool;
+     everything else comes from config.PDF_CACHE_DIR
+  3. Write one "English / Spanish" lesson file per PDF into
+     config.PDF_LESSON_DIR, only where the content changed
+
+Usage (from TinyMVPBackEnd/):
+    python ingest_pdfs.py
+    python ingest_pdfs.py --pattern "W1*.pdf" --workers 4
+    python build_all.py --input-dir Txts/pdf
+"""
+
+import argparse
+import os
+import time
+from pathlib import Path
+
+from src.core.pdf_ingest import ingest_directory
+from src import config
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Generate lesson files from the course PDFs.")
+    ap.add_argument("--input-dir", type=Path, default=config.PDF_INPUT_DIR)
+    ap.add_argument("--output-dir", type=Path, default=config.PDF_LESSON_DIR)
+    ap.add_argument("--pattern", default="*.pdf", help="glob for PDF files (default: *.pdf)")
+    ap.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                    help="extraction processes (default: CPU count)")
+    args = ap.parse_args()
+
+    started = time.perf_counter()
+    rows = ingest_directory(args.input_dir, args.output_dir, config.PDF_CACHE_DIR,
+                            pattern=args.pattern, workers=args.workers)
+    if not rows:
+        print(f"No PDFs matching {args.pattern} in {args.input_dir}")
+        return
+
+    print(f"\n{'pdf':<60} {'phrases':>8} {'source':>8} {'lesson':>10}")
+    for row in rows:
+        if row["error"]:
+            lesson = "error"
+        elif row["removed"]:
+            lesson = "removed"
+        else:
+            lesson = "written" if row["written"] else ("unchanged" if row["phrases"] else "-")
+        print(f"{row['pdf'][:60]:<60} {row['phrases']:>8} "
+              f"{'cache' if row['cached'] else 'pdf':>8} {lesson:>10}")
+
+    written = sum(r["written"] for r in rows)
+    empty = [r["pdf"] for r in rows if not r["phrases"] and not r["error"]]
+    failed = [r["pdf"] for r in rows if r["error"]]
+    print(f"\n{len(rows)} PDFs, {sum(r['phrases'] for r in rows)} phrases, "
+          f"{written} lesson file(s) written to {args.output_dir} "
+          f"in {time.perf_counter() - started:.1f}s")
+    if empty:
+        print(f"No phrases found in: {', '.join(empty)}")
+    if failed:
+        print(f"Could not read: {', '.join(failed)}")
+
+
+if __name__ == "__main__":
+    main()
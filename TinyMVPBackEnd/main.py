@@ -2,144 +2,91 @@
 
 from pathlib import Path
 
-from src.core.phrase_parser import PhraseParser
+from src.core import instrumentation as trace
 from src.core.tts_engine import TTSEngine
 from src.core.audio_postprocessor import AudioPostProcessor
+from src.core.synthesis_cache import SynthesisCache
+from src.core.lesson_builder import plan_lesson, render_plan
+from src.core.lesson_pipeline import build_lesson_pipelined
 from src import config
 
 
-def main():
+def main(lesson_file: Path | None = None):
     # 1. Read phrases from txt file
-    lesson_file: Path = config.DEFAULT_LESSON_FILE
+    lesson_file = Path(lesson_file or config.DEFAULT_LESSON_FILE)
     print(f"Using lesson file: {lesson_file}")
 
-    raw_text = lesson_file.read_text(encoding="utf-8")
+    if config.TRACE_ENABLED:
+        trace.start(lesson_file.stem, config.TRACE_DIR)
+    try:
+        with trace.profiled(config.PROFILER, config.TRACE_DIR / f"profile_{lesson_file.stem}"):
+            build(lesson_file)
+    finally:
+        trace.finish()
 
-    print("Parsing phrases...")
-    parser = PhraseParser()
-
-    parsed = parser.parse(raw_text)  
-    phrases = parsed["phrases"]              # English/Spanish pairs
-    spanish_spoken = parsed["spanish_spoken"]  # ¿¿ Spanish-only lines
-
-    if not phrases and not spanish_spoken:
-        print("No valid phrases found in file. Check your input format.")
-        return
-
-    # 2. Prepare output folders
-    lesson_name = lesson_file.stem
-    lesson_root = config.OUTPUT_ROOT / lesson_name
-    normal_dir = lesson_root / "normal"
-    spanish_dir = lesson_root / "spanish_intro"
-    slow_dir = lesson_root / "slow"
 
-    normal_dir.mkdir(parents=True, exist_ok=True)
-    spanish_dir.mkdir(parents=True, exist_ok=True)
-    slow_dir.mkdir(parents=True, exist_ok=True)
+def build(lesson_file: Path):
 
-    # 3. Init TTS engine
+    # 2. Init TTS engine
     print("Initializing TTS engine...")
-    tts = TTSEngine(
-        model=config.DEFAULT_TTS_MODEL,
-        voice=config.DEFAULT_TTS_VOICE,
-        api_key=config.OPENAI_API_KEY,
-    )
-    post = AudioPostProcessor()
-
-    # -----------------------------------------------------------
-    # 4A. Generate English/Spanish per-phrase audio (main lesson)
-    # -----------------------------------------------------------
-    print("\nGenerating main lesson audio (normal speed)...")
-    normal_files: list[Path] = []
+    cache = SynthesisCache(config.TTS_CACHE_DIR, max_bytes=config.TTS_CACHE_MAX_BYTES)
+    tts = TTSEngine.from_config(cache)
+    post = AudioPostProcessor.from_config()
 
-    for idx, p in enumerate(phrases, start=1):
-        text_en = p["en"]
-        out_file = normal_dir / f"phrase_{idx:02d}.mp3"
-        print(f" → Lesson phrase: {text_en} -> {out_file.name}")
-        tts.synthesize(text_en, out_file)
-        normal_files.append(out_file)
-
-    # -----------------------------------------------------------
-    # 4B. Generate Spanish-only intro section (¿¿ phrases)
-    # -----------------------------------------------------------
-    spanish_files: list[Path] = []
-
-    if spanish_spoken:
-        print("\nGenerating Spanish-only intro audio (¿¿ tagged phrases)...")
-        for idx, p in enumerate(spanish_spoken, start=1):
-            text_es = p["es"]
-            out_file = spanish_dir / f"spanish_{idx:02d}.mp3"
-            print(f" → Spanish phrase: {text_es} -> {out_file.name}")
-            tts.synthesize(text_es, out_file)
-            spanish_files.append(out_file)
-    else:
-        print("\nNo ¿¿ Spanish phrases found.")
+    # 3. Parse phrases and diff against the previous build
+    print("Parsing phrases...")
+    plan = plan_lesson(lesson_file, tts)
 
-    # -----------------------------------------------------------
-    # 5. Post-processing: Silence profiles for both sections
-    # -----------------------------------------------------------
-    # Spanish intro section with its own silence
-    spanish_section_file = lesson_root / "section_spanish_intro.mp3"
-
-    if spanish_files:
-        print(
-            f"\nBuilding Spanish intro section with "
-            f"{config.SILENCE_SPANISH_SECTION_MS} ms silence..."
-        )
-        post.insert_silence_spanish(
-            [str(f) for f in spanish_files],
-            spanish_section_file,
-            ms_silence=config.SILENCE_SPANISH_SECTION_MS,
-        )
-    else:
-        # If no spanish section, create an empty file
-        spanish_section_file = None
+    if plan is None:
+        print("No valid phrases found in file. Check your input format.")
+        return
 
-    # Main lesson section
-    lesson_section_file = lesson_root / "section_main_lesson.mp3"
+    lesson_root = plan["root"]
+    total = len(plan["normal_jobs"]) + len(plan["spanish_jobs"])
     print(
-        f"Building main lesson section with "
-        f"{config.SILENCE_BETWEEN_PHRASES_MS} ms silence..."
-    )
-    post.insert_silence(
-        [str(f) for f in normal_files],
-        lesson_section_file,
-        ms_silence=config.SILENCE_BETWEEN_PHRASES_MS,
+        f" → {len(plan['normal_jobs'])} lesson phrases, "
+        f"{len(plan['spanish_jobs'])} ¿¿ Spanish phrases "
+        f"({total - len(plan['pending'])} unchanged, {len(plan['pending'])} to synthesize)"
     )
 
     # -----------------------------------------------------------
-    # 6. Combine Spanish section + Main lesson into full_normal
+    # 4 + 5. Generate per-phrase audio and render sections,
+    #        full_normal and full_slow (overlapped when pipelined)
     # -----------------------------------------------------------
-    full_normal = lesson_root / "full_normal.mp3"
-    print(f"\nCombining sections into: {full_normal.name}")
-
-    sections_to_join = []
-    if spanish_section_file:
-        sections_to_join.append(spanish_section_file)
-    sections_to_join.append(lesson_section_file)
-
-    post.insert_sections(
-        audio_files=[str(f) for f in sections_to_join],
-        output=full_normal
+    print(
+        f"\nRendering outputs (pause profiles {', '.join(config.PAUSE_PROFILES)}, "
+        f"slow factor {config.SLOW_FACTOR})..."
     )
+    if plan["pending"] and config.PIPELINED_BUILD:
+        print("Synthesizing and rendering in one pipeline...")
+        result = build_lesson_pipelined(plan, tts, post)
+    else:
+        if plan["pending"]:
+            print("\nGenerating phrase audio (normal speed)...")
+            tts.synthesize_many(plan["pending"])
+        result = render_plan(plan, post)
 
-    # -----------------------------------------------------------
-    # 7. Create slow version
-    # -----------------------------------------------------------
-    full_slow = lesson_root / "full_slow.mp3"
-    print(f"Creating slow version {full_slow.name} (factor {config.SLOW_FACTOR})...")
-    post.slow_down(full_normal, full_slow, factor=config.SLOW_FACTOR)
+    if result["rendered"]:
+        print(f" → rendered {len(result['rendered'])}, up to date {len(result['skipped'])}")
+    else:
+        print(" → all outputs up to date, nothing to render.")
 
     # -----------------------------------------------------------
-    # 8. Done
+    # 6. Done
     # -----------------------------------------------------------
     print("\nDone!")
     print(f"Lesson output folder: {lesson_root}")
     print(" Files:")
-    print(f"  - Spanish intro phrases: {spanish_dir}")
-    print(f"  - Main lesson phrases:   {normal_dir}")
-    print(f"  - Full normal:           {full_normal}")
-    print(f"  - Full slow:             {full_slow}")
+    print(f"  - Spanish intro phrases: {lesson_root / 'spanish_intro'}")
+    print(f"  - Main lesson phrases:   {lesson_root / 'normal'}")
+    print(f"  - Full normal:           {lesson_root / 'full_normal.mp3'}")
+    print(f"  - Full slow:             {lesson_root / 'full_slow.mp3'}")
+
+    stats = cache.stats()
+    print(
+        f"\nTTS cache: {stats['hits']} hits, {stats['misses']} misses, "
+        f"{stats['entries']} entries ({stats['bytes'] / 1e6:.1f} MB)"
+    )
 
 
 if __name__ == "__main__":
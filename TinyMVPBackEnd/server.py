@@ -0,0 +1,186 @@
+# server.py
+"""
+Long-running lesson rendering service (stdlib HTTP, no extra dependencies).
+
+    POST /lessons                    body: lesson text (text/plain) or
+                                     JSON {"text": ..., "name": ...}
+                                     -> 202 {"id", ...} (200 if an identical
+                                        lesson was already submitted)
+    GET  /lessons                    all jobs
+    GET  /lessons/<id>               job status: queued / synthesizing /
+                                     rendering / done / failed, outputs
+    GET  /lessons/<id>/files/<name>  download an output (Range supported,
+                                     see <output>.timeline.json for offsets)
+    GET  /health                     queue depth, job counts, cache stats
+
+Usage (from TinyMVPBackEnd/):
+    python server.py
+    python server.py --port 8080 --job-workers 8
+"""
+
+import argparse
+import json
+import re
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from src.core.tts_engine import TTSEngine
+from src.core.synthesis_cache import SynthesisCache
+from src.core.render_service import QueueFull, RenderService
+from src import config
+
+CONTENT_TYPES = {
+    ".mp3": "audio/mpeg",
+    ".opus": "audio/ogg; codecs=opus",
+    ".m4a": "audio/mp4",
+    ".wav": "audio/wav",
+    ".json": "application/json",
+}
+
+
+class LessonRequestHandler(BaseHTTPRequestHandler):
+    service: RenderService = None     # set by main()
+    server_version = "LessonRenderService/1.0"
+
+    # ----------------------------------------
+    # Routes
+    # ----------------------------------------
+    def do_POST(self):
+        if self.path.rstrip("/") != "/lessons":
+            return self._json(404, {"error": "not found"})
+
+        length = int(self.headers.get("Content-Length") or 0)
+        if length <= 0:
+            return self._json(400, {"error": "empty body"})
+        if length > config.SERVICE_MAX_BODY_BYTES:
+            return self._json(413, {"error": f"body larger than {config.SERVICE_MAX_BODY_BYTES} bytes"})
+
+        body = self.rfile.read(length).decode("utf-8", errors="replace")
+        name = None
+        if self.headers.get("Content-Type", "").startswith("application/json"):
+            try:
+                payload = json.loads(body)
+                text, name = payload["text"], payload.get("name")
+            except (ValueError, KeyError, TypeError):
+                return self._json(400, {"error": "expected JSON {\"text\": ..., \"name\": ...}"})
+        else:
+            text = body
+
+        try:
+            job, created = self.service.submit(text, name)
+        except ValueError as e:
+            return self._json(400, {"error": str(e)})
+        except QueueFull as e:
+            return self._json(503, {"error": f"queue full: {e}"}, {"Retry-After": "30"})
+
+        self._json(202 if created else 200, job, {"Location": f"/lessons/{job['id']}"})
+
+    def do_GET(self):
+        path = self.path.split("?", 1)[0].rstrip("/")
+
+        if path == "/health":
+            return self._json(200, self.service.stats())
+        if path == "/lessons":
+            return self._json(200, self.service.list_jobs())
+
+        m = re.fullmatch(r"/lessons/([0-9a-f]{16})", path)
+        if m:
+            job = self.service.status(m.group(1))
+            return self._json(200, job) if job else self._json(404, {"error": "unknown job"})
+
+        m = re.fullmatch(r"/lessons/([0-9a-f]{16})/files/([\w.-]+)", path)
+        if m:
+            artifact = self.service.artifact(m.group(1), m.group(2))
+            if artifact is None:
+                return self._json(404, {"error": "no such file (job unknown or not done)"})
+            return self._file(artifact)
+
+        self._json(404, {"error": "not found"})
+
+    # ----------------------------------------
+    # Responses
+    # ----------------------------------------
+    def _json(self, status: int, data, headers: dict | None = None):
+        body = json.dumps(data, ensure_ascii=False, indent=2).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        for k, v in (headers or {}).items():
+            self.send_header(k, v)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _file(self, path):
+        size = path.stat().st_size
+        start, end = 0, size - 1
+        status = 200
+
+        # Single byte range, e.g. one phrase from the timeline sidecar
+        m = re.fullmatch(r"bytes=(\d*)-(\d*)", self.headers.get("Range", "").strip())
+        if m and (m.group(1) or m.group(2)):
+            if m.group(1):
+                start = int(m.group(1))
+                end = min(int(m.group(2)), size - 1) if m.group(2) else size - 1
+            else:
+                start = max(0, size - int(m.group(2)))
+            if start > end or start >= size:
+                self.send_response(416)
+                self.send_header("Content-Range", f"bytes */{size}")
+                self.end_headers()
+                return
+            status = 206
+
+        self.send_response(status)
+        self.send_header("Content-Type", CONTENT_TYPES.get(path.suffix, "application/octet-stream"))
+        self.send_header("Content-Length", str(end - start + 1))
+        self.send_header("Accept-Ranges", "bytes")
+        if status == 206:
+            self.send_header("Content-Range", f"bytes {start}-{end}/{size}")
+        self.end_headers()
+
+        with open(path, "rb") as f:
+            f.seek(start)
+            remaining = end - start + 1
+            while remaining > 0:
+                chunk = f.read(min(64 * 1024, remaining))
+                if not chunk:
+                    break
+                self.wfile.write(chunk)
+                remaining -= len(chunk)
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Lesson rendering service.")
+    ap.add_argument("--host", default=config.SERVICE_HOST)
+    ap.add_argument("--port", type=int, default=config.SERVICE_PORT)
+    ap.add_argument("--job-workers", type=int, default=config.SERVICE_JOB_WORKERS)
+    ap.add_argument("--render-workers", type=int, default=config.SERVICE_RENDER_WORKERS)
+    args = ap.parse_args()
+
+    # One warm engine + cache for every job
+    cache = SynthesisCache(config.TTS_CACHE_DIR, max_bytes=config.TTS_CACHE_MAX_BYTES)
+    tts = TTSEngine.from_config(cache)
+    service = RenderService(
+        tts,
+        config.SERVICE_OUTPUT_ROOT,
+        job_workers=args.job_workers,
+        render_workers=args.render_workers,
+        max_queue=config.SERVICE_MAX_QUEUE,
+        job_ttl_s=config.SERVICE_JOB_TTL_S,
+        max_jobs=config.SERVICE_MAX_JOBS,
+    )
+
+    LessonRequestHandler.service = service
+    httpd = ThreadingHTTPServer((args.host, args.port), LessonRequestHandler)
+    print(f"Serving lessons on http://{args.host}:{args.port} "
+          f"({args.job_workers} job workers, {args.render_workers} render processes)")
+    try:
+        httpd.serve_forever()
+    except KeyboardInterrupt:
+        print("\nShutting down...")
+    finally:
+        httpd.server_close()
+        service.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,18 @@
 import os
 from pathlib import Path
-from dotenv import load_dotenv
+
+
+def _load_env():
+    """Loads the nearest .env above src/ (python-dotenv is only imported when there is one)."""
+    for folder in Path(__file__).resolve().parents:
+        if (folder / ".env").is_file():
+            from dotenv import load_dotenv
+            load_dotenv(folder / ".env")
+            return
+
 
 # Load environment variables
-load_dotenv()
+_load_env()
 
 # OpenAI API Key
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
@@ -24,6 +33,28 @@ OUTPUT_ROOT = PROJECT_ROOT / "lesson_output"
 # Default lesson file
 DEFAULT_LESSON_FILE = TXT_INPUT_DIR / "text1.txt"
 
+# Course PDFs and the lesson files ingest_pdfs.py generates from them
+# (build them with: python build_all.py --input-dir Txts/pdf)
+PDF_INPUT_DIR = PROJECT_ROOT.parent / "Pdf book"
+PDF_LESSON_DIR = TXT_INPUT_DIR / "pdf"
+PDF_CACHE_DIR = PROJECT_ROOT / ".pdf_cache"     # extracted text by PDF hash
+
+# Content-addressed cache of synthesized phrases (shared by all lessons)
+TTS_CACHE_DIR = PROJECT_ROOT / ".tts_cache"
+TTS_CACHE_MAX_BYTES = 500 * 1024 * 1024    # LRU eviction above this size
+
+# Decoded phrase PCM, memory-mapped by renders (src/core/pcm_store.py):
+# re-renders with other pauses / slow factors decode nothing
+PCM_STORE = True
+PCM_STORE_DIR = PROJECT_ROOT / ".pcm_store"
+PCM_STORE_MAX_BYTES = 2 * 1024 ** 3        # LRU eviction above this size (~12 h of 24 kHz mono)
+
+# Shared codec workers (src/core/codec_pool.py): phrase decodes and section
+# encodes run as batches of files per ffmpeg process
+CODEC_POOL = True
+CODEC_WORKERS = None        # ffmpeg processes at once; None = CPU count
+CODEC_BATCH_SIZE = 32       # files per ffmpeg process, at most
+
 # ─────────────────────────────────────────────
 # Audio / TTS Settings
 # ─────────────────────────────────────────────
@@ -34,9 +65,124 @@ DEFAULT_LESSON_FILE = TXT_INPUT_DIR / "text1.txt"
 DEFAULT_TTS_MODEL = "gpt-4o-mini-tts"
 DEFAULT_TTS_VOICE = "verse"
 
+# Speaker per lesson section: a src/core/voice_profiles.py name (voice,
+# model and instructions), or None for DEFAULT_TTS_VOICE. Ignored by
+# backends with their own voice set (Kokoro). Setting one changes the
+# phrase keys of that section, so its phrases are synthesized again, e.g.
+#   "main_lesson": "english_teacher_alloy", "spanish_intro": "spanish_teacher_nova"
+LESSON_VOICES = {
+    "main_lesson": None,        # English phrases
+    "spanish_intro": None,      # ¿¿ Spanish lines
+}
+
+# Speech backend: "openai" (API) or "kokoro" (local ONNX, offline / CI)
+TTS_BACKEND = os.getenv("TTS_BACKEND", "openai")
+
+# Local Kokoro ONNX backend (see MVP/Test/main.py)
+KOKORO_MODEL_PATH = PROJECT_ROOT / "models" / "kokoro-v1.0.onnx"
+KOKORO_VOICES_PATH = PROJECT_ROOT / "models" / "voices-v1.0.bin"
+KOKORO_VOICE = "bf_emma"
+KOKORO_SESSIONS = max(1, (os.cpu_count() or 2) // 2)   # model copies running in parallel
+KOKORO_BATCH_SIZE = 8                                  # phrases per session checkout
+
+# Concurrent synthesis (TTSEngine.synthesize_many)
+TTS_MAX_CONCURRENCY = 6     # requests in flight
+TTS_MAX_RETRIES = 5         # per request, on 429 / 5xx / connection errors
+# > 1: up to this many same-voice phrases per speech request, split back
+# apart at the pauses (src/core/phrase_packing.py); 1 = one request each.
+# Phrase files become WAV and get their own cache entries
+TTS_PACK_PHRASES = 1
+
 # Silence between joined phrases (ms)
 SILENCE_BETWEEN_PHRASES_MS = 4500
 SILENCE_SPANISH_SECTION_MS = 2200     # silence between ¿¿ phrases
 
+# Pause after each phrase, per section (src/core/pause_planner.py):
+#   pause = clamp(base_ms + scale * phrase duration, min_ms, max_ms)
+# scale 0 is the fixed SILENCE_* gap. To leave the learner the phrase's
+# own length (+1 s) to repeat it, use for main_lesson:
+#   {"base_ms": 1000, "scale": 1.0, "min_ms": 2500, "max_ms": 2 * SILENCE_BETWEEN_PHRASES_MS}
+PAUSE_PROFILES = {
+    "spanish_intro": {"base_ms": SILENCE_SPANISH_SECTION_MS, "scale": 0.0},
+    "main_lesson": {"base_ms": SILENCE_BETWEEN_PHRASES_MS, "scale": 0.0},
+}
+PAUSE_ESTIMATE_MS_PER_CHAR = 65     # spoken length of phrases not synthesized yet
+
+# Per-phrase conditioning while stitching (src/core/phrase_analysis.py):
+# trim leading/trailing silence so only SILENCE_* separates phrases, and
+# bring every phrase to the same loudness. Off by default: turning either
+# on changes every rendered lesson (and re-renders them once)
+TRIM_SILENCE = False
+TRIM_THRESHOLD_DB = -40.0      # speech = within this of the phrase's loudest 10 ms
+TRIM_FLOOR_DB = -60.0          # ...and above this absolute level (dBFS)
+TRIM_PAD_MS = 60               # kept either side of the speech
+NORMALIZE_LOUDNESS = False
+TARGET_PHRASE_LUFS = -18.0
+MAX_PHRASE_GAIN_DB = 12.0
+
 # Slow audio factor (0.85 = 15% slower)
 SLOW_FACTOR = 0.90
+
+# Extra slow versions rendered in the same pass (pitch-preserving WSOLA),
+# e.g. [0.75, 0.85] -> full_slow_075.mp3, full_slow_085.mp3
+SLOW_VARIANT_FACTORS = []
+
+# Lesson render format (PCM all phrases are decoded to)
+RENDER_FRAME_RATE = 24000
+RENDER_CHANNELS = 1
+
+# Streaming export: pipe PCM into one ffmpeg encoder per output so memory
+# stays constant (use for multi-hour compilations); False = in-memory render
+STREAMING_EXPORT = False
+
+# main.py: overlap synthesis with decode / encode (src/core/lesson_pipeline.py)
+# instead of synthesizing every phrase before rendering starts. Pipelined
+# renders always stream (constant memory)
+PIPELINED_BUILD = True
+PIPELINE_WINDOW = 16                # phrases decoded ahead of the encoders, at most
+PIPELINE_DECODE_WORKERS = None      # None = CPU count
+
+# Encodings of every lesson output (full_normal, full_slow, slow variants),
+# all made from the same master in parallel (src/core/export_formats.py).
+# The .mp3 entry is the file the timeline sidecars point into; other
+# entries land next to it, "tag" names extra bitrates (full_normal_low.m4a).
+# Add more as needed, e.g.
+#   {"format": "opus", "bitrate": "32k"},     # web
+#   {"format": "aac", "bitrate": "64k"},      # iOS / Android (.m4a)
+EXPORT_FORMATS = [
+    {"format": "mp3", "bitrate": "128k"},
+]
+
+# ─────────────────────────────────────────────
+# Build tracing / profiling (src/core/instrumentation.py)
+# ─────────────────────────────────────────────
+
+# Per-build JSON traces + history.jsonl (compare runs with
+# `python -m src.core.instrumentation`)
+TRACE_ENABLED = True
+TRACE_DIR = PROJECT_ROOT / "build_traces"
+
+# Optional profiler around the whole build: None, "cprofile" or "pyinstrument"
+PROFILER = os.getenv("PROFILER") or None
+
+# ─────────────────────────────────────────────
+# Lesson rendering service (server.py)
+# ─────────────────────────────────────────────
+SERVICE_HOST = os.getenv("SERVICE_HOST", "127.0.0.1")
+SERVICE_PORT = int(os.getenv("SERVICE_PORT", "8000"))
+SERVICE_OUTPUT_ROOT = PROJECT_ROOT / "service_output"
+SERVICE_JOB_WORKERS = 4                               # lessons planned/synthesized at once
+SERVICE_RENDER_WORKERS = max(1, (os.cpu_count() or 2) // 2)   # render processes
+SERVICE_MAX_QUEUE = 200                               # pending jobs before 503
+SERVICE_JOB_TTL_S = 24 * 3600                         # finished jobs (and files) kept this long
+SERVICE_MAX_JOBS = 1000                               # finished jobs kept, at most
+SERVICE_MAX_BODY_BYTES = 2 * 1024 * 1024
+
+# ─────────────────────────────────────────────
+# Speech API connection pool (src/core/tts_clients.py)
+# ─────────────────────────────────────────────
+TTS_HTTP_POOL_SIZE = 20             # keep >= TTS_MAX_CONCURRENCY (shared by every job)
+TTS_HTTP2 = True                    # needs the `h2` package, else HTTP/1.1 keep-alive
+TTS_HTTP_KEEPALIVE_S = 60.0         # idle connections kept warm this long
+TTS_HTTP_CONNECT_TIMEOUT_S = 10.0
+TTS_HTTP_READ_TIMEOUT_S = 120.0     # long phrases stream for a while
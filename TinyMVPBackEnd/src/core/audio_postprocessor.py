@@ -1,6 +1,17 @@
 from pathlib import Path
 from pydub import AudioSegment
 
+from src.core import instrumentation as trace
+from src.core.codec_pool import CodecPool, shared_codec_pool
+from src.core.pcm_buffer import PCMConcatenator
+from src.core.export_formats import FanOutEncoder
+from src.core.ffmpeg_stream import StreamingEncoder, iter_decode
+from src.core.lesson_timeline import layout_sections
+from src.core.pause_planner import PausePlanner, probe_duration_ms
+from src.core.pcm_store import PCMStore
+from src.core.phrase_analysis import analysis_params, analyze_pcm, gain_db, trim_frames
+from src.core.time_stretch import WSOLAStretcher, float_to_pcm, pcm_to_float, stretch_pcm
+
 class AudioPostProcessor:
     """
     Upgraded processor with support for:
@@ -8,39 +19,64 @@ class AudioPostProcessor:
       - dynamic silence
       - spanish-only silence profile (¿¿ phrases)
       - stitching multiple audio sections in order
+      - single-decode / single-encode lesson rendering (render_lesson)
+      - constant-memory streaming render for very long lessons
+        (render_lesson_streaming)
+      - pitch-preserving slow versions (WSOLA), several factors per pass
+      - per-phrase silence trimming and loudness normalization, applied
+        while stitching (see phrase_analysis)
+      - several encodings of each lesson output (MP3 / Opus / AAC / WAV)
+        from the same master, encoded in parallel (see export_formats)
+      - optional PCMStore: phrases decoded once, memory-mapped by every
+        later render at the same format (see pcm_store)
+      - optional CodecPool: a lesson's phrases decoded, and its section
+        files encoded, a batch per ffmpeg process (see codec_pool)
+
+    All joins go through PCMConcatenator (one preallocated buffer per
+    output) instead of repeated `combined +=`.
     """
 
+    def __init__(self, pcm_store: PCMStore | None = None, codecs: CodecPool | None = None):
+        self.pcm_store = pcm_store
+        self.codecs = codecs
+
+    @classmethod
+    def from_config(cls, codec_workers: int | None = None) -> "AudioPostProcessor":
+        """
+        Processor with the PCM store (config.PCM_STORE) and the process's
+        shared codec pool (config.CODEC_POOL) when they are on.
+        `codec_workers` sizes that pool when this call creates it.
+        """
+        from src import config
+
+        codecs = shared_codec_pool(codec_workers) if config.CODEC_POOL else None
+        store = None
+        if config.PCM_STORE:
+            store = PCMStore(config.PCM_STORE_DIR, config.PCM_STORE_MAX_BYTES,
+                             decoder=codecs.decode_many if codecs else None,
+                             batch_files=codecs.batch_size if codecs else 32)
+            store.prune()
+        return cls(pcm_store=store, codecs=codecs)
+
     # ----------------------------------------
     # CLASSIC MODE (unchanged)
     # ----------------------------------------
     def insert_silence(self, files, output, ms_silence=1500):
-        combined = AudioSegment.silent(duration=0)
-        silence = AudioSegment.silent(duration=ms_silence)
-
-        for f in files:
-            combined += AudioSegment.from_file(f) + silence
-
-        output = Path(output)
-        output.parent.mkdir(parents=True, exist_ok=True)
-        combined.export(output, format="mp3")
-        return output
+        return self._render_files(files, output, ms_silence)
 
     # ----------------------------------------
-    # DYNAMIC SILENCE (unchanged)
+    # DYNAMIC SILENCE
+    # Pause = phrase length + extra_ms, sized from file headers (PausePlanner)
     # ----------------------------------------
     def insert_dynamic_silence(self, files, output, extra_ms=1000):
-        combined = AudioSegment.silent(duration=0)
-
-        for f in files:
-            audio = AudioSegment.from_file(f)
-            combined += audio
-            pause = AudioSegment.silent(duration=len(audio) + extra_ms)
-            combined += pause
-
-        output = Path(output)
-        output.parent.mkdir(parents=True, exist_ok=True)
-        combined.export(output, format="mp3")
-        return output
+        planner = PausePlanner({"default": {"base_ms": extra_ms, "scale": 1.0}})
+        durations = [probe_duration_ms(f) for f in files]
+        segments = None
+        if None in durations:
+            # No cheap probe for this format: fall back to the decoded length
+            segments = [self._decode(f) for f in files]
+            durations = [len(audio) for audio in segments]
+        return self._render_files(files, output, planner.plan_section("default", durations), segments)
 
     # ----------------------------------------
     # NEW: Spanish-only silence profile
@@ -51,16 +87,7 @@ class AudioPostProcessor:
         Inserts a separate silence profile for Spanish-only
         ¿¿ phrases. Default = 2.2 seconds.
         """
-        combined = AudioSegment.silent(duration=0)
-        silence = AudioSegment.silent(duration=ms_silence)
-
-        for f in files:
-            combined += AudioSegment.from_file(f) + silence
-
-        output = Path(output)
-        output.parent.mkdir(parents=True, exist_ok=True)
-        combined.export(output, format="mp3")
-        return output
+        return self._render_files(files, output, ms_silence)
 
     # ----------------------------------------
     # NEW: fully generic "silence profile" system
@@ -68,18 +95,9 @@ class AudioPostProcessor:
     def insert_silence_with_profile(self, files, output, silence_ms):
         """
         General-purpose silence insertion.
-        Used internally by spanish or normal TTS groups.
+        silence_ms = one value, or one per phrase (PausePlanner.plan_section)
         """
-        combined = AudioSegment.silent(duration=0)
-        silence = AudioSegment.silent(duration=silence_ms)
-
-        for f in files:
-            combined += AudioSegment.from_file(f) + silence
-
-        output = Path(output)
-        output.parent.mkdir(parents=True, exist_ok=True)
-        combined.export(output, format="mp3")
-        return output
+        return self._render_files(files, output, silence_ms)
 
     # ----------------------------------------
     # NEW: Combine multiple "sections"
@@ -90,30 +108,473 @@ class AudioPostProcessor:
         Concatenates fully-rendered audio sections in order.
         audio_files = list of MP3 file paths
         """
-        combined = AudioSegment.silent(duration=0)
+        return self._render_files(audio_files, output, 0)
 
-        for f in audio_files:
-            combined += AudioSegment.from_file(f)
+    def _render_files(self, files, output, silence_ms, segments=None):
+        """Shared body of the insert_* helpers: decode, join in one pass, export MP3."""
+        if segments is None:
+            segments = [self._decode(f) for f in files]
+        combined = self._join(segments, silence_ms)
 
         output = Path(output)
         output.parent.mkdir(parents=True, exist_ok=True)
-        combined.export(output, format="mp3")
-        return output
+        return self._export(combined, output)
 
     # ----------------------------------------
     # Slow down 
     # ----------------------------------------
-    def slow_down(self, input_file, output_file, factor=0.85):
+    def slow_down(self, input_file, output_file, factor=0.85, method="wsola"):
+        """
+        method="wsola"    pitch-preserving time stretch (default)
+        method="resample" legacy frame-rate rewrite (also lowers pitch)
+        """
         input_file = Path(input_file)
         output_file = Path(output_file)
 
         audio = AudioSegment.from_file(input_file)
+        slowed = self._slow(audio, factor) if method == "wsola" else self._slow_resample(audio, factor)
+
+        output_file.parent.mkdir(parents=True, exist_ok=True)
+        slowed.export(output_file, format=output_file.suffix.lstrip("."))
+        return output_file
+
+    def _slow(self, audio, factor):
+        return self._slow_many(audio, [factor])[factor]
+
+    def _slow_many(self, audio, factors):
+        """One pass over `audio` for every factor -> {factor: AudioSegment}."""
+        with trace.span("slow", factors=list(factors), audio_s=len(audio) / 1000):
+            audio = audio.set_sample_width(2)
+            stretched = stretch_pcm(audio.raw_data, factors, audio.frame_rate, audio.channels)
+            return {f: audio._spawn(pcm) for f, pcm in stretched.items()}
 
-        slowed = audio._spawn(
+    def _slow_resample(self, audio, factor):
+        return audio._spawn(
             audio.raw_data,
             overrides={"frame_rate": int(audio.frame_rate * factor)}
         ).set_frame_rate(audio.frame_rate)
 
-        output_file.parent.mkdir(parents=True, exist_ok=True)
-        slowed.export(output_file, format=output_file.suffix.lstrip("."))
-        return output_file
+    # ----------------------------------------
+    # Full lesson render: decode once, encode once per output
+    # ----------------------------------------
+    def render_lesson(self, sections, full_normal=None, full_slow=None, slow_factor=0.85,
+                      frame_rate=None, channels=None, slow_variants=None,
+                      conditioning=None, analyses=None, formats=None):
+        """
+        Renders a whole lesson from phrase files in one pass.
+
+        sections = [
+            {"files": [...phrase paths...], "silence_ms": 2200, "output": path | None},
+            ...
+        ]
+
+        Every phrase is decoded exactly once; sections, the full lesson and
+        the slow version are assembled from that in-memory PCM, and each
+        requested output is encoded exactly once (no MP3 -> MP3 generations).
+        frame_rate / channels pin the render format (as in
+        render_lesson_streaming); by default the richest input format wins.
+
+        slow_variants = {factor: path} renders extra slow versions; all slow
+        factors are time-stretched together in a single pass.
+
+        conditioning = {"trim": bool, "trim_db", "floor_db", "pad_ms",
+                        "normalize": bool, "target_lufs", "max_gain_db"}
+        trims each phrase's leading/trailing silence and/or evens out its
+        loudness during the stitch. analyses = {phrase key: analysis} is
+        read and filled in (sections carry "keys"), so cached phrases are
+        not analyzed again.
+
+        formats = export_formats spec list: full_normal, full_slow and the
+        slow variants are each encoded once per format from the same
+        in-memory master (sections stay single MP3s).
+
+        Returns {"sections": [paths], "full_normal": path, "full_slow": path,
+                 "slow_variants": {factor: path}, "layout": phrase positions,
+                 "renditions": {output: [every encoded path]}}
+        where "layout" is lesson_timeline.layout_sections() of the
+        normal-speed lesson (slow versions scale it by 1 / factor).
+        """
+        rendered = []
+        section_exports = []
+        durations = []
+        self._prefetch(sections, frame_rate, channels)
+
+        for section in sections:
+            segments = self._decode_section(section, frame_rate, channels)
+            trims = gains = None
+            if conditioning:
+                segments, trims, gains = self._condition(
+                    segments, section.get("keys"), frame_rate, channels, conditioning, analyses
+                )
+                durations.append([
+                    (end - start) / seg.frame_rate * 1000 for seg, (start, end) in zip(segments, trims)
+                ])
+            else:
+                durations.append([seg.frame_count() / seg.frame_rate * 1000 for seg in segments])
+            audio = self._join(
+                segments,
+                section.get("silence_ms", 0),
+                frame_rate,
+                channels,
+                trims,
+                gains,
+            )
+            rendered.append(audio)
+
+            if section.get("output"):
+                section_exports.append((audio, section["output"]))
+
+        full = self._join(rendered, 0, frame_rate, channels)
+        result = {"sections": self._export_many(section_exports), "full_normal": None, "full_slow": None,
+                  "slow_variants": {}, "renditions": {},
+                  "layout": layout_sections(durations, [s.get("silence_ms", 0) for s in sections])}
+
+        if full_normal:
+            result["full_normal"] = self._export_master(full, full_normal, formats, result["renditions"])
+
+        slow_outputs = self._slow_outputs(full_slow, slow_factor, slow_variants)
+        if slow_outputs:
+            slowed = self._slow_many(full, sorted({f for f, _ in slow_outputs}))
+            for factor, output in slow_outputs:
+                path = self._export_master(slowed[factor], output, formats, result["renditions"])
+                if output == full_slow:
+                    result["full_slow"] = path
+                else:
+                    result["slow_variants"][factor] = path
+        return result
+
+    # ----------------------------------------
+    # Streaming render: constant memory, one encoder per output
+    # ----------------------------------------
+    def render_lesson_streaming(self, sections, full_normal=None, full_slow=None,
+                                slow_factor=0.85, frame_rate=24000, channels=1,
+                                slow_variants=None, conditioning=None, analyses=None,
+                                formats=None):
+        """
+        Same inputs/outputs as render_lesson, but nothing lesson-sized is
+        ever held in memory: each phrase is decoded in chunks and the PCM is
+        piped straight into one long-lived ffmpeg encoder per output.
+
+        Slow outputs run the same chunks through a streaming WSOLA
+        time-stretcher (one per factor) in front of their encoder.
+        Phrase positions ("layout") are measured from the decoded PCM.
+        With `conditioning`, each phrase (seconds of audio, never the
+        lesson) is decoded whole so it can be analyzed, trimmed and gained.
+
+        Instead of "files", a section may give a "source": an iterable of
+        (label, [PCM chunks], pause ms) per phrase in lesson order, already
+        at frame_rate / channels (see lesson_pipeline, which decodes
+        phrases as they arrive from synthesis).
+        With `formats`, each lesson output fans out to one encoder per
+        format behind a single time-stretcher.
+        """
+        lesson_encoders = {}
+        if full_normal:
+            lesson_encoders["full_normal"] = FanOutEncoder(full_normal, frame_rate, channels, formats)
+        for factor, output in self._slow_outputs(full_slow, slow_factor, slow_variants):
+            key = "full_slow" if output == full_slow else factor
+            lesson_encoders[key] = _StretchedEncoder(
+                FanOutEncoder(output, frame_rate, channels, formats),
+                WSOLAStretcher(factor, frame_rate, channels),
+            )
+
+        result = {"sections": [], "full_normal": None, "full_slow": None, "slow_variants": {},
+                  "renditions": {}}
+        durations = []
+        gaps = []
+        opened = []
+        if self.pcm_store is not None:
+            self._prefetch(sections, frame_rate, channels)
+        try:
+            for enc in lesson_encoders.values():
+                opened.append(enc.open())
+
+            for section in sections:
+                encoders = list(lesson_encoders.values())
+                section_enc = None
+                if section.get("output"):
+                    section_enc = StreamingEncoder(section["output"], frame_rate, channels)
+                    opened.append(section_enc.open())
+                    encoders.append(section_enc)
+
+                frame_width = channels * 2
+                durations.append([])
+                gaps.append([])
+                phrases = section.get("source") or self._file_phrases(
+                    section, frame_rate, channels, conditioning, analyses
+                )
+                for label, chunks, silence_ms in phrases:
+                    # decode + stretch + encode are interleaved here: one span per phrase
+                    with trace.span("stream", file=label, encoders=len(encoders)) as sp:
+                        pcm_bytes = 0
+                        for chunk in chunks:
+                            pcm_bytes += len(chunk)
+                            for enc in encoders:
+                                enc.write(chunk)
+                        sp["bytes"] = pcm_bytes
+                        sp["audio_s"] = pcm_bytes / frame_width / frame_rate
+                    durations[-1].append(sp["audio_s"] * 1000)
+                    gaps[-1].append(silence_ms)
+                    if silence_ms:
+                        for enc in encoders:
+                            enc.write_silence(silence_ms)
+
+                if section_enc is not None:
+                    opened.remove(section_enc)
+                    result["sections"].append(self._close_encoder(section_enc))
+
+            for key, enc in lesson_encoders.items():
+                opened.remove(enc)
+                outputs = enc.encoder.outputs if isinstance(enc, _StretchedEncoder) else enc.outputs
+                result["renditions"][outputs[0]] = outputs
+                if key in ("full_normal", "full_slow"):
+                    result[key] = self._close_encoder(enc)
+                else:
+                    result["slow_variants"][key] = self._close_encoder(enc)
+
+        except BaseException:
+            for enc in opened:
+                enc.abort()
+            raise
+
+        result["layout"] = layout_sections(durations, gaps)
+        return result
+
+    def _file_phrases(self, section, frame_rate, channels, conditioning, analyses):
+        """
+        (label, PCM chunks, pause ms) per phrase file of a section. Chunks
+        are decoded lazily, i.e. inside the caller's per-phrase span.
+        """
+        def conditioned(path, key):
+            yield self.phrase_pcm(path, key, frame_rate, channels, conditioning, analyses)
+
+        gaps = PCMConcatenator._gaps(section.get("silence_ms", 0), len(section["files"]))
+        keys = section.get("keys") or [None] * len(section["files"])
+        for f, key, silence_ms in zip(section["files"], keys, gaps):
+            if conditioning:
+                chunks = conditioned(f, key)
+            elif self.pcm_store is not None:
+                chunks = [self.pcm_store.pcm(f, key, frame_rate, channels)]
+            else:
+                chunks = iter_decode(f, frame_rate, channels)
+            yield Path(f).name, chunks, silence_ms
+
+    def phrase_pcm(self, path, key, frame_rate, channels, conditioning=None, analyses=None) -> bytes:
+        """
+        One phrase as 16-bit PCM at the render format, trimmed / gained if
+        asked. With a PCM store, untrimmed audio is a view into the store.
+        """
+        if self.pcm_store is not None:
+            pcm = self.pcm_store.pcm(path, key, frame_rate, channels)
+        elif self.codecs is not None:
+            pcm = self.codecs.decode_many([path], frame_rate, channels)[0]
+        else:
+            pcm = b"".join(iter_decode(path, frame_rate, channels))
+        if conditioning:
+            pcm = self._condition_pcm(pcm, key, frame_rate, channels, conditioning, analyses)
+        return pcm
+
+    @staticmethod
+    def _slow_outputs(full_slow, slow_factor, slow_variants):
+        """[(factor, output path), ...] for every slow file requested."""
+        outputs = [(slow_factor, full_slow)] if full_slow else []
+        outputs += [(f, out) for f, out in (slow_variants or {}).items() if out]
+        return outputs
+
+    def _prefetch(self, sections, frame_rate, channels):
+        """Fills the PCM store's missing phrases of a render in batched decodes."""
+        if self.pcm_store is None or self.codecs is None or not (frame_rate and channels):
+            return
+        items = []
+        for section in sections:
+            files = section.get("files") or []
+            items += zip(files, section.get("keys") or [None] * len(files))
+        with trace.span("prefetch", files=len(items)) as sp:
+            sp["decoded"] = self.pcm_store.prefetch(items, frame_rate, channels)
+
+    def _decode_section(self, section, frame_rate, channels):
+        """A section's phrase files as AudioSegments (one batched decode with a codec pool)."""
+        files = section["files"]
+        keys = section.get("keys") or [None] * len(files)
+        if self.codecs is not None and self.pcm_store is None and frame_rate and channels:
+            return [
+                AudioSegment(data=pcm, sample_width=2, frame_rate=frame_rate, channels=channels)
+                for pcm in self.codecs.decode_many(files, frame_rate, channels)
+            ]
+        return [self._decode(f, key, frame_rate, channels) for f, key in zip(files, keys)]
+
+    def _decode(self, path, key=None, frame_rate=None, channels=None):
+        """
+        Phrase file -> AudioSegment. With a PCM store and a pinned render
+        format, the segment wraps the mapped PCM (nothing decoded or copied).
+        """
+        with trace.span("decode", file=Path(path).name) as sp:
+            if self.pcm_store is not None and frame_rate and channels:
+                pcm = self.pcm_store.pcm(path, key, frame_rate, channels)
+                audio = AudioSegment(data=pcm, sample_width=2, frame_rate=frame_rate, channels=channels)
+                sp["bytes"] = len(pcm)
+            else:
+                audio = AudioSegment.from_file(path)
+                sp["bytes"] = Path(path).stat().st_size
+            sp["audio_s"] = len(audio) / 1000
+        return audio
+
+    # ----------------------------------------
+    # Trim + loudness (phrase_analysis)
+    # ----------------------------------------
+    def _condition(self, segments, keys, frame_rate, channels, conditioning, analyses):
+        """
+        Converts segments to the render format and works out each one's
+        trim (frames) and gain (dB) -> (segments, trims, gains).
+        """
+        concat = self._concatenator(segments, frame_rate, channels)
+        segments = [concat.conform(seg).set_sample_width(2) for seg in segments]
+        keys = keys or [None] * len(segments)
+
+        trims, gains = [], []
+        for seg, key in zip(segments, keys):
+            analysis = self._analysis(seg.raw_data, key, seg.frame_rate, seg.channels,
+                                      conditioning, analyses)
+            trim, gain = self._trim_and_gain(analysis, seg.frame_rate, seg.frame_count(), conditioning)
+            trims.append(trim)
+            gains.append(gain)
+        return segments, trims, gains
+
+    def _condition_pcm(self, pcm, key, frame_rate, channels, conditioning, analyses):
+        """Single phrase of 16-bit PCM -> trimmed, gained PCM."""
+        analysis = self._analysis(pcm, key, frame_rate, channels, conditioning, analyses)
+        frames = len(pcm) // (channels * 2)
+        trim, gain = self._trim_and_gain(analysis, frame_rate, frames, conditioning)
+        return bytes(PCMConcatenator(frame_rate, channels).concat_raw([pcm], 0, [trim], [gain]))
+
+    @staticmethod
+    def _analysis(pcm, key, frame_rate, channels, conditioning, analyses):
+        params = analysis_params(conditioning["trim_db"], conditioning["floor_db"])
+        cached = analyses.get(key) if (analyses is not None and key) else None
+        if cached is not None and cached.get("params") == params:
+            return cached
+
+        with trace.span("analyze") as sp:
+            analysis = analyze_pcm(pcm, frame_rate, channels,
+                                   conditioning["trim_db"], conditioning["floor_db"])
+            sp["audio_s"] = analysis["duration_ms"] / 1000
+        if analyses is not None and key:
+            analyses[key] = analysis
+        return analysis
+
+    @staticmethod
+    def _trim_and_gain(analysis, frame_rate, frames, conditioning):
+        trim = (0, int(frames))
+        if conditioning.get("trim"):
+            start, end = trim_frames(analysis, frame_rate, conditioning["pad_ms"])
+            trim = (min(start, int(frames)), min(end, int(frames)))
+        gain = 0.0
+        if conditioning.get("normalize"):
+            gain = gain_db(analysis, conditioning["target_lufs"], conditioning["max_gain_db"])
+        return trim, gain
+
+    @staticmethod
+    def _concatenator(segments, frame_rate=None, channels=None):
+        concat = PCMConcatenator.for_segments(segments)
+        if frame_rate:
+            concat.frame_rate = frame_rate
+        if channels:
+            concat.channels = channels
+        return concat
+
+    def _join(self, segments, ms_silence, frame_rate=None, channels=None, trims=None, gains_db=None):
+        """
+        Joins segments with `ms_silence` after each one (int, or one value
+        per segment) into a single preallocated buffer, optionally trimming
+        and gaining each one on the way (see _condition).
+        """
+        if not segments:
+            return AudioSegment.silent(duration=0)
+        with trace.span("stitch", segments=len(segments)) as sp:
+            concat = self._concatenator(segments, frame_rate, channels)
+            joined = concat.concat(segments, ms_silence, trims, gains_db)
+            sp["bytes"] = len(joined.raw_data)
+            sp["audio_s"] = len(joined) / 1000
+        return joined
+
+    def _export(self, audio, output):
+        output = Path(output)
+        output.parent.mkdir(parents=True, exist_ok=True)
+        with trace.span("export", file=output.name, audio_s=len(audio) / 1000) as sp:
+            audio.export(output, format=output.suffix.lstrip(".") or "mp3")
+            sp["bytes"] = output.stat().st_size
+        return output
+
+    def _export_many(self, exports):
+        """[(audio, output), ...] -> output paths; one batched encode with a codec pool."""
+        if self.codecs is None:
+            return [self._export(audio, output) for audio, output in exports]
+        jobs = []
+        for audio, output in exports:
+            audio = audio.set_sample_width(2)
+            jobs.append({"pcm": audio.raw_data, "output": output,
+                         "frame_rate": audio.frame_rate, "channels": audio.channels})
+        return self.codecs.encode_many(jobs)
+
+    def _export_master(self, audio, output, formats, renditions):
+        """Encodes one lesson output in every format at once; fills renditions[output]."""
+        if not formats:
+            path = self._export(audio, output)
+            renditions[path] = [path]
+            return path
+
+        audio = audio.set_sample_width(2)
+        enc = FanOutEncoder(output, audio.frame_rate, audio.channels, formats)
+        with trace.span("export", file=Path(output).name, audio_s=len(audio) / 1000,
+                        renditions=len(enc.outputs)) as sp:
+            enc.open()
+            try:
+                enc.write(audio.raw_data)
+            except BaseException:
+                enc.abort()
+                raise
+            path = enc.close()
+            sp["bytes"] = sum(p.stat().st_size for p in enc.outputs)
+        renditions[path] = enc.outputs
+        return path
+
+    @staticmethod
+    def _close_encoder(enc):
+        """Flushes a streaming encoder; the span covers the encoder draining."""
+        with trace.span("export") as sp:
+            path = enc.close()
+            sp["file"] = path.name
+            sp["bytes"] = path.stat().st_size
+        return path
+
+
+class _StretchedEncoder:
+    """
+    StreamingEncoder front-end that time-stretches everything written to
+    it (phrases and silences alike) before encoding.
+    """
+
+    def __init__(self, encoder: StreamingEncoder, stretcher: WSOLAStretcher):
+        self.encoder = encoder
+        self.stretcher = stretcher
+
+    def open(self):
+        self.encoder.open()
+        return self
+
+    def write(self, pcm: bytes):
+        out = self.stretcher.process(pcm_to_float(pcm, self.encoder.channels))
+        if len(out):
+            self.encoder.write(float_to_pcm(out))
+
+    def write_silence(self, ms: int):
+        self.write(bytes(int(self.encoder.frame_rate * ms / 1000) * self.encoder.frame_width))
+
+    def close(self):
+        out = self.stretcher.flush()
+        if len(out):
+            self.encoder.write(float_to_pcm(out))
+        return self.encoder.close()
+
+    def abort(self):
+        self.encoder.abort()
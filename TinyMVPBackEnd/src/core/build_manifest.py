@@ -0,0 +1,184 @@
+# src/core/build_manifest.py
+
+import hashlib
+import json
+import os
+import shutil
+from pathlib import Path
+
+
+class BuildManifest:
+    """
+    Per-lesson build record, written to lesson_output/<lesson>/build_manifest.json.
+
+    - phrases: for every section, the ordered phrase identities (content
+      key = model + voice + instructions + text) and the file each one lives in
+    - outputs: for every rendered artifact, a hash of everything it was
+      built from (ordered phrase keys + silence / slow / render settings)
+    - analysis: trim points and loudness per phrase key, so re-renders
+      skip the analysis pass
+    - durations: phrase length (ms) per phrase key, for pause planning
+
+    On rebuild, phrases are matched by content key, not by their
+    phrase_XX index, so inserting a line only synthesizes that line and the
+    existing files are renamed into their new positions. Artifacts whose
+    input hash is unchanged are not re-rendered.
+    """
+
+    FILENAME = "build_manifest.json"
+    VERSION = 1
+
+    def __init__(self, lesson_root: str | Path):
+        self.lesson_root = Path(lesson_root)
+        self.path = self.lesson_root / self.FILENAME
+        self.previous = self._load()
+        self.data = {"version": self.VERSION, "phrases": {}, "outputs": {}, "analysis": {}, "durations": {}}
+
+    # ----------------------------------------
+    # Phrases
+    # ----------------------------------------
+    def reconcile_phrases(self, section: str, jobs: list[dict]) -> list[dict]:
+        """
+        jobs = [{"key": content key, "text": ..., "out": target path, ...}, ...]
+
+        Reuses files from the previous build whose key still appears,
+        moving them to their new target names, removes files of phrases
+        that disappeared, and returns only the jobs that still need
+        synthesis.
+
+        The new phrase -> file map is saved as soon as the files are in
+        place (and the section is cleared while they move), so a build
+        that fails later never leaves the manifest pointing at files that
+        now hold other phrases.
+        """
+        old_entries = self.previous.get("phrases", {}).get(section, [])
+        if old_entries:
+            self._save_phrases(section, [])
+        old_by_key = {}
+        for e in old_entries:
+            f = self.lesson_root / e["file"]
+            if f.exists():
+                old_by_key.setdefault(e["key"], f)
+
+        wanted = {job["key"] for job in jobs}
+
+        # 1. Park reusable files under content-addressed temp names so a
+        #    shift (phrase_03 -> phrase_04) can't overwrite a file still needed.
+        parked = {}
+        for key, f in old_by_key.items():
+            if key in wanted:
+                tmp = f.with_name(f".reuse_{key[:16]}{f.suffix}")
+                os.replace(f, tmp)
+                parked[key] = tmp
+
+        # 2. Whatever wasn't parked belongs to phrases that were removed
+        #    (or to duplicate copies); drop it.
+        for e in old_entries:
+            (self.lesson_root / e["file"]).unlink(missing_ok=True)
+
+        # 3. Move parked files to their new positions, collect what's missing.
+        #    A phrase listed twice gets the parked file moved into its first
+        #    slot and linked (or copied) into the others.
+        pending = []
+        placed = {}
+        for job in jobs:
+            out = Path(job["out"])
+            tmp = parked.pop(job["key"], None)
+            if tmp is not None:
+                out.parent.mkdir(parents=True, exist_ok=True)
+                os.replace(tmp, out)
+                placed[job["key"]] = out
+            elif job["key"] in placed:
+                self._link(placed[job["key"]], out)
+            else:
+                pending.append(job)
+
+        self.data["phrases"][section] = [
+            {"key": job["key"], "text": job["text"], "file": self._rel(job["out"])}
+            for job in jobs
+        ]
+        self._save_phrases(section, self.data["phrases"][section])
+        return pending
+
+    @staticmethod
+    def _link(src: Path, dest: Path):
+        """Hardlinks `src` at `dest` (copy fallback), replacing whatever was there."""
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        dest.unlink(missing_ok=True)
+        try:
+            os.link(src, dest)
+        except OSError:
+            shutil.copy2(src, dest)
+
+    def _save_phrases(self, section: str, entries: list[dict]):
+        """Persists one section's phrase map on top of the previous build record."""
+        self.previous = {**self.previous, "version": self.VERSION,
+                         "phrases": {**self.previous.get("phrases", {}), section: entries}}
+        self._write(self.previous)
+
+    # ----------------------------------------
+    # Phrase analysis (trim points / loudness, see phrase_analysis)
+    # ----------------------------------------
+    def analyses(self) -> dict:
+        """Cached analyses by phrase content key, from the previous build."""
+        return dict(self.previous.get("analysis", {}))
+
+    def record_analyses(self, analyses: dict, keys: list[str]):
+        """Keeps the analyses of the phrases still in the lesson."""
+        self.data["analysis"] = {k: analyses[k] for k in keys if k in analyses}
+
+    def durations(self) -> dict:
+        """Phrase durations (ms) by content key, from the previous build."""
+        return dict(self.previous.get("durations", {}))
+
+    def record_durations(self, durations: dict, keys: list[str]):
+        self.data["durations"] = {k: round(durations[k], 2) for k in keys if k in durations}
+
+    # ----------------------------------------
+    # Outputs
+    # ----------------------------------------
+    @staticmethod
+    def inputs_hash(phrase_keys: list[str], settings: dict) -> str:
+        payload = json.dumps({"phrases": phrase_keys, "settings": settings}, sort_keys=True)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def is_fresh(self, output: str | Path, inputs_hash: str) -> bool:
+        """True if `output` exists and was built from exactly these inputs."""
+        output = Path(output)
+        old = self.previous.get("outputs", {}).get(self._rel(output))
+        return output.exists() and old is not None and old.get("inputs_hash") == inputs_hash
+
+    def record_output(self, output: str | Path, inputs_hash: str):
+        self.data["outputs"][self._rel(output)] = {"inputs_hash": inputs_hash}
+
+    # ----------------------------------------
+    # Persistence
+    # ----------------------------------------
+    def save(self):
+        self._write(self.data)
+        self.previous = self.data
+
+    def _write(self, data: dict):
+        self.lesson_root.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(".json.tmp")
+        tmp.write_text(json.dumps(data, ensure_ascii=False, indent=2), encoding="utf-8")
+        os.replace(tmp, self.path)
+
+    def _load(self) -> dict:
+        if not self.path.exists():
+            return {}
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError) as e:
+            print(f"[BuildManifest] Warning: unreadable manifest, doing a full build: {e}")
+            return {}
+        if data.get("version") != self.VERSION:
+            return {}
+        return data
+
+    def _rel(self, path: str | Path) -> str:
+        path = Path(path)
+        try:
+            return path.relative_to(self.lesson_root).as_posix()
+        except ValueError:
+            return path.as_posix()
@@ -0,0 +1,194 @@
+# src/core/codec_pool.py
+"""
+Shared codec workers: many files per ffmpeg process instead of one
+process per file.
+
+    codecs = shared_codec_pool()
+    pcms = codecs.decode_many(phrase_files, 24000, 1)        # [bytes, ...]
+    codecs.encode_many([{"pcm": ..., "output": "section.mp3",
+                         "frame_rate": 24000, "channels": 1}, ...])
+
+- One worker thread per core (one per render process under build_all's
+  process pool), kept for the whole process, so every
+  lesson, section and phrase goes through the same pool
+- Each worker runs one ffmpeg per batch of files: every input gets its
+  own -map'ed output, so a 100-phrase lesson costs ~cores ffmpeg
+  processes instead of 100 (ffmpeg can't take new files once running,
+  so a batch is the unit of reuse)
+- 16-bit WAV files already at the wanted format (Kokoro / packed
+  phrases) are read in-process: no ffmpeg at all
+
+Decoded PCM is identical to ffmpeg_stream.iter_decode's (same decoder,
+same resampler), so both paths can be mixed freely.
+"""
+
+import math
+import os
+import subprocess
+import tempfile
+import threading
+import wave
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from src.core import instrumentation as trace
+from src.core.ffmpeg_stream import FFMPEG, PCM_FORMAT, SAMPLE_WIDTH
+
+# Encoded outputs: extension -> ffmpeg muxer (codec = the muxer's default, as pydub's export)
+MUXERS = {".mp3": "mp3", ".wav": "wav", ".ogg": "ogg", ".opus": "opus", ".m4a": "ipod", ".flac": "flac"}
+
+
+class CodecPool:
+    def __init__(self, workers: int | None = None, batch_size: int = 32):
+        """
+        - workers:    ffmpeg processes running at once (default: CPU count)
+        - batch_size: files per ffmpeg process, at most
+        """
+        self.workers = max(1, workers or os.cpu_count() or 1)
+        self.batch_size = max(1, batch_size)
+        self.spawns = 0
+        self._lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="codec")
+
+    # ----------------------------------------
+    # Decode
+    # ----------------------------------------
+    def decode_many(self, sources: list, frame_rate: int, channels: int) -> list[bytes]:
+        """16-bit PCM of every source at frame_rate / channels, in order."""
+        results = [None] * len(sources)
+        spawned = []
+        for i, source in enumerate(sources):
+            results[i] = read_wav_pcm(source, frame_rate, channels)
+            if results[i] is None:
+                spawned.append(i)
+
+        batches = self._split(spawned)
+        futures = [
+            self._pool.submit(self._decode_batch, [sources[i] for i in batch], frame_rate, channels)
+            for batch in batches
+        ]
+        for batch, future in zip(batches, futures):
+            for i, pcm in zip(batch, future.result()):
+                results[i] = pcm
+        return results
+
+    def _decode_batch(self, sources: list, frame_rate: int, channels: int) -> list[bytes]:
+        with tempfile.TemporaryDirectory(prefix="codec_") as tmp:
+            outputs = [Path(tmp) / f"{i}.raw" for i in range(len(sources))]
+            cmd = [FFMPEG, "-v", "error", "-nostdin", "-y"]
+            for source in sources:
+                cmd += ["-i", str(source)]
+            for i, out in enumerate(outputs):
+                cmd += ["-map", f"{i}:a", "-f", PCM_FORMAT, "-ac", str(channels),
+                        "-ar", str(frame_rate), str(out)]
+
+            with trace.span("decode", files=len(sources)) as sp:
+                self._run(cmd, f"decoding {len(sources)} file(s)")
+                pcms = [out.read_bytes() for out in outputs]
+                sp["bytes"] = sum(len(p) for p in pcms)
+                sp["audio_s"] = sp["bytes"] / (SAMPLE_WIDTH * channels) / frame_rate
+        return pcms
+
+    # ----------------------------------------
+    # Encode
+    # ----------------------------------------
+    def encode_many(self, jobs: list[dict]) -> list[Path]:
+        """
+        jobs = [{"pcm": 16-bit PCM, "output": path, "frame_rate", "channels"}, ...]
+        Each output is encoded in its extension's default codec (.wav is
+        written in-process). Returns the output paths, in order.
+        """
+        spawned = []
+        for i, job in enumerate(jobs):
+            output = Path(job["output"])
+            output.parent.mkdir(parents=True, exist_ok=True)
+            if output.suffix.lower() == ".wav":
+                write_wav_pcm(output, job["pcm"], job["frame_rate"], job["channels"])
+            else:
+                spawned.append(i)
+
+        batches = self._split(spawned)
+        futures = [self._pool.submit(self._encode_batch, [jobs[i] for i in batch]) for batch in batches]
+        for future in futures:
+            future.result()
+        return [Path(job["output"]) for job in jobs]
+
+    def _encode_batch(self, jobs: list[dict]):
+        with tempfile.TemporaryDirectory(prefix="codec_") as tmp:
+            cmd = [FFMPEG, "-v", "error", "-nostdin", "-y"]
+            for i, job in enumerate(jobs):
+                raw = Path(tmp) / f"{i}.raw"
+                raw.write_bytes(job["pcm"])
+                cmd += ["-f", PCM_FORMAT, "-ar", str(job["frame_rate"]), "-ac", str(job["channels"]),
+                        "-i", str(raw)]
+            for i, job in enumerate(jobs):
+                output = Path(job["output"])
+                cmd += ["-map", f"{i}:a", "-f", MUXERS.get(output.suffix.lower(), "mp3"), str(output)]
+
+            with trace.span("export", files=len(jobs)) as sp:
+                self._run(cmd, f"encoding {len(jobs)} file(s)")
+                sp["bytes"] = sum(Path(job["output"]).stat().st_size for job in jobs)
+
+    # ----------------------------------------
+    # Internals
+    # ----------------------------------------
+    def _split(self, indices: list[int]) -> list[list[int]]:
+        """Batches of <= batch_size, spread so every worker gets one when possible."""
+        if not indices:
+            return []
+        size = min(self.batch_size, math.ceil(len(indices) / self.workers))
+        return [indices[i:i + size] for i in range(0, len(indices), size)]
+
+    def _run(self, cmd: list[str], what: str):
+        with self._lock:
+            self.spawns += 1
+        trace.count("codec.spawns")
+        proc = subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+        if proc.returncode != 0:
+            raise RuntimeError(f"[CodecPool] {what} failed: {proc.stderr.decode(errors='replace')}")
+
+    def shutdown(self):
+        self._pool.shutdown()
+
+
+def read_wav_pcm(path, frame_rate: int, channels: int) -> bytes | None:
+    """Samples of a 16-bit PCM WAV already at frame_rate / channels; None otherwise."""
+    if Path(path).suffix.lower() != ".wav":
+        return None
+    try:
+        with wave.open(str(path), "rb") as w:
+            if (w.getframerate(), w.getnchannels(), w.getsampwidth()) != (frame_rate, channels, SAMPLE_WIDTH):
+                return None
+            return w.readframes(w.getnframes())
+    except (wave.Error, EOFError):
+        return None     # e.g. WAVE_FORMAT_EXTENSIBLE: let ffmpeg read it
+
+
+def write_wav_pcm(path, pcm: bytes, frame_rate: int, channels: int):
+    with wave.open(str(path), "wb") as w:
+        w.setnchannels(channels)
+        w.setsampwidth(SAMPLE_WIDTH)
+        w.setframerate(frame_rate)
+        w.writeframes(pcm)
+
+
+# ----------------------------------------
+# Process-wide pool
+# ----------------------------------------
+_shared: CodecPool | None = None
+_shared_lock = threading.Lock()
+
+
+def shared_codec_pool(workers: int | None = None) -> CodecPool:
+    """
+    The process's CodecPool (config.CODEC_WORKERS / CODEC_BATCH_SIZE),
+    created on first use. `workers` overrides config.CODEC_WORKERS for
+    that first creation: render worker processes pass 1, so N of them
+    run N ffmpeg processes rather than N x CPU count.
+    """
+    global _shared
+    with _shared_lock:
+        if _shared is None:
+            from src import config
+            _shared = CodecPool(workers or config.CODEC_WORKERS, config.CODEC_BATCH_SIZE)
+        return _shared
@@ -0,0 +1,152 @@
+# src/core/export_formats.py
+"""
+Export fan-out: one PCM master per lesson output, several encodings.
+
+    config.EXPORT_FORMATS = [
+        {"format": "mp3"},                                  # full_normal.mp3
+        {"format": "opus", "bitrate": "32k"},               # full_normal.opus
+        {"format": "aac", "bitrate": "64k"},                # full_normal.m4a
+        {"format": "aac", "bitrate": "32k", "sample_rate": 16000, "tag": "low"},
+                                                            # full_normal_low.m4a
+    ]
+
+The render's own output path (e.g. full_normal.mp3) is always one of the
+renditions; every other entry is written next to it. Each rendition is
+its own ffmpeg encoder process fed the same PCM, so the encoders run in
+parallel and adding a format costs one extra encode, not another pass
+through decode / stitch / time-stretch.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from src.core.ffmpeg_stream import SAMPLE_WIDTH, StreamingEncoder
+
+# format -> (extension, ffmpeg muxer, ffmpeg encoder)
+CODECS = {
+    "mp3": (".mp3", "mp3", "libmp3lame"),
+    "opus": (".opus", "opus", "libopus"),
+    "aac": (".m4a", "ipod", "aac"),
+    "wav": (".wav", "wav", "pcm_s16le"),
+}
+
+# Sample rates libopus accepts; anything else is resampled to 48 kHz
+OPUS_RATES = (8000, 12000, 16000, 24000, 48000)
+
+
+def renditions(output: str | Path, formats: list[dict] | None) -> list[tuple[Path, dict]]:
+    """
+    [(path, spec), ...] for `output` and every format in `formats`; the
+    first entry is always `output` itself (from a matching untagged spec,
+    or a default one for its extension).
+    """
+    output = Path(output)
+    primary = None
+    others = []
+    for spec in formats or []:
+        if spec["format"] not in CODECS:
+            raise ValueError(f"Unknown export format '{spec['format']}' (expected one of {', '.join(CODECS)})")
+        path = rendition_path(output, spec)
+        if path == output and primary is None:
+            primary = (output, spec)
+        elif path != output:
+            others.append((path, spec))
+
+    if primary is None:
+        fmt = next((f for f, (ext, _, _) in CODECS.items() if ext == output.suffix.lower()), "mp3")
+        primary = (output, {"format": fmt})
+    return [primary] + others
+
+
+def rendition_path(output: str | Path, spec: dict) -> Path:
+    output = Path(output)
+    suffix = CODECS[spec["format"]][0]
+    stem = f"{output.stem}_{spec['tag']}" if spec.get("tag") else output.stem
+    return output.with_name(stem + suffix)
+
+
+def encoder_for(path: Path, spec: dict, frame_rate: int, channels: int,
+                input_rate: int | None = None) -> StreamingEncoder:
+    """StreamingEncoder writing `path` as described by `spec`."""
+    _, container, codec = CODECS[spec["format"]]
+    rate = spec.get("sample_rate") or frame_rate
+    if codec == "libopus" and rate not in OPUS_RATES:
+        rate = 48000
+
+    args = ["-c:a", codec]
+    if spec.get("bitrate") and codec != "pcm_s16le":
+        args += ["-b:a", str(spec["bitrate"])]
+    return StreamingEncoder(path, rate, channels, input_rate=input_rate or frame_rate,
+                            codec_args=args, container=container)
+
+
+class FanOutEncoder:
+    """
+    Same interface as StreamingEncoder (open / write / write_silence /
+    close / abort), but every write goes to one encoder per rendition.
+    Writes are handed to all encoders at once from a small thread pool,
+    so the ffmpeg processes encode side by side instead of taking turns.
+
+    close() returns the primary output; `outputs` lists every rendition.
+    """
+
+    def __init__(self, output: str | Path, frame_rate: int, channels: int,
+                 formats: list[dict] | None):
+        self.frame_rate = frame_rate
+        self.channels = channels
+        self.encoders = [
+            encoder_for(path, spec, frame_rate, channels, input_rate=frame_rate)
+            for path, spec in renditions(output, formats)
+        ]
+        self.outputs = [enc.output for enc in self.encoders]
+        self._pool = None
+
+    @property
+    def output(self) -> Path:
+        return self.outputs[0]
+
+    @property
+    def frame_width(self) -> int:
+        return self.channels * SAMPLE_WIDTH
+
+    def open(self):
+        self._pool = ThreadPoolExecutor(max_workers=len(self.encoders), thread_name_prefix="encode")
+        opened = []
+        try:
+            for enc in self.encoders:
+                opened.append(enc.open())
+        except BaseException:
+            for enc in opened:
+                enc.abort()
+            self._pool.shutdown()
+            raise
+        return self
+
+    def write(self, pcm: bytes):
+        self._each(lambda enc: enc.write(pcm))
+
+    def write_silence(self, ms: int):
+        self._each(lambda enc: enc.write_silence(ms))
+
+    def close(self) -> Path:
+        try:
+            self._each(lambda enc: enc.close())
+        except BaseException:
+            self.abort()
+            raise
+        finally:
+            self._pool.shutdown()
+        return self.output
+
+    def abort(self):
+        for enc in self.encoders:
+            enc.abort()
+        if self._pool is not None:
+            self._pool.shutdown(wait=False)
+
+    def _each(self, fn):
+        if len(self.encoders) == 1:
+            fn(self.encoders[0])
+            return
+        # list() re-raises the first encoder error
+        list(self._pool.map(fn, self.encoders))
@@ -0,0 +1,127 @@
+# src/core/ffmpeg_stream.py
+
+import os
+import subprocess
+from pathlib import Path
+
+# ffmpeg binary used for streaming decode/encode (same one pydub shells out to)
+FFMPEG = os.getenv("FFMPEG_BINARY", "ffmpeg")
+
+# Raw PCM exchanged over pipes: signed 16-bit little endian
+PCM_FORMAT = "s16le"
+SAMPLE_WIDTH = 2
+
+CHUNK_BYTES = 64 * 1024
+
+
+def iter_decode(path: str | Path, frame_rate: int = 24000, channels: int = 1,
+                chunk_bytes: int = CHUNK_BYTES):
+    """
+    Decodes any audio file to raw PCM and yields it in chunks, without
+    ever holding the whole file in memory.
+    """
+    proc = subprocess.Popen(
+        [FFMPEG, "-v", "error", "-nostdin", "-i", str(path),
+         "-f", PCM_FORMAT, "-ac", str(channels), "-ar", str(frame_rate), "pipe:1"],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+    )
+    try:
+        while True:
+            chunk = proc.stdout.read(chunk_bytes)
+            if not chunk:
+                break
+            yield chunk
+    finally:
+        proc.stdout.close()
+        stderr = proc.stderr.read()
+        proc.stderr.close()
+        if proc.wait() != 0:
+            raise RuntimeError(f"[ffmpeg_stream] decoding {path} failed: {stderr.decode(errors='replace')}")
+
+
+class StreamingEncoder:
+    """
+    Single ffmpeg encoder process fed with raw PCM over stdin.
+
+    - Memory stays constant no matter how long the output is
+    - Writes to <output>.part and renames on success (atomic for readers)
+    - `input_rate` is the rate of the PCM written in (default frame_rate);
+      ffmpeg resamples it to frame_rate, e.g. for an Opus rendition of
+      24 kHz audio (export_formats). The slow versions are time-stretched
+      before encoding (time_stretch), not reinterpreted at another rate
+    - `container` is the ffmpeg muxer; defaults to the output's extension
+      (needed when they differ, e.g. .m4a -> "ipod")
+
+    Usage:
+        with StreamingEncoder("full.mp3", frame_rate=24000) as enc:
+            enc.write(pcm_chunk)
+            enc.write_silence(4500)
+    """
+
+    def __init__(self, output: str | Path, frame_rate: int = 24000, channels: int = 1,
+                 input_rate: int | None = None, codec_args: list[str] | None = None,
+                 container: str | None = None):
+        self.output = Path(output)
+        self.frame_rate = frame_rate
+        self.channels = channels
+        self.input_rate = input_rate or frame_rate
+        self.codec_args = codec_args or []
+        self.container = container
+        self.bytes_written = 0
+        self._proc = None
+        self._tmp = self.output.with_name(self.output.name + ".part")
+
+    @property
+    def frame_width(self) -> int:
+        return self.channels * SAMPLE_WIDTH
+
+    def open(self):
+        self.output.parent.mkdir(parents=True, exist_ok=True)
+        fmt = self.container or self.output.suffix.lstrip(".") or "mp3"
+        self._proc = subprocess.Popen(
+            [FFMPEG, "-v", "error", "-nostdin", "-y",
+             "-f", PCM_FORMAT, "-ar", str(self.input_rate), "-ac", str(self.channels), "-i", "pipe:0",
+             "-ar", str(self.frame_rate), *self.codec_args, "-f", fmt, str(self._tmp)],
+            stdin=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+        )
+        return self
+
+    def write(self, pcm: bytes):
+        self._proc.stdin.write(pcm)
+        self.bytes_written += len(pcm)
+
+    def write_silence(self, ms: int):
+        remaining = int(self.input_rate * ms / 1000) * self.frame_width
+        block = bytes(min(remaining, CHUNK_BYTES))
+        while remaining > 0:
+            n = min(remaining, len(block))
+            self.write(block[:n])
+            remaining -= n
+
+    def close(self) -> Path:
+        self._proc.stdin.close()
+        stderr = self._proc.stderr.read()
+        self._proc.stderr.close()
+        if self._proc.wait() != 0:
+            self._tmp.unlink(missing_ok=True)
+            raise RuntimeError(f"[StreamingEncoder] encoding {self.output} failed: {stderr.decode(errors='replace')}")
+        os.replace(self._tmp, self.output)
+        return self.output
+
+    def abort(self):
+        if self._proc is not None and self._proc.poll() is None:
+            self._proc.kill()
+            self._proc.wait()
+        self._tmp.unlink(missing_ok=True)
+
+    def __enter__(self):
+        return self.open()
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+        return False
@@ -0,0 +1,270 @@
+# src/core/instrumentation.py
+"""
+Build tracing: per-stage spans, counters and an optional profiler.
+
+Anywhere in the pipeline:
+
+    from src.core import instrumentation as trace
+
+    with trace.span("decode", file=str(f)) as s:
+        audio = AudioSegment.from_file(f)
+        s["audio_s"] = len(audio) / 1000
+
+    trace.count("cache.hits")
+
+Spans and counters go to the active BuildTrace (a no-op when none is
+active). A build starts one with `trace.start("text1")` and calls
+`finish()`, which writes <TRACE_DIR>/<timestamp>_<name>.json and appends
+a one-line summary to <TRACE_DIR>/history.jsonl so runs can be compared
+(`python -m src.core.instrumentation` prints the recent history).
+"""
+
+import contextlib
+import json
+import os
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+
+
+class BuildTrace:
+    def __init__(self, name: str, trace_dir: str | Path | None = None):
+        self.name = name
+        self.trace_dir = Path(trace_dir) if trace_dir else None
+        self.started_at = datetime.now()
+        self.started_wall = time.time()
+        self._t0 = time.perf_counter()
+        self._lock = threading.Lock()
+        self.spans: list[dict] = []
+        self.counters: dict[str, float] = {}
+
+    # ----------------------------------------
+    # Recording
+    # ----------------------------------------
+    @contextlib.contextmanager
+    def span(self, stage: str, **attrs):
+        """
+        Times a block. The yielded dict can be filled with measurements
+        (bytes, audio_s, ...) before the block exits.
+        """
+        record = {"stage": stage, **attrs}
+        start = time.perf_counter()
+        try:
+            yield record
+        finally:
+            end = time.perf_counter()
+            record["start_s"] = round(start - self._t0, 6)
+            record["duration_s"] = round(end - start, 6)
+            record["thread"] = threading.current_thread().name
+            with self._lock:
+                self.spans.append(record)
+
+    def count(self, name: str, n: float = 1):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + n
+
+    def export(self) -> dict:
+        """Picklable record of this trace, for handing back from a worker process."""
+        with self._lock:
+            return {"started_wall": self.started_wall, "spans": list(self.spans),
+                    "counters": dict(self.counters)}
+
+    def merge(self, exported: dict):
+        """Folds in a trace recorded elsewhere (see export), aligned on wall time."""
+        offset_s = exported["started_wall"] - self.started_wall
+        with self._lock:
+            for s in exported["spans"]:
+                self.spans.append({**s, "start_s": round(s["start_s"] + offset_s, 6)})
+            for k, v in exported["counters"].items():
+                self.counters[k] = self.counters.get(k, 0) + v
+
+    # ----------------------------------------
+    # Reporting
+    # ----------------------------------------
+    def summary(self) -> dict:
+        stages = {}
+        for s in self.spans:
+            st = stages.setdefault(s["stage"], {"count": 0, "total_s": 0.0, "bytes": 0, "audio_s": 0.0})
+            st["count"] += 1
+            st["total_s"] += s["duration_s"]
+            st["bytes"] += s.get("bytes", 0)
+            st["audio_s"] += s.get("audio_s", 0.0)
+        for st in stages.values():
+            st["total_s"] = round(st["total_s"], 4)
+            st["audio_s"] = round(st["audio_s"], 3)
+        return {
+            "name": self.name,
+            "started_at": self.started_at.isoformat(timespec="seconds"),
+            "wall_s": round(time.perf_counter() - self._t0, 4),
+            "stages": stages,
+            "counters": self.counters,
+        }
+
+    def print_summary(self):
+        s = self.summary()
+        print(f"\nBuild trace '{self.name}': {s['wall_s']:.2f}s wall")
+        print(f"  {'stage':<14} {'count':>6} {'total s':>9} {'MB':>8} {'audio s':>9}")
+        for stage, st in sorted(s["stages"].items(), key=lambda kv: -kv[1]["total_s"]):
+            print(
+                f"  {stage:<14} {st['count']:>6} {st['total_s']:>9.2f} "
+                f"{st['bytes'] / 1e6:>8.2f} {st['audio_s']:>9.1f}"
+            )
+        if s["counters"]:
+            print("  " + ", ".join(f"{k}={v:g}" for k, v in sorted(s["counters"].items())))
+
+    def save(self) -> Path | None:
+        if self.trace_dir is None:
+            return None
+        self.trace_dir.mkdir(parents=True, exist_ok=True)
+        summary = self.summary()
+
+        path = self.trace_dir / f"{self.started_at:%Y%m%d-%H%M%S-%f}_{self.name}.json"
+        path.write_text(json.dumps({**summary, "spans": self.spans}, indent=2), encoding="utf-8")
+
+        with open(self.trace_dir / "history.jsonl", "a", encoding="utf-8") as f:
+            f.write(json.dumps(summary) + "\n")
+        return path
+
+
+class _NullTrace:
+    """Used when no build is being traced: records nothing."""
+
+    @contextlib.contextmanager
+    def span(self, stage, **attrs):
+        yield {}
+
+    def count(self, name, n=1):
+        pass
+
+
+_NULL = _NullTrace()
+_active: BuildTrace | None = None
+
+
+# ----------------------------------------
+# Module-level API
+# ----------------------------------------
+def start(name: str, trace_dir: str | Path | None = None) -> BuildTrace:
+    global _active
+    _active = BuildTrace(name, trace_dir)
+    return _active
+
+
+def current():
+    return _active or _NULL
+
+
+def span(stage: str, **attrs):
+    return current().span(stage, **attrs)
+
+
+def count(name: str, n: float = 1):
+    current().count(name, n)
+
+
+def finish(print_summary: bool = True) -> Path | None:
+    global _active
+    trace, _active = _active, None
+    if trace is None:
+        return None
+    if print_summary:
+        trace.print_summary()
+    path = trace.save()
+    if path:
+        print(f"  trace: {path}")
+    return path
+
+
+@contextlib.contextmanager
+def profiled(kind: str | None, output: str | Path):
+    """
+    Optional profiler around a build:
+      kind=None           no profiling
+      kind="cprofile"     writes <output>.prof (snakeviz / pstats)
+      kind="pyinstrument" writes <output>.html (needs pyinstrument installed)
+    """
+    if not kind:
+        yield
+        return
+
+    output = Path(output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+
+    if kind == "cprofile":
+        import cProfile
+
+        prof = cProfile.Profile()
+        prof.enable()
+        try:
+            yield
+        finally:
+            prof.disable()
+            prof.dump_stats(output.with_suffix(".prof"))
+            print(f"  profile: {output.with_suffix('.prof')}")
+
+    elif kind == "pyinstrument":
+        from pyinstrument import Profiler
+
+        prof = Profiler()
+        prof.start()
+        try:
+            yield
+        finally:
+            prof.stop()
+            output.with_suffix(".html").write_text(prof.output_html(), encoding="utf-8")
+            print(f"  profile: {output.with_suffix('.html')}")
+
+    else:
+        raise ValueError(f"Unknown profiler '{kind}' (use 'cprofile' or 'pyinstrument')")
+
+
+# ----------------------------------------
+# History across runs
+# ----------------------------------------
+def load_history(trace_dir: str | Path, name: str | None = None) -> list[dict]:
+    path = Path(trace_dir) / "history.jsonl"
+    if not path.exists():
+        return []
+    runs = [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines() if line.strip()]
+    return [r for r in runs if name is None or r["name"] == name]
+
+
+def print_history(trace_dir: str | Path, name: str | None = None, last: int = 10):
+    """
+    Per-stage totals of the last `last` runs, with the change of the latest
+    run against the median of the earlier ones (regression check).
+    """
+    runs = load_history(trace_dir, name)[-last:]
+    if not runs:
+        print(f"No traced builds in {trace_dir}")
+        return
+
+    stages = sorted({s for r in runs for s in r["stages"]})
+    print(f"{'started':<20} {'name':<18} {'wall s':>8} " + " ".join(f"{s[:10]:>10}" for s in stages))
+    for r in runs:
+        cells = " ".join(f"{r['stages'].get(s, {}).get('total_s', 0):>10.2f}" for s in stages)
+        print(f"{r['started_at']:<20} {r['name'][:18]:<18} {r['wall_s']:>8.2f} {cells}")
+
+    if len(runs) > 1:
+        latest, earlier = runs[-1], runs[:-1]
+        print("\nlatest vs median of earlier runs:")
+        for s in ["wall"] + stages:
+            values = sorted(
+                r["wall_s"] if s == "wall" else r["stages"].get(s, {}).get("total_s", 0) for r in earlier
+            )
+            median = values[len(values) // 2]
+            now = latest["wall_s"] if s == "wall" else latest["stages"].get(s, {}).get("total_s", 0)
+            if median > 0:
+                print(f"  {s:<14} {now:>8.2f}s  ({(now - median) / median:+.0%})")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    ap = argparse.ArgumentParser(description="Show traced build history.")
+    ap.add_argument("--dir", default=os.getenv("TRACE_DIR", Path(__file__).resolve().parents[2] / "build_traces"))
+    ap.add_argument("--name", help="only builds of this lesson")
+    ap.add_argument("--last", type=int, default=10)
+    args = ap.parse_args()
+    print_history(args.dir, args.name, args.last)
@@ -0,0 +1,429 @@
+# src/core/lesson_builder.py
+
+import math
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from src.core import instrumentation as trace
+from src.core.phrase_parser import PhraseParser
+from src.core.build_manifest import BuildManifest
+from src.core.export_formats import renditions
+from src.core.lesson_timeline import load_layout, write_timeline
+from src.core.pause_planner import PausePlanner, probe_duration_ms
+from src.core.voice_profiles import VOICE_PROFILES
+from src import config
+
+if TYPE_CHECKING:   # imported where a render runs: planning never loads audio libraries
+    from src.core.audio_postprocessor import AudioPostProcessor
+
+
+# -----------------------------------------------------------
+# 1. Plan: parse the lesson, lay out folders, diff vs last build
+# -----------------------------------------------------------
+def plan_lesson(lesson_file: str | Path, tts, output_root: str | Path | None = None) -> dict | None:
+    """
+    Parses `lesson_file` and works out what a build has to do.
+
+    Returns None if the file has no usable phrases, otherwise:
+        {
+          "name", "root", "manifest",
+          "normal_jobs", "spanish_jobs",   # every phrase, in lesson order
+          "pending",                       # only the phrases to synthesize
+          "phrases", "spanish_spoken",     # PhraseParser output (timeline texts)
+        }
+    Job dicts are the ones TTSEngine.synthesize_many takes (+ "key").
+    """
+    lesson = _read_lesson(lesson_file, tts, output_root)
+    if lesson is None:
+        return None
+
+    lesson["root"].joinpath("normal").mkdir(parents=True, exist_ok=True)
+    lesson["root"].joinpath("spanish_intro").mkdir(parents=True, exist_ok=True)
+
+    # Previous build record: lets us skip unchanged phrases and outputs
+    manifest = BuildManifest(lesson["root"])
+
+    pending = manifest.reconcile_phrases("normal", lesson["normal_jobs"])
+    pending += manifest.reconcile_phrases("spanish_intro", lesson["spanish_jobs"])
+
+    return {**lesson, "manifest": manifest, "pending": pending}
+
+
+def preview_lesson(lesson_file: str | Path, tts, output_root: str | Path | None = None,
+                   planner: PausePlanner | None = None) -> dict | None:
+    """
+    Lesson length without synthesizing, decoding or touching any file:
+    phrase durations come from the last build's manifest, or are
+    estimated from the text for phrases never built.
+
+    Returns None for a file without phrases, otherwise
+        {"name", "phrases", "estimated", "pauses_ms", "duration_ms", "slow_duration_ms"}
+    """
+    lesson = _read_lesson(lesson_file, tts, output_root)
+    if lesson is None:
+        return None
+    return _preview(lesson, BuildManifest(lesson["root"]).durations(), planner)
+
+
+def dry_run_lesson(lesson_file: str | Path, tts, cached_keys: set[str] | None = None,
+                   output_root: str | Path | None = None,
+                   planner: PausePlanner | None = None) -> dict | None:
+    """
+    What building `lesson_file` would cost, without synthesizing,
+    decoding or writing anything: the last build's manifest is only read,
+    and `cached_keys` are the synthesis cache's entries
+    (SynthesisCache.indexed_keys).
+
+    Returns None for a file without phrases, otherwise preview_lesson's
+    fields plus
+        {"spanish":    ¿¿ phrases among "phrases",
+         "unchanged":  phrases reused from the last build,
+         "cache_hits": phrases the synthesis cache already has,
+         "characters": text still to synthesize,
+         "requests":   backend calls left (packed / batched as TTSEngine would)}
+    """
+    lesson = _read_lesson(lesson_file, tts, output_root)
+    if lesson is None:
+        return None
+
+    manifest = BuildManifest(lesson["root"])
+    result = _preview(lesson, manifest.durations(), planner)
+    cached_keys = cached_keys or set()
+
+    # Same reuse rule as BuildManifest.reconcile_phrases, read-only
+    pending = []
+    for section, jobs in (("normal", lesson["normal_jobs"]), ("spanish_intro", lesson["spanish_jobs"])):
+        reusable = {
+            e["key"] for e in manifest.previous.get("phrases", {}).get(section, [])
+            if (lesson["root"] / e["file"]).exists()
+        }
+        pending += [job for job in jobs if job["key"] not in reusable]
+
+    # Phrases still to fetch: one per key, grouped as TTSEngine._batches does
+    missing = {}
+    for job in pending:
+        if job["key"] not in cached_keys:
+            missing.setdefault(job["key"], job)
+    groups = {}
+    for job in missing.values():
+        group = (job.get("model") or tts.model, job.get("voice") or tts.voice,
+                 job.get("instructions") or tts.instructions)
+        groups[group] = groups.get(group, 0) + 1
+    per_call = tts.pack_phrases if tts.packing else max(1, tts.backend.batch_size)
+
+    return {
+        **result,
+        "spanish": len(lesson["spanish_jobs"]),
+        "unchanged": result["phrases"] - len(pending),
+        "cache_hits": sum(job["key"] in cached_keys for job in pending),
+        "characters": sum(len(job["text"]) for job in missing.values()),
+        "requests": sum(math.ceil(n / per_call) for n in groups.values()),
+    }
+
+
+def _preview(lesson: dict, known: dict, planner: PausePlanner | None) -> dict:
+    """preview_lesson's report for an already read lesson; `known` = phrase durations by key."""
+    planner = planner or default_pause_planner()
+
+    sections = []
+    estimated = 0
+    for name, jobs in _sections(lesson):
+        durations = []
+        for job in jobs:
+            if job["key"] in known:
+                durations.append(known[job["key"]])
+            else:
+                durations.append(planner.estimate_duration_ms(job["text"]))
+                estimated += 1
+        sections.append((name, durations))
+
+    timeline = planner.plan_lesson(sections)
+    return {
+        "name": lesson["name"],
+        "phrases": sum(len(d) for _, d in sections),
+        "estimated": estimated,
+        "pauses_ms": sum(sum(p) for p in timeline["pauses"]),
+        "duration_ms": timeline["duration_ms"],
+        "slow_duration_ms": timeline["duration_ms"] / config.SLOW_FACTOR,
+    }
+
+
+def default_pause_planner() -> PausePlanner:
+    return PausePlanner(config.PAUSE_PROFILES, config.PAUSE_ESTIMATE_MS_PER_CHAR)
+
+
+def _read_lesson(lesson_file: str | Path, tts, output_root: str | Path | None) -> dict | None:
+    """Parses the lesson and names every phrase job (no files touched)."""
+    lesson_file = Path(lesson_file)
+    with trace.span("parse", file=lesson_file.name) as sp:
+        raw_text = lesson_file.read_text(encoding="utf-8")
+        parsed = PhraseParser().parse(raw_text)
+        sp["bytes"] = len(raw_text.encode("utf-8"))
+
+    phrases = parsed["phrases"]                # English/Spanish pairs
+    spanish_spoken = parsed["spanish_spoken"]  # ¿¿ Spanish-only lines
+
+    if not phrases and not spanish_spoken:
+        return None
+
+    lesson_root = Path(output_root or config.OUTPUT_ROOT) / lesson_file.stem
+    normal_dir = lesson_root / "normal"
+    spanish_dir = lesson_root / "spanish_intro"
+
+    # Each section speaks with its own voice profile (config.LESSON_VOICES)
+    en_voice = section_voice(tts, "main_lesson")
+    es_voice = section_voice(tts, "spanish_intro")
+
+    normal_jobs = [
+        {"key": tts.phrase_key(p["en"], **en_voice), "text": p["en"],
+         "out": normal_dir / f"phrase_{idx:02d}{tts.file_suffix}", **en_voice}
+        for idx, p in enumerate(phrases, start=1)
+    ]
+    spanish_jobs = [
+        {"key": tts.phrase_key(p["es"], **es_voice), "text": p["es"],
+         "out": spanish_dir / f"spanish_{idx:02d}{tts.file_suffix}", **es_voice}
+        for idx, p in enumerate(spanish_spoken, start=1)
+    ]
+
+    return {
+        "name": lesson_file.stem,
+        "root": lesson_root,
+        "normal_jobs": normal_jobs,
+        "spanish_jobs": spanish_jobs,
+        "phrases": phrases,
+        "spanish_spoken": spanish_spoken,
+    }
+
+
+def section_voice(tts, section: str) -> dict:
+    """Job voice fields for a lesson section, from config.LESSON_VOICES."""
+    name = config.LESSON_VOICES.get(section)
+    if not name:
+        return {}
+    profile = VOICE_PROFILES.get(name)
+    if profile is None:
+        print(f"[lesson_builder] Unknown voice profile '{name}' for {section}, using the default voice")
+        return {}
+    return tts.voice_settings(profile)
+
+
+def _sections(lesson: dict) -> list[tuple[str, list[dict]]]:
+    """[(section name, jobs), ...] in playback order (¿¿ intro first, if any)."""
+    sections = [("spanish_intro", lesson["spanish_jobs"])] if lesson["spanish_jobs"] else []
+    return sections + [("main_lesson", lesson["normal_jobs"])]
+
+
+# -----------------------------------------------------------
+# 2. Render: sections, full_normal and full_slow in one pass
+#    (each phrase decoded once, each output encoded once).
+#    Outputs whose inputs are unchanged since the last build
+#    are skipped.
+# -----------------------------------------------------------
+def render_plan(plan: dict, post: "AudioPostProcessor") -> dict:
+    """
+    Renders every stale output of a planned lesson and saves its manifest.
+    Phrase files must already exist (i.e. plan["pending"] synthesized);
+    lesson_pipeline.build_lesson_pipelined overlaps the two instead.
+
+    Every full_* output gets a <name>.timeline.json sidecar (phrase
+    positions, byte offsets and texts, see lesson_timeline). Sidecars are
+    refreshed on every build, so editing only a translation updates them
+    without re-rendering audio.
+
+    Returns {"rendered": [paths], "skipped": [paths]}.
+    """
+    manifest: BuildManifest = plan["manifest"]
+    conditioning = render_conditioning()
+    analyses = manifest.analyses()
+
+    # Pauses are planned up front from phrase durations read from file
+    # headers (cached per phrase key), so nothing is decoded to size them.
+    # Files without a cheap probe are sized from their text for this
+    # render, but only measured durations go into the manifest.
+    planner = default_pause_planner()
+    measured = manifest.durations()
+    durations = dict(measured)
+    for _, jobs in _sections(plan):
+        for job in jobs:
+            if job["key"] not in durations:
+                d = probe_duration_ms(job["out"])
+                if d is not None:
+                    measured[job["key"]] = d
+                durations[job["key"]] = d if d is not None else planner.estimate_duration_ms(job["text"])
+
+    targets = render_targets(plan, durations, conditioning, planner)
+    wanted = targets["wanted"]
+    stale = [out for out, h in wanted.items() if not output_fresh(manifest, out, h, targets)]
+
+    # Phrase positions come from the render; without a previous sidecar
+    # to reuse them from, full_normal is rendered again.
+    layout = load_layout(targets["full_normal"])
+    if layout is None and targets["full_normal"] not in stale:
+        stale.append(targets["full_normal"])
+
+    if stale:
+        sections = [{**sec, "output": sec["output"] if sec["output"] in stale else None}
+                    for sec in targets["sections"]]
+        render = post.render_lesson_streaming if config.STREAMING_EXPORT else post.render_lesson
+        layout = render(sections, analyses=analyses, **render_kwargs(targets, stale, conditioning))["layout"]
+
+    finish_render(plan, targets, layout, analyses, measured)
+    return {"rendered": stale, "skipped": [out for out in wanted if out not in stale]}
+
+
+def render_conditioning() -> dict | None:
+    """Per-phrase trim / loudness settings from config (None when both are off)."""
+    conditioning = {
+        "trim": config.TRIM_SILENCE,
+        "trim_db": config.TRIM_THRESHOLD_DB,
+        "floor_db": config.TRIM_FLOOR_DB,
+        "pad_ms": config.TRIM_PAD_MS,
+        "normalize": config.NORMALIZE_LOUDNESS,
+        "target_lufs": config.TARGET_PHRASE_LUFS,
+        "max_gain_db": config.MAX_PHRASE_GAIN_DB,
+    }
+    if not (conditioning["trim"] or conditioning["normalize"]):
+        return None
+    return conditioning
+
+
+def render_targets(plan: dict, durations: dict, conditioning: dict | None,
+                   planner: PausePlanner) -> dict:
+    """
+    Every output of a lesson and the inputs hash it should be built from,
+    with pauses planned from `durations` (phrase key -> ms).
+
+    Returns {"sections": [render_lesson section dicts], "section_names",
+             "texts", "full_normal", "full_slow", "slow_variants",
+             "lesson_outputs", "wanted": {output: inputs hash}}
+    """
+    lesson_root: Path = plan["root"]
+    manifest: BuildManifest = plan["manifest"]
+    render_settings = {
+        "frame_rate": config.RENDER_FRAME_RATE,
+        "channels": config.RENDER_CHANNELS,
+        "conditioning": conditioning,
+    }
+
+    section_names = [name for name, _ in _sections(plan)]
+    pauses = planner.plan_lesson([
+        (name, [durations[job["key"]] for job in jobs]) for name, jobs in _sections(plan)
+    ])["pauses"]
+
+    texts = {
+        "spanish_intro": [{"es": p["es"]} for p in plan["spanish_spoken"]],
+        "main_lesson": [{"en": p["en"], "es": p["es"]} for p in plan["phrases"]],
+    }
+    texts = [texts[name] for name in section_names]
+
+    sections = [
+        {
+            "files": [job["out"] for job in jobs],
+            "keys": [job["key"] for job in jobs],
+            "silence_ms": section_pauses,
+            "output": lesson_root / f"section_{name}.mp3",
+        }
+        for (name, jobs), section_pauses in zip(_sections(plan), pauses)
+    ]
+
+    full_normal = lesson_root / "full_normal.mp3"
+    full_slow = lesson_root / "full_slow.mp3"
+
+    all_keys = [k for sec in sections for k in sec["keys"]]
+    all_silences = [sec["silence_ms"] for sec in sections]
+    wanted = {
+        sec["output"]: manifest.inputs_hash(sec["keys"], {**render_settings, "silence_ms": sec["silence_ms"]})
+        for sec in sections
+    }
+    # Lesson outputs fan out to every EXPORT_FORMATS encoding
+    lesson_settings = {**render_settings, "silences": all_silences, "formats": config.EXPORT_FORMATS}
+    wanted[full_normal] = manifest.inputs_hash(all_keys, lesson_settings)
+    slow_settings = {**lesson_settings, "slow_method": "wsola"}
+    wanted[full_slow] = manifest.inputs_hash(all_keys, {**slow_settings, "slow_factor": config.SLOW_FACTOR})
+
+    slow_variants = {
+        f: lesson_root / f"full_slow_{int(round(f * 100)):03d}.mp3"
+        for f in config.SLOW_VARIANT_FACTORS
+    }
+    for f, out in slow_variants.items():
+        wanted[out] = manifest.inputs_hash(all_keys, {**slow_settings, "slow_factor": f})
+
+    return {
+        "sections": sections,
+        "section_names": section_names,
+        "texts": texts,
+        "full_normal": full_normal,
+        "full_slow": full_slow,
+        "slow_variants": slow_variants,
+        "lesson_outputs": [full_normal, full_slow, *slow_variants.values()],
+        "wanted": wanted,
+    }
+
+
+def output_fresh(manifest: BuildManifest, output: Path, inputs_hash: str, targets: dict) -> bool:
+    """Built from these inputs, and (lesson outputs) every format rendition still on disk."""
+    if not manifest.is_fresh(output, inputs_hash):
+        return False
+    if output in targets["lesson_outputs"]:
+        return all(p.exists() for p, _ in renditions(output, config.EXPORT_FORMATS))
+    return True
+
+
+def render_kwargs(targets: dict, stale: list[Path], conditioning: dict | None) -> dict:
+    """render_lesson(_streaming) arguments for the stale lesson outputs."""
+    return {
+        "full_normal": targets["full_normal"] if targets["full_normal"] in stale else None,
+        "full_slow": targets["full_slow"] if targets["full_slow"] in stale else None,
+        "slow_factor": config.SLOW_FACTOR,
+        "frame_rate": config.RENDER_FRAME_RATE,
+        "channels": config.RENDER_CHANNELS,
+        "slow_variants": {f: out for f, out in targets["slow_variants"].items() if out in stale},
+        "conditioning": conditioning,
+        "formats": config.EXPORT_FORMATS,
+    }
+
+
+def finish_render(plan: dict, targets: dict, layout: list[dict], analyses: dict, durations: dict):
+    """
+    Writes the timeline sidecars and records the build in the lesson
+    manifest. `durations` must hold measured values only (probed or
+    decoded), never text estimates.
+    """
+    manifest: BuildManifest = plan["manifest"]
+
+    timelines = [(targets["full_normal"], 1.0), (targets["full_slow"], 1 / config.SLOW_FACTOR)]
+    timelines += [(out, 1 / f) for f, out in targets["slow_variants"].items()]
+    for out, time_scale in timelines:
+        write_timeline(out, layout, targets["section_names"], targets["texts"], time_scale)
+
+    all_keys = [k for sec in targets["sections"] for k in sec["keys"]]
+    for out, h in targets["wanted"].items():
+        manifest.record_output(out, h)
+    manifest.record_analyses(analyses, all_keys)
+    manifest.record_durations(durations, all_keys)
+    manifest.save()
+
+
+def render_plan_worker(plan: dict) -> dict:
+    """
+    Process-pool entry point: renders one planned lesson in a worker
+    process and reports how long it took. Each lesson only writes inside
+    its own lesson_output/<name>/ folder.
+
+    The worker records its own trace and returns it under "trace" for the
+    parent to merge (BuildTrace.merge). Its codec pool gets one ffmpeg
+    worker: the process pool already runs one render per core.
+    """
+    from src.core.audio_postprocessor import AudioPostProcessor
+
+    started = time.perf_counter()
+    worker_trace = trace.start(plan["name"])
+    try:
+        result = render_plan(plan, AudioPostProcessor.from_config(codec_workers=1))
+    finally:
+        trace.finish(print_summary=False)
+    result["name"] = plan["name"]
+    result["render_s"] = time.perf_counter() - started
+    result["trace"] = worker_trace.export()
+    return result
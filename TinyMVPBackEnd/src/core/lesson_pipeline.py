@@ -0,0 +1,190 @@
+# src/core/lesson_pipeline.py
+"""
+Synthesis and rendering of one lesson, overlapped.
+
+    synthesize ──> decode / analyze ──> place (lesson order) ──> encode
+    (TTSEngine     (thread pool, up     (waits only for the     (ffmpeg
+     threads)       to `window` phrases  next phrase)            processes)
+                    ahead of placement)
+
+- Phrases are requested in lesson order and decoded as soon as their
+  file lands, whatever order the requests complete in
+- Decoding runs at most `window` phrases ahead of the placer (bounded
+  buffer), so memory stays at a few phrases whatever the lesson length
+- The placer feeds render_lesson_streaming's encoders in lesson order,
+  sizing each pause from the phrase just placed (PausePlanner)
+
+Network waits and decode/encode CPU overlap, so a fresh lesson takes
+about max(synthesis, render) instead of their sum. Outputs, timelines
+and the manifest are exactly what synthesize_many + render_plan produce.
+"""
+
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from src.core import instrumentation as trace
+from src.core.audio_postprocessor import AudioPostProcessor
+from src.core.lesson_builder import (
+    _sections, default_pause_planner, finish_render, output_fresh, render_conditioning,
+    render_kwargs, render_plan, render_targets,
+)
+from src.core.pause_planner import probe_duration_ms
+from src import config
+
+
+class _Placement:
+    """Index of the next phrase to place; decoders wait until they are within `window` of it."""
+
+    def __init__(self, window: int):
+        self.window = max(1, window)
+        self.next = 0
+        self.failed = False
+        self._cond = threading.Condition()
+
+    def wait_for_slot(self, index: int):
+        with self._cond:
+            self._cond.wait_for(lambda: self.failed or index < self.next + self.window)
+
+    def advance(self):
+        with self._cond:
+            self.next += 1
+            self._cond.notify_all()
+
+    def fail(self):
+        with self._cond:
+            self.failed = True
+            self._cond.notify_all()
+
+
+def build_lesson_pipelined(plan: dict, tts, post: AudioPostProcessor | None = None,
+                           decode_workers: int | None = None, window: int | None = None) -> dict:
+    """
+    Synthesizes plan["pending"] and renders the lesson at the same time.
+
+    Falls back to render_plan when nothing needs synthesizing (no network
+    time to hide) or every output is still fresh (nothing to encode).
+    Returns render_plan's {"rendered", "skipped"} plus "synthesized":
+    the synthesize_many results.
+    """
+    post = post or AudioPostProcessor.from_config()
+    if not plan["pending"]:
+        return {**render_plan(plan, post), "synthesized": []}
+
+    manifest = plan["manifest"]
+    conditioning = render_conditioning()
+    analyses = manifest.analyses()
+    planner = default_pause_planner()
+    durations = manifest.durations()
+    frame_rate, channels = config.RENDER_FRAME_RATE, config.RENDER_CHANNELS
+    window = window or config.PIPELINE_WINDOW
+    decode_workers = decode_workers or config.PIPELINE_DECODE_WORKERS or os.cpu_count() or 1
+
+    # Every phrase in lesson order; new ones are requested in that order too
+    flat = [(name, job) for name, jobs in _sections(plan) for job in jobs]
+    position = {job["out"]: i for i, (_, job) in enumerate(flat)}
+    pending = sorted(plan["pending"], key=lambda job: position.get(job["out"], len(flat)))
+    arrived = {job["out"]: threading.Event() for job in pending}
+
+    # Which outputs to build: the same inputs-hash check as render_plan,
+    # on provisional targets (phrases never measured sized from their
+    # text). A pending phrase whose key is unchanged (e.g. restored from
+    # the synthesis cache) leaves its outputs fresh; a new key changes
+    # the hash of every output it is part of
+    provisional = {**durations}
+    for _, job in flat:
+        if job["key"] not in provisional and job["out"] not in arrived:
+            provisional[job["key"]] = probe_duration_ms(job["out"])
+        if provisional.get(job["key"]) is None:
+            provisional[job["key"]] = planner.estimate_duration_ms(job["text"])
+    targets = render_targets(plan, provisional, conditioning, planner)
+    stale = [out for out, h in targets["wanted"].items() if not output_fresh(manifest, out, h, targets)]
+    if not stale:
+        # Nothing to encode: no render to overlap the synthesis with
+        synthesized = tts.synthesize_many(pending)
+        return {**render_plan(plan, post), "synthesized": synthesized}
+
+    # ----------------------------------------
+    # Stage 1: synthesis (background thread)
+    # ----------------------------------------
+    synthesized = []
+    errors = []
+
+    def synthesize():
+        try:
+            for i, result in tts.iter_synthesize(pending):
+                synthesized.append(result)
+                arrived[pending[i]["out"]].set()
+        except BaseException as e:
+            errors.append(e)
+        finally:
+            for event in arrived.values():
+                event.set()
+
+    # ----------------------------------------
+    # Stage 2: decode + analyze (thread pool, bounded look-ahead)
+    # ----------------------------------------
+    placement = _Placement(window)
+
+    def decode(index: int) -> tuple[bytes, float]:
+        _, job = flat[index]
+        placement.wait_for_slot(index)
+        if placement.failed:
+            raise RuntimeError("pipeline stopped")
+        if job["out"] in arrived:
+            arrived[job["out"]].wait()
+            if errors:
+                raise errors[0]
+        with trace.span("decode", file=job["out"].name) as sp:
+            duration = durations.get(job["key"]) or probe_duration_ms(job["out"])
+            pcm = post.phrase_pcm(job["out"], job["key"], frame_rate, channels, conditioning, analyses)
+            if duration is None:
+                duration = len(pcm) / (2 * channels) / frame_rate * 1000
+            sp["bytes"] = len(pcm)
+            sp["audio_s"] = len(pcm) / (2 * channels) / frame_rate
+        return pcm, duration
+
+    # ----------------------------------------
+    # Stage 3: placement in lesson order (feeds the encoders)
+    # ----------------------------------------
+    def source(section: str, phrases: list):
+        for job, future in phrases:
+            pcm, duration = future.result()
+            durations[job["key"]] = duration
+            placement.advance()
+            yield job["out"].name, [pcm], planner.pause_ms(section, duration)
+
+    synth_thread = threading.Thread(target=synthesize, name="pipeline-synth", daemon=True)
+    synth_thread.start()
+    try:
+        with ThreadPoolExecutor(max_workers=decode_workers, thread_name_prefix="decode") as pool:
+            futures = [pool.submit(decode, i) for i in range(len(flat))]
+            sections = []
+            for (name, jobs), sec in zip(_sections(plan), targets["sections"]):
+                phrases = [(job, futures[position[job["out"]]]) for job in jobs]
+                sections.append({
+                    "source": source(name, phrases),
+                    "output": sec["output"] if sec["output"] in stale else None,
+                })
+            try:
+                layout = post.render_lesson_streaming(
+                    sections, **render_kwargs(targets, stale, conditioning)
+                )["layout"]
+            except BaseException:
+                placement.fail()
+                raise
+    finally:
+        synth_thread.join()
+
+    if errors:
+        raise errors[0]
+
+    # Final targets: pauses / hashes from the real durations (the same
+    # values the placer used)
+    targets = render_targets(plan, durations, conditioning, planner)
+    finish_render(plan, targets, layout, analyses, durations)
+    return {
+        "rendered": stale,
+        "skipped": [out for out in targets["wanted"] if out not in stale],
+        "synthesized": synthesized,
+    }
@@ -0,0 +1,298 @@
+# src/core/lesson_timeline.py
+"""
+Timeline sidecars: where every phrase sits inside a rendered lesson.
+
+full_normal.mp3 gets full_normal.timeline.json (same for full_slow*.mp3):
+
+    {
+      "version": 1,
+      "audio": "full_normal.mp3", "bytes": 5123456, "duration_ms": 812345.0,
+      "time_scale": 1.0,
+      "sections": [{"name": "spanish_intro", "start_ms", "end_ms", "first": 0, "count": 3}, ...],
+      "fields": ["start_ms", "end_ms", "byte_start", "byte_end", "en", "es"],
+      "phrases": [[0.0, 2410.5, 0, 39168, null, "Bienvenido..."], ...]
+    }
+
+start/end are the phrase's speech (the pause after it is not included).
+byte_start/byte_end bound the MP3 frames covering it, so a player can
+`Range: bytes=byte_start-byte_end` a single phrase; byte_start backs up
+one frame so the bit reservoir of the first frame is present. For WAV
+outputs the offsets are exact sample positions.
+"""
+
+import json
+from pathlib import Path
+
+VERSION = 1
+FIELDS = ["start_ms", "end_ms", "byte_start", "byte_end", "en", "es"]
+
+# MPEG audio Layer III header tables
+_MPEG1, _MPEG2, _MPEG25 = 3, 2, 0
+_BITRATES_KBPS = {
+    _MPEG1: [0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320],
+    _MPEG2: [0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160],
+}
+_SAMPLE_RATES = {
+    _MPEG1: [44100, 48000, 32000],
+    _MPEG2: [22050, 24000, 16000],
+    _MPEG25: [11025, 12000, 8000],
+}
+_DECODER_DELAY = 529     # samples every MP3 decoder adds on top of the encoder delay
+
+
+def timeline_path(audio_path: str | Path) -> Path:
+    audio_path = Path(audio_path)
+    return audio_path.with_name(f"{audio_path.stem}.timeline.json")
+
+
+# ----------------------------------------
+# Layout (times only, in the normal-speed render)
+# ----------------------------------------
+def layout_sections(durations_ms: list[list[float]], silences_ms: list) -> list[dict]:
+    """
+    Phrase positions in a render that joins each section's phrases with
+    its silence after every phrase, then the sections back to back
+    (what AudioPostProcessor.render_lesson does).
+
+    durations_ms = one list of phrase durations per section
+    silences_ms  = per section: one value, or one value per phrase
+    """
+    sections = []
+    pos = 0.0
+    for durations, silence in zip(durations_ms, silences_ms):
+        gaps = silence if isinstance(silence, (list, tuple)) else [silence] * len(durations)
+        start = pos
+        phrases = []
+        for d, gap in zip(durations, gaps):
+            phrases.append([round(pos, 2), round(pos + d, 2)])
+            pos += d + gap
+        sections.append({"start_ms": round(start, 2), "end_ms": round(pos, 2), "phrases": phrases})
+    return sections
+
+
+def load_layout(audio_path: str | Path) -> list[dict] | None:
+    """Layout of a previously written sidecar (normal-speed times), or None."""
+    path = timeline_path(audio_path)
+    if not path.exists():
+        return None
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    if data.get("version") != VERSION:
+        return None
+
+    scale = data["time_scale"]
+    sections = []
+    for sec in data["sections"]:
+        rows = data["phrases"][sec["first"]:sec["first"] + sec["count"]]
+        sections.append({
+            "start_ms": round(sec["start_ms"] / scale, 2),
+            "end_ms": round(sec["end_ms"] / scale, 2),
+            "phrases": [[round(r[0] / scale, 2), round(r[1] / scale, 2)] for r in rows],
+        })
+    return sections
+
+
+# ----------------------------------------
+# Sidecar
+# ----------------------------------------
+def build_timeline(audio_path: str | Path, layout: list[dict], section_names: list[str],
+                   texts: list[list[dict]], time_scale: float = 1.0) -> dict:
+    """
+    layout      = layout_sections(...) of the normal-speed render
+    texts       = per section, one {"en": ..., "es": ...} per phrase
+    time_scale  = 1 / slow factor for slowed renders
+    """
+    audio_path = Path(audio_path)
+    locate = _byte_locator(audio_path)
+
+    sections = []
+    phrases = []
+    for name, sec, sec_texts in zip(section_names, layout, texts):
+        sections.append({
+            "name": name,
+            "start_ms": round(sec["start_ms"] * time_scale, 2),
+            "end_ms": round(sec["end_ms"] * time_scale, 2),
+            "first": len(phrases),
+            "count": len(sec["phrases"]),
+        })
+        for (start, end), text in zip(sec["phrases"], sec_texts):
+            start, end = round(start * time_scale, 2), round(end * time_scale, 2)
+            byte_start, byte_end = locate(start, end)
+            phrases.append([start, end, byte_start, byte_end, text.get("en"), text.get("es")])
+
+    return {
+        "version": VERSION,
+        "audio": audio_path.name,
+        "bytes": audio_path.stat().st_size,
+        "duration_ms": sections[-1]["end_ms"] if sections else 0.0,
+        "time_scale": time_scale,
+        "sections": sections,
+        "fields": FIELDS,
+        "phrases": phrases,
+    }
+
+
+def write_timeline(audio_path: str | Path, layout: list[dict], section_names: list[str],
+                   texts: list[list[dict]], time_scale: float = 1.0) -> Path:
+    """Writes the sidecar next to `audio_path` (only if its content changed)."""
+    path = timeline_path(audio_path)
+    content = json.dumps(
+        build_timeline(audio_path, layout, section_names, texts, time_scale),
+        ensure_ascii=False, separators=(",", ":"),
+    )
+    if not path.exists() or path.read_text(encoding="utf-8") != content:
+        tmp = path.with_name(path.name + ".tmp")
+        tmp.write_text(content, encoding="utf-8")
+        tmp.replace(path)
+    return path
+
+
+# ----------------------------------------
+# Byte offsets
+# ----------------------------------------
+def _byte_locator(audio_path: Path):
+    """(start_ms, end_ms) -> (byte_start, byte_end) for this file's format."""
+    size = audio_path.stat().st_size
+    suffix = audio_path.suffix.lower()
+
+    if suffix == ".mp3":
+        index = mp3_frame_index(audio_path)
+        offsets = index["offsets"]
+        spf = index["samples_per_frame"]
+        rate = index["sample_rate"]
+        delay = index["delay_samples"]
+
+        def locate(start_ms, end_ms):
+            if not offsets:
+                return 0, size - 1
+            first = int((start_ms * rate / 1000 + delay) // spf) - 1
+            last = int((end_ms * rate / 1000 + delay) // spf) + 1
+            first = min(max(first, 0), len(offsets) - 1)
+            byte_end = offsets[last + 1] - 1 if last + 1 < len(offsets) else size - 1
+            return offsets[first], byte_end
+        return locate
+
+    if suffix == ".wav":
+        data_offset, rate, frame_width = wav_layout(audio_path)
+
+        def locate(start_ms, end_ms):
+            start = data_offset + int(start_ms * rate / 1000) * frame_width
+            end = data_offset + int(end_ms * rate / 1000) * frame_width - 1
+            return min(start, size - 1), min(end, size - 1)
+        return locate
+
+    return lambda start_ms, end_ms: (None, None)
+
+
+def mp3_frame_index(path: str | Path) -> dict:
+    """
+    Scans MPEG Layer III frame headers.
+
+    Returns {"sample_rate", "samples_per_frame", "delay_samples",
+             "offsets": [byte offset of every audio frame]}.
+    A leading Xing/Info frame (written by LAME/ffmpeg) is metadata, not
+    audio; its LAME tag gives the encoder delay.
+    """
+    data = Path(path).read_bytes()
+    pos = 0
+
+    # ID3v2 tag
+    if data[:3] == b"ID3" and len(data) >= 10:
+        size = (data[6] << 21) | (data[7] << 14) | (data[8] << 7) | data[9]
+        pos = 10 + size + (10 if data[5] & 0x10 else 0)
+
+    offsets = []
+    sample_rate = samples_per_frame = 0
+    delay = 0
+    n = len(data)
+
+    while pos + 4 <= n:
+        if data[pos:pos + 3] == b"TAG" and n - pos == 128:
+            break           # ID3v1 tag at the end
+        header = _parse_header(data, pos)
+        if header is None:
+            pos += 1        # resync
+            continue
+        version, rate, length = header
+
+        if not offsets and not sample_rate:
+            sample_rate = rate
+            samples_per_frame = 1152 if version == _MPEG1 else 576
+            info = _info_tag_delay(data[pos:pos + length])
+            if info is not None:
+                delay = info + _DECODER_DELAY
+                pos += length
+                continue
+
+        offsets.append(pos)
+        pos += length
+
+    return {
+        "sample_rate": sample_rate or 1,
+        "samples_per_frame": samples_per_frame or 1,
+        "delay_samples": delay,
+        "offsets": offsets,
+    }
+
+
+def _parse_header(data: bytes, pos: int):
+    b1, b2 = data[pos + 1], data[pos + 2]
+    if data[pos] != 0xFF or (b1 & 0xE0) != 0xE0:
+        return None
+    version = (b1 >> 3) & 0x3
+    layer = (b1 >> 1) & 0x3
+    bitrate_idx = (b2 >> 4) & 0xF
+    rate_idx = (b2 >> 2) & 0x3
+    if version == 1 or layer != 1 or bitrate_idx in (0, 15) or rate_idx == 3:
+        return None
+
+    bitrate = _BITRATES_KBPS[_MPEG1 if version == _MPEG1 else _MPEG2][bitrate_idx] * 1000
+    rate = _SAMPLE_RATES[version][rate_idx]
+    padding = (b2 >> 1) & 0x1
+    length = (144 if version == _MPEG1 else 72) * bitrate // rate + padding
+    return version, rate, length
+
+
+def _info_tag_delay(frame: bytes) -> int | None:
+    """Encoder delay from a Xing/Info frame (0 if no LAME tag); None if not one."""
+    for tag in (b"Xing", b"Info"):
+        at = frame.find(tag, 4, 48)
+        if at == -1:
+            continue
+        flags = int.from_bytes(frame[at + 4:at + 8], "big")
+        p = at + 8
+        p += 4 if flags & 0x1 else 0      # frame count
+        p += 4 if flags & 0x2 else 0      # byte count
+        p += 100 if flags & 0x4 else 0    # TOC
+        p += 4 if flags & 0x8 else 0      # quality
+        lame = frame[p:p + 36]
+        if len(lame) >= 24 and lame[:4] in (b"LAME", b"Lavc", b"Lavf"):
+            return (lame[21] << 4) | (lame[22] >> 4)
+        return 0
+    return None
+
+
+def wav_layout(path: str | Path) -> tuple[int, int, int]:
+    """(byte offset of the PCM data, frame rate, frame width) of a WAV file."""
+    with open(path, "rb") as f:
+        head = f.read(12)
+        if head[:4] != b"RIFF" or head[8:12] != b"WAVE":
+            raise ValueError(f"{path} is not a WAV file")
+        rate = frame_width = 0
+        while True:
+            chunk = f.read(8)
+            if len(chunk) < 8:
+                raise ValueError(f"{path} has no data chunk")
+            cid, size = chunk[:4], int.from_bytes(chunk[4:], "little")
+            if cid == b"fmt ":
+                fmt = f.read(size)
+                rate = int.from_bytes(fmt[4:8], "little")
+                frame_width = int.from_bytes(fmt[12:14], "little")
+                if size % 2:
+                    f.read(1)
+            elif cid == b"data":
+                return f.tell(), rate, frame_width
+            else:
+                f.seek(size + size % 2, 1)
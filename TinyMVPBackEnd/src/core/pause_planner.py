@@ -0,0 +1,87 @@
+# src/core/pause_planner.py
+"""
+Plans every pause of a lesson before any audio is decoded.
+
+Each section has a pause profile (config.PAUSE_PROFILES):
+
+    {"base_ms": 1000, "scale": 1.0, "min_ms": 2500, "max_ms": 9000}
+
+    pause = clamp(base_ms + scale * phrase duration, min_ms, max_ms)
+
+scale = 1.0 gives the learner as long as the phrase to repeat it (plus
+base_ms), scale = 0 is a fixed gap. Phrase durations come from file
+headers (probe_duration_ms: WAV header, MP3 frame scan), cached per
+phrase key in the build manifest, or are estimated from the text for
+phrases not synthesized yet, so a whole course can be previewed
+instantly.
+"""
+
+from pathlib import Path
+
+from src.core.lesson_timeline import layout_sections, mp3_frame_index, wav_layout
+
+
+class PausePlanner:
+    def __init__(self, profiles: dict, estimate_ms_per_char: float = 65.0):
+        """
+        profiles = {section name: {"base_ms", "scale", "min_ms", "max_ms"}}
+        A "default" profile, if present, covers sections not listed.
+        """
+        self.profiles = profiles
+        self.estimate_ms_per_char = estimate_ms_per_char
+
+    def profile(self, section: str) -> dict:
+        profile = self.profiles.get(section) or self.profiles.get("default")
+        if profile is None:
+            raise KeyError(f"No pause profile for section '{section}'")
+        return profile
+
+    def pause_ms(self, section: str, duration_ms: float) -> int:
+        p = self.profile(section)
+        pause = p.get("base_ms", 0) + p.get("scale", 0.0) * duration_ms
+        pause = max(pause, p.get("min_ms", 0))
+        if p.get("max_ms") is not None:
+            pause = min(pause, p["max_ms"])
+        return int(round(pause))
+
+    def plan_section(self, section: str, durations_ms: list[float]) -> list[int]:
+        return [self.pause_ms(section, d) for d in durations_ms]
+
+    def plan_lesson(self, sections: list[tuple[str, list[float]]]) -> dict:
+        """
+        sections = [(name, [phrase duration ms, ...]), ...] in lesson order
+
+        Returns {"pauses": [[ms per phrase] per section],
+                 "layout": lesson_timeline.layout_sections(...),
+                 "duration_ms": total}
+        """
+        pauses = [self.plan_section(name, durations) for name, durations in sections]
+        layout = layout_sections([d for _, d in sections], pauses)
+        return {
+            "pauses": pauses,
+            "layout": layout,
+            "duration_ms": layout[-1]["end_ms"] if layout else 0.0,
+        }
+
+    def estimate_duration_ms(self, text: str) -> float:
+        """Rough spoken length of a phrase not synthesized yet."""
+        return len(text) * self.estimate_ms_per_char
+
+
+def probe_duration_ms(path: str | Path) -> float | None:
+    """
+    Duration of a phrase file from its headers only (no decode).
+    None for formats without a cheap probe, or unreadable files.
+    """
+    path = Path(path)
+    try:
+        if path.suffix.lower() == ".wav":
+            data_offset, rate, frame_width = wav_layout(path)
+            return (path.stat().st_size - data_offset) / frame_width / rate * 1000
+        if path.suffix.lower() == ".mp3":
+            index = mp3_frame_index(path)
+            samples = len(index["offsets"]) * index["samples_per_frame"] - index["delay_samples"]
+            return max(0.0, samples / index["sample_rate"] * 1000)
+    except (OSError, ValueError, ZeroDivisionError):
+        return None
+    return None
@@ -0,0 +1,114 @@
+# src/core/pcm_buffer.py
+
+import numpy as np
+
+class PCMConcatenator:
+    """
+    Linear-time concatenation of PCM audio.
+
+    `combined += segment` copies the whole accumulated lesson on every
+    phrase (quadratic time, several full-lesson copies alive at once).
+    Here the output size is computed up front from the decoded inputs and
+    the silence gaps, one buffer is allocated, and every segment is
+    written into it exactly once. Gaps are left as zero bytes (silence).
+    """
+
+    def __init__(self, frame_rate: int = 24000, channels: int = 1, sample_width: int = 2):
+        self.frame_rate = frame_rate
+        self.channels = channels
+        self.sample_width = sample_width
+
+    @property
+    def frame_width(self) -> int:
+        return self.channels * self.sample_width
+
+    def silence_bytes(self, ms: int) -> int:
+        """Byte length of `ms` milliseconds of silence, frame aligned."""
+        return int(self.frame_rate * ms / 1000) * self.frame_width
+
+    # ----------------------------------------
+    # Raw PCM
+    # ----------------------------------------
+    def concat_raw(self, chunks, gaps_ms=0, trims=None, gains_db=None) -> bytearray:
+        """
+        chunks   = list of raw PCM byte strings (all in this format)
+        gaps_ms  = silence after each chunk: one int for all, or one per chunk
+        trims    = optional (first_frame, end_frame) per chunk: only that
+                   part of the chunk is kept
+        gains_db = optional gain per chunk, applied while copying
+                   (16-bit only, clipped)
+        """
+        gaps = self._gaps(gaps_ms, len(chunks))
+        gap_bytes = [self.silence_bytes(g) for g in gaps]
+
+        if trims is not None:
+            fw = self.frame_width
+            chunks = [memoryview(c)[start * fw:end * fw] for c, (start, end) in zip(chunks, trims)]
+
+        buf = bytearray(sum(len(c) for c in chunks) + sum(gap_bytes))
+        view = memoryview(buf)
+
+        pos = 0
+        for i, (chunk, gap) in enumerate(zip(chunks, gap_bytes)):
+            gain = gains_db[i] if gains_db is not None else 0.0
+            if gain and self.sample_width == 2:
+                out = np.frombuffer(buf, dtype="<i2", count=len(chunk) // 2, offset=pos)
+                scaled = np.frombuffer(chunk, dtype="<i2").astype(np.float32) * (10 ** (gain / 20))
+                np.clip(scaled, -32768, 32767, out=scaled)
+                out[:] = scaled.astype("<i2")
+            else:
+                view[pos:pos + len(chunk)] = chunk
+            pos += len(chunk) + gap
+
+        return buf
+
+    # ----------------------------------------
+    # pydub AudioSegments
+    # ----------------------------------------
+    def concat(self, segments, gaps_ms=0, trims=None, gains_db=None):
+        """
+        Concatenates AudioSegments (converted to this format) with silence
+        gaps and returns a single AudioSegment built from one buffer.
+        trims / gains_db as in concat_raw (frames at this frame rate).
+        """
+        if not segments:
+            raise ValueError("PCMConcatenator.concat needs at least one segment")
+
+        chunks = [self.conform(seg).raw_data for seg in segments]
+        buf = self.concat_raw(chunks, gaps_ms, trims, gains_db)
+
+        return segments[0]._spawn(bytes(buf), overrides={
+            "frame_rate": self.frame_rate,
+            "channels": self.channels,
+            "sample_width": self.sample_width,
+        })
+
+    def conform(self, segment):
+        """Converts a segment to this concatenator's PCM format if needed."""
+        if segment.frame_rate != self.frame_rate:
+            segment = segment.set_frame_rate(self.frame_rate)
+        if segment.channels != self.channels:
+            segment = segment.set_channels(self.channels)
+        if segment.sample_width != self.sample_width:
+            segment = segment.set_sample_width(self.sample_width)
+        return segment
+
+    @classmethod
+    def for_segments(cls, segments):
+        """
+        Picks the richest format among `segments` (same rule pydub uses
+        when adding segments), so nothing is downsampled.
+        """
+        return cls(
+            frame_rate=max(s.frame_rate for s in segments),
+            channels=max(s.channels for s in segments),
+            sample_width=max(s.sample_width for s in segments),
+        )
+
+    @staticmethod
+    def _gaps(gaps_ms, count):
+        if isinstance(gaps_ms, (list, tuple)):
+            if len(gaps_ms) != count:
+                raise ValueError(f"expected {count} gap values, got {len(gaps_ms)}")
+            return list(gaps_ms)
+        return [gaps_ms] * count
@@ -0,0 +1,193 @@
+# src/core/pcm_store.py
+"""
+Decoded phrase audio, stored once and memory-mapped at render time.
+
+    store = PCMStore(config.PCM_STORE_DIR)
+    pcm = store.pcm("phrase_01.mp3", key, 24000, 1)     # memoryview, no decode
+
+Each phrase is decoded (ffmpeg) the first time a render needs it, at the
+render format, and written as raw 16-bit PCM behind a 32-byte header:
+
+    <root>/<k[:2]>/<k>.<rate>x<channels>.pcm
+    magic "PCM1" | frame_rate u32 | channels u16 | sample width u16 | frames u64 | padding
+
+Later renders map the file and hand out memoryview slices of it, so
+stitching, trimming and time-stretching read the page cache directly;
+re-rendering with other pauses or slow factors decodes nothing.
+
+Entries are keyed by the phrase key (BuildManifest / TTSEngine.phrase_key),
+so every lesson using a phrase shares one entry. Files without a key are
+keyed by path, size and mtime. Writes are atomic (temp file per process
+and thread + rename), so build_all's worker processes and the pipeline's
+decode threads can fill the store side by side.
+
+With a `decoder` (CodecPool.decode_many), prefetch() fills every missing
+entry of a render in a few batched ffmpeg runs up front, `batch_files`
+phrases at a time: each batch is written to the store before the next
+one is decoded, so prefetching a long lesson holds one batch of PCM in
+memory, not the whole lesson.
+"""
+
+import hashlib
+import mmap
+import os
+import struct
+import threading
+from pathlib import Path
+
+from src.core.ffmpeg_stream import SAMPLE_WIDTH, iter_decode
+
+MAGIC = b"PCM1"
+HEADER = struct.Struct("<4sIHHQ")
+HEADER_BYTES = 32       # header padded so the samples start aligned
+
+
+class PCMStore:
+    def __init__(self, root: str | Path, max_bytes: int = 2 * 1024 ** 3, decoder=None,
+                 batch_files: int = 32):
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+        self.decoder = decoder      # (sources, frame_rate, channels) -> [PCM bytes], batched
+        self.batch_files = max(1, batch_files)     # sources per decoder call in prefetch()
+        self.hits = 0
+        self.misses = 0
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    def path_for(self, key: str, frame_rate: int, channels: int) -> Path:
+        return self.root / key[:2] / f"{key}.{frame_rate}x{channels}.pcm"
+
+    @staticmethod
+    def source_key(path: str | Path) -> str:
+        """Key for a phrase file that has no phrase key: its path, size and mtime."""
+        st = os.stat(path)
+        ident = f"{Path(path).resolve()}\n{st.st_size}\n{st.st_mtime_ns}"
+        return hashlib.sha256(ident.encode("utf-8")).hexdigest()
+
+    # ----------------------------------------
+    # Lookup
+    # ----------------------------------------
+    def pcm(self, source: str | Path, key: str | None, frame_rate: int, channels: int) -> memoryview:
+        """
+        16-bit PCM of `source` at frame_rate / channels, as a read-only
+        view into the mapped entry (decoded and stored on first use).
+        """
+        key = key or self.source_key(source)
+        entry = self.path_for(key, frame_rate, channels)
+        view = self._map(entry, frame_rate, channels)
+        if view is not None:
+            self.hits += 1
+            os.utime(entry)         # recency for prune()
+            return view
+
+        self.misses += 1
+        if self.decoder is not None:
+            chunks = self.decoder([source], frame_rate, channels)
+        else:
+            chunks = iter_decode(source, frame_rate, channels)
+        self._write(entry, chunks, frame_rate, channels)
+        view = self._map(entry, frame_rate, channels)
+        if view is None:
+            raise RuntimeError(f"[PCMStore] could not read back {entry}")
+        return view
+
+    def prefetch(self, items: list[tuple], frame_rate: int, channels: int) -> int:
+        """
+        Decodes every (source, key) without a usable entry, `batch_files`
+        per decoder call, and stores each batch before decoding the next.
+        Returns the number of entries written.
+        """
+        missing = {}
+        for source, key in items:
+            key = key or self.source_key(source)
+            entry = self.path_for(key, frame_rate, channels)
+            if entry not in missing and self._map(entry, frame_rate, channels) is None:
+                missing[entry] = source
+        if not missing:
+            return 0
+
+        entries = list(missing)
+        for start in range(0, len(entries), self.batch_files):
+            batch = entries[start:start + self.batch_files]
+            if self.decoder is not None:
+                pcms = self.decoder([missing[e] for e in batch], frame_rate, channels)
+            else:
+                pcms = [iter_decode(missing[e], frame_rate, channels) for e in batch]
+            for entry, pcm in zip(batch, pcms):
+                self._write(entry, [pcm] if isinstance(pcm, bytes) else pcm, frame_rate, channels)
+            del pcms
+            self.misses += len(batch)
+        return len(entries)
+
+    def _map(self, entry: Path, frame_rate: int, channels: int) -> memoryview | None:
+        try:
+            with open(entry, "rb") as f:
+                if os.fstat(f.fileno()).st_size < HEADER_BYTES:
+                    return None
+                mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except FileNotFoundError:
+            return None
+
+        magic, rate, chans, width, frames = HEADER.unpack_from(mapped, 0)
+        size = frames * chans * width
+        if (magic, rate, chans, width) != (MAGIC, frame_rate, channels, SAMPLE_WIDTH) \
+                or len(mapped) < HEADER_BYTES + size:
+            mapped.close()
+            return None         # foreign or truncated entry: decoded again
+        return memoryview(mapped)[HEADER_BYTES:HEADER_BYTES + size]
+
+    def _write(self, entry: Path, chunks, frame_rate: int, channels: int):
+        """Streams PCM chunks (e.g. a running decode) into the entry; the header goes in last."""
+        entry.parent.mkdir(parents=True, exist_ok=True)
+        tmp = entry.with_name(f"{entry.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            with open(tmp, "wb") as f:
+                f.write(bytes(HEADER_BYTES))
+                size = 0
+                for chunk in chunks:
+                    f.write(chunk)
+                    size += len(chunk)
+                f.seek(0)
+                f.write(HEADER.pack(MAGIC, frame_rate, channels, SAMPLE_WIDTH,
+                                    size // (channels * SAMPLE_WIDTH)))
+            os.replace(tmp, entry)
+        except OSError:
+            tmp.unlink(missing_ok=True)
+            if not entry.exists():
+                raise
+            # another thread or process stored the same entry first
+        except BaseException:
+            tmp.unlink(missing_ok=True)
+            raise
+
+    # ----------------------------------------
+    # Housekeeping
+    # ----------------------------------------
+    def total_bytes(self) -> int:
+        return sum(p.stat().st_size for p in self.root.glob("*/*.pcm"))
+
+    def prune(self, max_bytes: int | None = None) -> int:
+        """
+        Deletes the least recently used entries until the store fits in
+        `max_bytes` (default: self.max_bytes). Returns the entries removed.
+        """
+        limit = self.max_bytes if max_bytes is None else max_bytes
+        entries = []
+        for p in self.root.glob("*/*.pcm"):
+            try:
+                st = p.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((st.st_mtime, st.st_size, p))
+        total = sum(size for _, size, _ in entries)
+
+        removed = 0
+        for _, size, p in sorted(entries):
+            if total <= limit:
+                break
+            p.unlink(missing_ok=True)
+            total -= size
+            removed += 1
+        return removed
+
+    def stats(self) -> dict:
+        return {"hits": self.hits, "misses": self.misses}
@@ -0,0 +1,350 @@
+# src/core/pdf_ingest.py
+"""
+Turns the course PDFs ("Pdf book/") into lesson files PhraseParser reads.
+
+    results = ingest_directory(pdf_dir, lesson_dir, cache_dir, workers=8)
+
+- Text is pulled out of the PDFs (pypdf, optional dependency) across a
+  process pool
+- Each extracted text is cached by the PDF's content hash, and a stat
+  index (size + mtime) avoids even re-hashing unchanged files, so a
+  re-run over the whole course only opens the PDFs that changed.
+  Phrase pairing is cheap and runs on the cached text every time, so
+  tuning it never needs a re-extraction
+- A lesson file is only rewritten when its content changes, so the
+  build manifests downstream see untouched lessons as untouched
+
+What gets picked up from a page:
+  - vocabulary lines:   "WATER - Agua"  /  "Bubble (burbuja)"
+  - example sentences:  a run of English lines followed by a run of the
+    same number of Spanish lines (the PDFs print translations in that
+    order), paired by position. A block is dropped rather than
+    mispaired when the runs differ in length or any pair's lengths
+    diverge (a translation runs 0.6x - 2x its English, in characters)
+Explanations (prose-length lines), labels ("...:"), page headers (lines
+repeated in the document) and footers are skipped, as are "(x = y)"
+notes inside a sentence.
+"""
+
+import hashlib
+import json
+import os
+import re
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from src.core.phrase_parser import PhraseParser
+
+# Bump when text extraction changes: invalidates every cached text
+EXTRACTOR_VERSION = 1
+
+HEADER = "# Generated by pdf_ingest: edits are lost on the next ingest"
+
+# ----------------------------------------
+# Line classification
+# ----------------------------------------
+SKIP_LINE = re.compile(
+    r"^(PRO|Fácil|Medio|Difícil|Nivel de|dificultad)\s*$|pg\.\s*\d+/\d+|Copyright",
+    re.IGNORECASE,
+)
+VOCAB_DASH = re.compile(r"^([A-Za-z][A-Za-z'’ .-]*[A-Za-z.])\s+[-–]\s+(\S.*)$")
+VOCAB_PAREN = re.compile(r"^([A-Za-z][A-Za-z'’ .-]*[A-Za-z.])\s*\(([^()]+)\)\s*$")
+SENTENCE_END = re.compile(r"[.?!…)\"”]\s*$")
+NOTE = re.compile(r"\s*\([^()]*[=:][^()]*\)")       # "(cuz/'cause = because)", "(UK: rubbish)"
+PROSE_WORDS = 40        # longer lines are explanations, not examples
+LENGTH_RATIO = (0.6, 2.0)  # Spanish / English characters of one pair
+
+SPANISH_CHARS = set("áéíóúñ¿¡ÁÉÍÓÚÑ")
+SPANISH_WORDS = {
+    "el", "la", "los", "las", "un", "una", "de", "del", "que", "y", "en", "es",
+    "por", "para", "con", "no", "se", "su", "mi", "tu", "lo", "al", "muy", "pero",
+    "está", "estoy", "eso", "esto", "este", "esta", "hay", "yo", "él", "ella",
+    "te", "le", "nos", "les", "va", "vas", "voy", "vamos", "todo", "bien",
+    "ir", "ser", "son", "fue", "ya", "sin", "si", "como", "quiere", "tengo",
+}
+ENGLISH_WORDS = {
+    "the", "a", "an", "and", "of", "to", "in", "is", "it", "you", "i", "he", "she",
+    "we", "they", "that", "this", "was", "are", "my", "your", "for", "on", "with",
+    "have", "has", "do", "does", "did", "not", "be", "what", "at", "me",
+}
+
+
+def language(line: str) -> str | None:
+    """"en", "es" or None (undecided) for one line of text."""
+    if any(c in SPANISH_CHARS for c in line):
+        return "es"
+    words = re.findall(r"[a-záéíóúñ']+", line.lower())
+    es = sum(w in SPANISH_WORDS for w in words)
+    en = sum(w in ENGLISH_WORDS for w in words)
+    if en > es:
+        return "en"
+    if es > en:
+        return "es"
+    return None
+
+
+def phrases_from_text(text: str) -> list[dict]:
+    """[{"en", "es"}, ...] found in the text of one PDF, in reading order."""
+    phrases = []
+    en_run, es_run = [], []
+    lines = _lines(text)
+    headers = {line for line, n in Counter(lines).items() if n > 1}
+
+    def flush():
+        if en_run and len(en_run) == len(es_run) and all(map(_similar_length, en_run, es_run)):
+            phrases.extend({"en": en, "es": es} for en, es in zip(en_run, es_run))
+        en_run.clear()
+        es_run.clear()
+
+    for line in lines:
+        if SKIP_LINE.search(line):
+            continue
+        if line.startswith("("):
+            continue        # translator's note between the examples
+
+        vocab = VOCAB_DASH.match(line) or VOCAB_PAREN.match(line)
+        if vocab and len(vocab.group(1).split()) <= 4:
+            flush()
+            if len(vocab.group(1).split()) >= 3 and not _similar_length(vocab.group(1), vocab.group(2)):
+                continue    # a short sentence with a pronunciation note: "He's from Canada. (frəm)"
+            phrases.append({"en": _clean_vocab(vocab.group(1)), "es": vocab.group(2).strip()})
+            continue
+        if line in headers or line.endswith(":"):
+            continue
+
+        # Example sentences: a few words, ending like a sentence (the PDFs
+        # sometimes drop the full stop of a longer one)
+        line = NOTE.sub("", line).strip()
+        words = len(line.split())
+        if words < 3 or words > PROSE_WORDS or (words < 5 and not SENTENCE_END.search(line)):
+            flush()
+            continue
+
+        # A block is every English line up to the Spanish ones, then every
+        # Spanish line up to the next English one
+        lang = language(line)
+        if lang == "en":
+            if es_run:
+                flush()
+            en_run.append(line)
+        elif en_run and (lang == "es" or (lang is None and es_run)):
+            es_run.append(line)     # undecided lines inside a Spanish run belong to it
+        else:
+            flush()
+
+    flush()
+    return phrases
+
+
+def _lines(text: str) -> list[str]:
+    """Normalized non-empty lines, with wrapped sentences joined back up."""
+    lines = []
+    for raw in text.splitlines():
+        line = " ".join(raw.replace("\u00a0", " ").split()).lstrip("*").strip()
+        if not line:
+            continue
+        if lines and line[0].islower() and not SENTENCE_END.search(lines[-1]):
+            lines[-1] += " " + line
+        else:
+            lines.append(line)
+    return lines
+
+
+def _similar_length(en: str, es: str) -> bool:
+    """A translation runs about as long as its original; anything else is a mispair."""
+    low, high = LENGTH_RATIO
+    return low * len(en) <= len(es) <= high * len(en)
+
+
+def lesson_text(title: str, phrases: list[dict]) -> str:
+    """Lesson file in PhraseParser's "English / Spanish" format."""
+    lines = [f"# {title}", HEADER, ""]
+    seen = set()
+    for p in phrases:
+        # PhraseParser splits on the first "/": it cannot appear in English,
+        # and in Spanish it would be read out as "barra"
+        en = re.sub(r"\s*/\s*", " or ", p["en"])
+        es = re.sub(r"\s*/\s*", " o ", p["es"])
+        if (en, es) in seen:
+            continue
+        seen.add((en, es))
+        lines.append(f"{en} / {es}")
+    return "\n".join(lines) + "\n"
+
+
+def _clean_vocab(word: str) -> str:
+    """"WATER" -> "Water"; mixed-case entries are kept as printed."""
+    return word.capitalize() if word.isupper() else word
+
+
+# ----------------------------------------
+# Extraction (runs in worker processes)
+# ----------------------------------------
+def extract_pdf(path: str | Path) -> dict:
+    """Text of one PDF: {"text", "pages"}."""
+    try:
+        from pypdf import PdfReader
+    except ImportError:
+        raise ImportError("PDF ingestion needs pypdf: pip install pypdf")
+
+    path = Path(path)
+    reader = PdfReader(str(path))
+    text = "\n".join(page.extract_text() or "" for page in reader.pages)
+    return {"text": text, "pages": len(reader.pages)}
+
+
+def file_sha256(path: str | Path) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+# ----------------------------------------
+# Directory ingestion
+# ----------------------------------------
+def ingest_directory(pdf_dir: str | Path, lesson_dir: str | Path, cache_dir: str | Path,
+                     pattern: str = "*.pdf", workers: int | None = None) -> list[dict]:
+    """
+    Extracts every PDF in `pdf_dir` (cached) and writes one lesson file
+    per PDF into `lesson_dir`.
+
+    Returns one row per PDF:
+        {"pdf", "lesson", "phrases", "cached", "written", "removed", "parsed", "error"}
+    where "parsed" is PhraseParser's structure of the lesson (None when
+    the PDF gave no phrases, in which case no lesson file is written and
+    a previously generated one is removed) and "error" is why the PDF
+    couldn't be read (its lesson file is then left as it was).
+
+    Generated lesson files whose PDF is no longer in `pdf_dir` are
+    deleted; hand-written files in `lesson_dir` are never touched.
+    """
+    pdf_dir, lesson_dir, cache_dir = Path(pdf_dir), Path(lesson_dir), Path(cache_dir)
+    lesson_dir.mkdir(parents=True, exist_ok=True)
+    cache_dir.mkdir(parents=True, exist_ok=True)
+
+    pdfs = sorted(p for p in pdf_dir.glob(pattern) if p.is_file())
+    index_path = cache_dir / "index.json"
+    index = _load_json(index_path) or {}
+
+    # 1. Content hash per PDF (stat index skips re-hashing unchanged files)
+    hashes = {}
+    for pdf in pdfs:
+        st = pdf.stat()
+        entry = index.get(pdf.name)
+        if entry and entry["size"] == st.st_size and entry["mtime_ns"] == st.st_mtime_ns:
+            hashes[pdf] = entry["sha256"]
+        else:
+            hashes[pdf] = file_sha256(pdf)
+            index[pdf.name] = {"size": st.st_size, "mtime_ns": st.st_mtime_ns, "sha256": hashes[pdf]}
+
+    # 2. Extract the text the cache doesn't have, in parallel
+    results = {}
+    errors = {}
+    misses = []
+    for pdf in pdfs:
+        cached = _load_json(_cache_path(cache_dir, hashes[pdf]))
+        if cached is not None:
+            results[pdf] = (cached, True)
+        else:
+            misses.append(pdf)
+
+    if misses:
+        print(f"[pdf_ingest] Extracting {len(misses)} PDF(s) ({len(pdfs) - len(misses)} cached)...")
+        with ProcessPoolExecutor(max_workers=workers or os.cpu_count() or 1) as pool:
+            futures = {pdf: pool.submit(extract_pdf, pdf) for pdf in misses}
+            for pdf, future in futures.items():
+                try:
+                    result = future.result()
+                except Exception as e:
+                    print(f"[pdf_ingest] ERROR extracting {pdf.name}: {e}")
+                    errors[pdf] = str(e)
+                    continue
+                _write_json(_cache_path(cache_dir, hashes[pdf]), result)
+                results[pdf] = (result, False)
+
+    _write_json(index_path, {k: v for k, v in index.items() if (pdf_dir / k) in hashes})
+
+    # 3. Lesson files (rewritten only when their content changed)
+    parser = PhraseParser()
+    rows = []
+    used_names = {}
+    for pdf in pdfs:
+        name = _lesson_name(pdf.stem)
+        if name in used_names:
+            raise ValueError(f"[pdf_ingest] {used_names[name]} and {pdf.name} both map to lesson '{name}'")
+        used_names[name] = pdf.name
+
+        lesson_path = lesson_dir / f"{name}.txt"
+        row = {"pdf": pdf.name, "lesson": lesson_path, "phrases": 0, "cached": False,
+               "written": False, "removed": False, "parsed": None, "error": errors.get(pdf)}
+        if pdf in errors:
+            rows.append(row)
+            continue
+
+        result, row["cached"] = results[pdf]
+        phrases = phrases_from_text(result["text"])
+        row["phrases"] = len(phrases)
+        if not phrases:
+            row["removed"] = _remove_generated(lesson_path)
+        else:
+            text = lesson_text(pdf.stem, phrases)
+            row["parsed"] = parser.parse(text)
+            row["phrases"] = len(row["parsed"]["phrases"])
+            old = lesson_path.read_text(encoding="utf-8") if lesson_path.exists() else None
+            if old != text:
+                tmp = lesson_path.with_suffix(".txt.tmp")
+                tmp.write_text(text, encoding="utf-8")
+                os.replace(tmp, lesson_path)
+                row["written"] = True
+        rows.append(row)
+
+    # 4. Generated lessons of PDFs that were deleted or renamed
+    sources = {p.stem for p in pdf_dir.iterdir() if p.is_file()}
+    for lesson_path in sorted(lesson_dir.glob("*.txt")):
+        title = _generated_title(lesson_path)
+        if title is not None and title not in sources and _remove_generated(lesson_path):
+            print(f"[pdf_ingest] Removed {lesson_path.name}: {title}.pdf is gone")
+    return rows
+
+
+def _generated_title(lesson_path: Path) -> str | None:
+    """The source PDF's stem of a lesson file pdf_ingest wrote; None for any other file."""
+    try:
+        with open(lesson_path, encoding="utf-8") as f:
+            title, header = f.readline().rstrip("\n"), f.readline().rstrip("\n")
+    except (OSError, UnicodeDecodeError):
+        return None
+    if header != HEADER or not title.startswith("# "):
+        return None
+    return title[2:]
+
+
+def _remove_generated(lesson_path: Path) -> bool:
+    if _generated_title(lesson_path) is None:
+        return False
+    lesson_path.unlink(missing_ok=True)
+    return True
+
+
+def _lesson_name(stem: str) -> str:
+    return re.sub(r"[^\w-]+", "_", stem).strip("_") or "lesson"
+
+
+def _cache_path(cache_dir: Path, sha256: str) -> Path:
+    return cache_dir / f"{sha256}.v{EXTRACTOR_VERSION}.json"
+
+
+def _load_json(path: Path):
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+
+
+def _write_json(path: Path, data):
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    tmp.write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+    os.replace(tmp, path)
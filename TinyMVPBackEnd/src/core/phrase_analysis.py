@@ -0,0 +1,167 @@
+# src/core/phrase_analysis.py
+"""
+Per-phrase trim points and loudness, computed in one vectorized pass over
+the decoded PCM.
+
+    analysis = analyze_pcm(pcm, frame_rate, channels)
+    {
+      "version": 1, "params": "...",
+      "duration_ms": 2410.0,
+      "start_ms": 85.0, "end_ms": 2290.0,    # speech, leading/trailing silence excluded
+      "rms_db": -21.3, "peak_db": -3.1,      # dBFS
+      "lufs": -19.8,                          # BS.1770 integrated loudness (gated)
+    }
+
+Everything is in ms / dB, independent of the render format, so results
+can be cached per phrase (BuildManifest.analysis) and reused by any render.
+Trim + gain are applied while stitching (PCMConcatenator.concat_raw), so
+no phrase is decoded or encoded an extra time.
+"""
+
+import numpy as np
+
+VERSION = 1
+
+WINDOW_MS = 10          # trim detection resolution
+BLOCK_MS = 400          # BS.1770 gating block
+STEP_MS = 100           # 75 % block overlap
+ABSOLUTE_GATE_LUFS = -70.0
+RELATIVE_GATE_LU = -10.0
+
+
+def analysis_params(trim_db: float, floor_db: float) -> str:
+    """Identity of the analysis settings; cached results with other params are recomputed."""
+    return f"v{VERSION}:trim{trim_db:g}:floor{floor_db:g}"
+
+
+def analyze_pcm(pcm: bytes, frame_rate: int, channels: int = 1,
+                trim_db: float = -40.0, floor_db: float = -60.0) -> dict:
+    """
+    pcm      = 16-bit little-endian interleaved PCM
+    trim_db  = a window is speech if within `trim_db` of the loudest window
+    floor_db = ...and above this absolute level (dBFS)
+    """
+    x = np.frombuffer(pcm, dtype="<i2").reshape(-1, channels).astype(np.float32) / 32768.0
+    n = len(x)
+    duration_ms = n / frame_rate * 1000
+    result = {
+        "version": VERSION,
+        "params": analysis_params(trim_db, floor_db),
+        "duration_ms": round(duration_ms, 2),
+        "start_ms": 0.0,
+        "end_ms": round(duration_ms, 2),
+        "rms_db": -120.0,
+        "peak_db": -120.0,
+        "lufs": -120.0,
+    }
+    if n == 0:
+        return result
+
+    power = np.mean(x ** 2, axis=1)        # per frame, averaged over channels
+    result["peak_db"] = round(_db(np.max(np.abs(x))), 2)
+    result["rms_db"] = round(_db(np.sqrt(np.mean(power))), 2)
+
+    # ----------------------------------------
+    # Trim points: RMS of 10 ms windows
+    # ----------------------------------------
+    win = max(1, int(frame_rate * WINDOW_MS / 1000))
+    n_win = -(-n // win)
+    padded = np.zeros(n_win * win, dtype=np.float32)
+    padded[:n] = power
+    window_db = 10 * np.log10(np.maximum(padded.reshape(n_win, win).mean(axis=1), 1e-12))
+
+    threshold = max(window_db.max() + trim_db, floor_db)
+    voiced = np.flatnonzero(window_db > threshold)
+    if len(voiced):
+        result["start_ms"] = round(float(voiced[0] * win / frame_rate * 1000), 2)
+        result["end_ms"] = round(float(min(n, (voiced[-1] + 1) * win) / frame_rate * 1000), 2)
+
+    # ----------------------------------------
+    # Integrated loudness (K-weighted, gated)
+    # ----------------------------------------
+    result["lufs"] = round(integrated_loudness(x, frame_rate), 2)
+    return result
+
+
+def integrated_loudness(x: np.ndarray, frame_rate: int) -> float:
+    """
+    BS.1770 integrated loudness of float samples shaped (frames, channels).
+    The K-weighting filter is applied as a magnitude response in the
+    frequency domain (one rfft/irfft per channel), which gives the same
+    block energies as the time-domain biquads for gating purposes.
+    """
+    n = len(x)
+    size = 1 << (n - 1).bit_length()
+    freqs = np.fft.rfftfreq(size, 1 / frame_rate)
+    response = k_weighting_magnitude(freqs, frame_rate)
+    weighted = np.fft.irfft(np.fft.rfft(x, n=size, axis=0) * response[:, None], n=size, axis=0)[:n]
+    power = np.sum(weighted ** 2, axis=1)      # channel weights are 1 for L/R/C
+
+    block = int(frame_rate * BLOCK_MS / 1000)
+    step = int(frame_rate * STEP_MS / 1000)
+    if n < block:
+        energies = np.array([power.mean()])
+    else:
+        csum = np.concatenate(([0.0], np.cumsum(power, dtype=np.float64)))
+        starts = np.arange(0, n - block + 1, step)
+        energies = (csum[starts + block] - csum[starts]) / block
+
+    loudness = -0.691 + 10 * np.log10(np.maximum(energies, 1e-12))
+    gated = energies[loudness > ABSOLUTE_GATE_LUFS]
+    if not len(gated):
+        return -120.0
+    relative = -0.691 + 10 * np.log10(gated.mean()) + RELATIVE_GATE_LU
+    gated = energies[loudness > max(relative, ABSOLUTE_GATE_LUFS)]
+    return float(-0.691 + 10 * np.log10(gated.mean()))
+
+
+def k_weighting_magnitude(freqs: np.ndarray, frame_rate: int) -> np.ndarray:
+    """|H(f)| of the BS.1770 pre-filter (high shelf + RLB high-pass) at `frame_rate`."""
+    # High shelf
+    k = np.tan(np.pi * 1681.974450955533 / frame_rate)
+    q = 0.7071752369554196
+    vh = 10 ** (3.999843853973347 / 20)
+    vb = vh ** 0.4996667741545416
+    a0 = 1 + k / q + k * k
+    shelf_b = [(vh + vb * k / q + k * k) / a0, 2 * (k * k - vh) / a0, (vh - vb * k / q + k * k) / a0]
+    shelf_a = [1.0, 2 * (k * k - 1) / a0, (1 - k / q + k * k) / a0]
+
+    # High-pass
+    k = np.tan(np.pi * 38.13547087602444 / frame_rate)
+    q = 0.5003270373238773
+    a0 = 1 + k / q + k * k
+    hp_b = [1.0, -2.0, 1.0]
+    hp_a = [1.0, 2 * (k * k - 1) / a0, (1 - k / q + k * k) / a0]
+
+    z1 = np.exp(-2j * np.pi * freqs / frame_rate)
+    z2 = z1 * z1
+
+    def mag(b, a):
+        return np.abs((b[0] + b[1] * z1 + b[2] * z2) / (a[0] + a[1] * z1 + a[2] * z2))
+
+    return mag(shelf_b, shelf_a) * mag(hp_b, hp_a)
+
+
+# ----------------------------------------
+# Applying an analysis
+# ----------------------------------------
+def trim_frames(analysis: dict, frame_rate: int, pad_ms: float) -> tuple[int, int]:
+    """(first, end) frame of the speech plus `pad_ms` either side, at `frame_rate`."""
+    total = int(round(analysis["duration_ms"] * frame_rate / 1000))
+    start = int((analysis["start_ms"] - pad_ms) * frame_rate / 1000)
+    end = int(np.ceil((analysis["end_ms"] + pad_ms) * frame_rate / 1000))
+    return max(0, start), min(total, end)
+
+
+def gain_db(analysis: dict, target_lufs: float, max_gain_db: float = 12.0,
+            peak_ceiling_db: float = -1.0) -> float:
+    """Gain that brings the phrase to `target_lufs` without pushing peaks past the ceiling."""
+    if analysis["lufs"] <= ABSOLUTE_GATE_LUFS:
+        return 0.0          # silence: leave it alone
+    gain = target_lufs - analysis["lufs"]
+    gain = min(gain, peak_ceiling_db - analysis["peak_db"])
+    return float(np.clip(gain, -max_gain_db, max_gain_db))
+
+
+def _db(amplitude) -> float:
+    return float(20 * np.log10(max(float(amplitude), 1e-6)))
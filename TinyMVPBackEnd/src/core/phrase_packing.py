@@ -0,0 +1,110 @@
+# src/core/phrase_packing.py
+"""
+Several short phrases per speech request, split back apart by silence.
+
+    text = pack_text(["Good morning.", "See you soon."])
+    # ... one request for `text`, decoded to 16-bit PCM ...
+    clips = split_packed(pcm, frame_rate, texts)   # one PCM clip per text, or None
+
+The phrases are joined with paragraph breaks, which the speech models
+read as a clear pause. The decoded audio is scanned in 10 ms windows
+(one vectorized pass, as in phrase_analysis) for silent stretches; the
+longest len(texts) - 1 of them become the cut points. A split is only
+accepted when every clip's length is in proportion to its text, so a
+missing or extra pause gives None and TTSEngine falls back to one
+request per phrase.
+"""
+
+import wave
+from pathlib import Path
+
+import numpy as np
+
+from src.core.ffmpeg_stream import iter_decode
+
+FRAME_RATE = 24000          # speech API output rate; packed clips are WAV at this rate
+SEPARATOR = "\n\n"
+SENTENCE_END = (".", "!", "?", "…")
+
+WINDOW_MS = 10
+SILENCE_DB = -40.0          # below the loudest window by this much...
+FLOOR_DB = -60.0            # ...or below this absolute level (dBFS) is silence
+MIN_GAP_MS = 120            # shorter dips are pauses inside a sentence
+LENGTH_TOLERANCE = 2.5      # clip length vs its share of the text, either way
+
+
+def pack_text(texts: list[str]) -> str:
+    """One request's input: every phrase as its own sentence and paragraph."""
+    parts = []
+    for text in texts:
+        text = " ".join(text.split())
+        if not text.endswith(SENTENCE_END):
+            text += "."
+        parts.append(text)
+    return SEPARATOR.join(parts)
+
+
+def silent_gaps(pcm: bytes, frame_rate: int, channels: int = 1,
+                min_gap_ms: float = MIN_GAP_MS) -> list[tuple[int, int]]:
+    """
+    [(start_frame, end_frame), ...] of the silent stretches of at least
+    `min_gap_ms` between speech (leading / trailing silence excluded).
+    """
+    x = np.frombuffer(pcm, dtype="<i2").reshape(-1, channels).astype(np.float32) / 32768.0
+    n = len(x)
+    win = max(1, int(frame_rate * WINDOW_MS / 1000))
+    n_win = n // win
+    if n_win < 3:
+        return []
+
+    power = np.mean(x[:n_win * win] ** 2, axis=1).reshape(n_win, win).mean(axis=1)
+    window_db = 10 * np.log10(np.maximum(power, 1e-12))
+    silent = window_db < max(window_db.max() + SILENCE_DB, FLOOR_DB)
+
+    # Run boundaries of the silent mask
+    edges = np.diff(np.concatenate(([0], silent.astype(np.int8), [0])))
+    starts = np.flatnonzero(edges == 1)
+    ends = np.flatnonzero(edges == -1)
+    inner = (starts > 0) & (ends < n_win) & ((ends - starts) * WINDOW_MS >= min_gap_ms)
+    return [(int(s) * win, int(e) * win) for s, e in zip(starts[inner], ends[inner])]
+
+
+def split_packed(pcm: bytes, frame_rate: int, texts: list[str], channels: int = 1) -> list[bytes] | None:
+    """
+    Splits the audio of pack_text(texts) into one PCM clip per text, cut
+    in the middle of each chosen pause. None when the pauses don't line
+    up with the texts.
+    """
+    if len(texts) == 1:
+        return [pcm]
+    gaps = silent_gaps(pcm, frame_rate, channels)
+    if len(gaps) < len(texts) - 1:
+        return None
+
+    # The sentence breaks are the longest pauses
+    longest = sorted(gaps, key=lambda g: g[1] - g[0], reverse=True)[:len(texts) - 1]
+    cuts = sorted((start + end) // 2 for start, end in longest)
+
+    width = 2 * channels
+    bounds = [0] + cuts + [len(pcm) // width]
+    clips = [pcm[a * width:b * width] for a, b in zip(bounds, bounds[1:])]
+
+    # Each clip should be about as long as its text's share of the whole
+    chars = np.array([max(1, len(t)) for t in texts], dtype=np.float64)
+    frames = np.diff(np.array(bounds, dtype=np.float64))
+    ratio = (frames / frames.sum()) / (chars / chars.sum())
+    if np.any(ratio > LENGTH_TOLERANCE) or np.any(ratio < 1 / LENGTH_TOLERANCE):
+        return None
+    return clips
+
+
+def decode_pcm(path: str | Path, frame_rate: int = FRAME_RATE, channels: int = 1) -> bytes:
+    return b"".join(iter_decode(path, frame_rate, channels))
+
+
+def write_pcm_wav(target: str | Path, pcm: bytes, frame_rate: int = FRAME_RATE, channels: int = 1):
+    with wave.open(str(target), "wb") as w:
+        w.setnchannels(channels)
+        w.setsampwidth(2)
+        w.setframerate(frame_rate)
+        w.writeframes(pcm)
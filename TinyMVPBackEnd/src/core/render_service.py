@@ -0,0 +1,225 @@
+# src/core/render_service.py
+"""
+Job queue behind server.py: lesson text in, rendered lesson out.
+
+- One warm TTSEngine (HTTP client, backend sessions) and one synthesis
+  cache are shared by every job, and so is the engine's request budget
+  (max_concurrency): a lone job synthesizes at full concurrency, several
+  jobs split it as they go
+- `job_workers` threads take jobs off a bounded queue: plan, synthesize
+  the new phrases, then hand the CPU-bound render to a process pool
+  (render_plan_worker, as in build_all.py)
+- Identical submissions (same text, same engine) map to the same job id;
+  while that job is queued, running or done, resubmitting it returns the
+  existing job instead of building the lesson twice
+- Finished jobs are forgotten, and their folders deleted, `job_ttl_s`
+  after they finish or once more than `max_jobs` are kept; folders left
+  by an earlier run are cleaned up the same way at startup
+"""
+
+import hashlib
+import json
+import multiprocessing
+import queue
+import re
+import shutil
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from src.core.lesson_builder import plan_lesson, render_plan_worker
+from src.core.phrase_parser import PhraseParser
+from src import config
+
+# Files clients may download from a finished job's folder
+ARTIFACT_SUFFIXES = (".mp3", ".opus", ".m4a", ".wav", ".json")
+
+
+class QueueFull(Exception):
+    """Raised by submit() when the job queue is at capacity."""
+
+
+class RenderService:
+    def __init__(self, tts, output_root: str | Path, job_workers: int = 4,
+                 render_workers: int = 2, max_queue: int = 100,
+                 job_ttl_s: float = 24 * 3600, max_jobs: int = 1000):
+        self.tts = tts
+        self.output_root = Path(output_root)
+        self.output_root.mkdir(parents=True, exist_ok=True)
+        self.job_ttl_s = job_ttl_s
+        self.max_jobs = max_jobs
+
+        self.jobs: dict[str, dict] = {}
+        self._lock = threading.RLock()
+        self._queue: queue.Queue = queue.Queue(maxsize=max_queue)
+        # spawn, not fork: this process runs threads (HTTP server, job workers)
+        self._render_pool = ProcessPoolExecutor(
+            max_workers=render_workers, mp_context=multiprocessing.get_context("spawn")
+        )
+        self._remove_stale_files()
+
+        self._threads = [
+            threading.Thread(target=self._worker, name=f"job-{i}", daemon=True)
+            for i in range(job_workers)
+        ]
+        for t in self._threads:
+            t.start()
+
+    # ----------------------------------------
+    # Public API
+    # ----------------------------------------
+    def job_id(self, text: str) -> str:
+        voices = json.dumps(config.LESSON_VOICES, sort_keys=True)
+        identity = f"{self.tts.model}\n{self.tts.voice}\n{voices}\n{text.strip()}"
+        return hashlib.sha256(identity.encode("utf-8")).hexdigest()[:16]
+
+    def submit(self, text: str, name: str | None = None) -> tuple[dict, bool]:
+        """
+        Queues a lesson build. Returns (job, created); created is False when
+        an identical lesson is already queued, running or done.
+        Raises ValueError for text without phrases, QueueFull when saturated.
+        """
+        parsed = PhraseParser().parse(text)
+        if not parsed["phrases"] and not parsed["spanish_spoken"]:
+            raise ValueError("no valid phrases found (expected 'English / Spanish' or '¿¿ Spanish' lines)")
+
+        job_id = self.job_id(text)
+        with self._lock:
+            self.prune()
+            existing = self.jobs.get(job_id)
+            if existing is not None and existing["state"] != "failed":
+                return self.status(job_id), False
+
+            job = {
+                "id": job_id,
+                "name": _safe_name(name) or job_id,
+                "state": "queued",
+                "phrases": len(parsed["phrases"]) + len(parsed["spanish_spoken"]),
+                "submitted_at": time.time(),
+                "started_at": None,
+                "finished_at": None,
+                "error": None,
+                "outputs": [],
+            }
+            try:
+                self._queue.put_nowait((job, text))
+            except queue.Full:
+                raise QueueFull(f"{self._queue.maxsize} jobs already queued")
+            self.jobs[job_id] = job
+            return self.status(job_id), True
+
+    def status(self, job_id: str) -> dict | None:
+        with self._lock:
+            job = self.jobs.get(job_id)
+            return dict(job) if job else None
+
+    def list_jobs(self) -> list[dict]:
+        with self._lock:
+            return [dict(j) for j in self.jobs.values()]
+
+    def artifact(self, job_id: str, filename: str) -> Path | None:
+        """Path of a downloadable file of a finished job, or None."""
+        job = self.status(job_id)
+        if job is None or job["state"] != "done" or filename not in job["outputs"]:
+            return None
+        path = self.output_root / job_id / filename
+        return path if path.is_file() else None
+
+    def stats(self) -> dict:
+        with self._lock:
+            states = {}
+            for j in self.jobs.values():
+                states[j["state"]] = states.get(j["state"], 0) + 1
+        cache = self.tts.cache.stats() if self.tts.cache is not None else None
+        return {"queued": self._queue.qsize(), "jobs": states, "cache": cache}
+
+    def prune(self) -> int:
+        """
+        Forgets finished jobs older than job_ttl_s, then the oldest ones
+        beyond max_jobs, and deletes their files. Returns the jobs removed.
+        """
+        with self._lock:
+            finished = sorted(
+                (j for j in self.jobs.values() if j["state"] in ("done", "failed")),
+                key=lambda j: j["finished_at"],
+            )
+            cutoff = time.time() - self.job_ttl_s
+            expired = [j for j in finished if j["finished_at"] < cutoff]
+            kept = finished[len(expired):]
+            expired += kept[:max(0, len(kept) - self.max_jobs)]
+            for job in expired:
+                del self.jobs[job["id"]]
+                self._remove_files(job["id"])
+            return len(expired)
+
+    def shutdown(self):
+        for _ in self._threads:
+            self._queue.put(None)
+        for t in self._threads:
+            t.join()
+        self._render_pool.shutdown()
+
+    # ----------------------------------------
+    # Workers
+    # ----------------------------------------
+    def _worker(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            job, text = item
+            try:
+                self._run(job, text)
+            except Exception as e:
+                print(f"[RenderService] ERROR in job {job['id']} ({job['name']}): {e}")
+                self._update(job, state="failed", error=str(e), finished_at=time.time())
+            finally:
+                self._queue.task_done()
+                self.prune()
+
+    def _run(self, job: dict, text: str):
+        self._update(job, state="synthesizing", started_at=time.time())
+
+        # The lesson folder is named after the file stem -> <output_root>/<job id>/
+        lesson_file = self.output_root / f"{job['id']}.txt"
+        lesson_file.write_text(text, encoding="utf-8")
+
+        plan = plan_lesson(lesson_file, self.tts, output_root=self.output_root)
+        if plan["pending"]:
+            self.tts.synthesize_many(plan["pending"])
+
+        self._update(job, state="rendering")
+        result = self._render_pool.submit(render_plan_worker, plan).result()
+
+        outputs = sorted(
+            p.name for p in plan["root"].iterdir()
+            if p.is_file() and p.suffix in ARTIFACT_SUFFIXES and p.name != "build_manifest.json"
+        )
+        self._update(job, state="done", finished_at=time.time(), outputs=outputs,
+                     render_s=round(result["render_s"], 3))
+        print(f"[RenderService] Job {job['id']} ({job['name']}) done: {len(outputs)} files")
+
+    def _update(self, job: dict, **fields):
+        with self._lock:
+            job.update(fields)
+
+    def _remove_files(self, job_id: str):
+        shutil.rmtree(self.output_root / job_id, ignore_errors=True)
+        (self.output_root / f"{job_id}.txt").unlink(missing_ok=True)
+
+    def _remove_stale_files(self):
+        """Job folders of an earlier run that are older than job_ttl_s."""
+        cutoff = time.time() - self.job_ttl_s
+        for path in self.output_root.iterdir():
+            try:
+                if path.stat().st_mtime < cutoff:
+                    self._remove_files(path.stem if path.is_file() else path.name)
+            except FileNotFoundError:
+                continue
+
+
+def _safe_name(name: str | None) -> str | None:
+    if not name:
+        return None
+    return re.sub(r"[^\w.-]+", "_", name.strip())[:80] or None
@@ -0,0 +1,215 @@
+# src/core/synthesis_cache.py
+
+import hashlib
+import json
+import os
+import shutil
+import threading
+import time
+from pathlib import Path
+
+
+class SynthesisCache:
+    """
+    Persistent, content-addressed cache for synthesized phrase audio.
+
+    - Entries are keyed by (model, voice, instructions, text)
+    - Audio lives in <root>/objects/<k[:2]>/<k>.mp3 (or the backend's
+      suffix, e.g. .wav), metadata in <root>/index.json
+    - Size-bounded: least-recently-used entries are evicted past `max_bytes`
+      (never the entry being inserted, even when it alone exceeds the bound)
+    - Outputs are materialized into lesson folders via hardlink (copy fallback)
+    - Safe to share between the worker threads of TTSEngine.synthesize_many:
+      fetch() looks up and links under one lock, and put() links its
+      destinations before any eviction can run, so a concurrent insert
+      never removes an object between lookup and link
+    """
+
+    INDEX_NAME = "index.json"
+
+    def __init__(self, root: str | Path, max_bytes: int = 500 * 1024 * 1024):
+        self.root = Path(root)
+        self.objects_dir = self.root / "objects"
+        self.index_path = self.root / self.INDEX_NAME
+        self.max_bytes = max_bytes
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self._lock = threading.RLock()
+        self._dirty = False
+        self.objects_dir.mkdir(parents=True, exist_ok=True)
+        self.index = self._load_index()
+
+    # ----------------------------------------
+    # Keys
+    # ----------------------------------------
+    @staticmethod
+    def make_key(model: str, voice: str, text: str, instructions: str | None = None) -> str:
+        payload = json.dumps(
+            {"model": model, "voice": voice, "instructions": instructions or "", "text": text},
+            ensure_ascii=False,
+            sort_keys=True,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    @classmethod
+    def indexed_keys(cls, root: str | Path) -> set[str]:
+        """Keys recorded in the index at `root`, read without opening the cache (dry runs)."""
+        try:
+            return set(json.loads((Path(root) / cls.INDEX_NAME).read_text(encoding="utf-8")))
+        except (OSError, ValueError):
+            return set()
+
+    def object_path(self, key: str, suffix: str | None = None) -> Path:
+        suffix = suffix or self.index.get(key, {}).get("suffix", ".mp3")
+        return self.objects_dir / key[:2] / f"{key}{suffix}"
+
+    # ----------------------------------------
+    # Lookup / insert
+    # ----------------------------------------
+    def get(self, key: str) -> Path | None:
+        """
+        Returns the cached audio path for `key`, or None on a miss.
+        Entries whose object file disappeared are dropped from the index.
+        """
+        with self._lock:
+            entry = self.index.get(key)
+            path = self.object_path(key)
+
+            if entry is None or not path.exists():
+                if entry is not None:
+                    del self.index[key]
+                    self._save_index()
+                self.misses += 1
+                return None
+
+            # Recency-only change: persisted on the next put() or flush()
+            entry["last_used"] = time.time()
+            self._dirty = True
+            self.hits += 1
+            return path
+
+    def fetch(self, key: str, dest: str | Path) -> Path | None:
+        """
+        Places the cached audio for `key` at `dest` (see materialize) and
+        returns `dest`, or None on a miss. Lookup and link are atomic with
+        respect to put()'s evictions.
+        """
+        with self._lock:
+            if self.get(key) is None:
+                return None
+            return self.materialize(key, dest)
+
+    def staging_path(self, key: str) -> Path:
+        """Temporary path a producer writes into before calling `put`."""
+        return self.objects_dir / f".{key}.{os.getpid()}.{threading.get_ident()}.tmp"
+
+    def put(self, key: str, source: str | Path, meta: dict | None = None,
+            dests: list[str | Path] = ()) -> Path:
+        """
+        Moves `source` into the cache under `key` and records it in the index.
+        The audio is first placed at every path in `dests` (as materialize
+        does), so they get it even if the entry is evicted later.
+        """
+        source = Path(source)
+        path = self.object_path(key, (meta or {}).get("suffix"))
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        with self._lock:
+            for dest in dests:
+                _link(source, Path(dest))
+            os.replace(source, path)
+
+            now = time.time()
+            self.index[key] = {
+                **(meta or {}),
+                "size": path.stat().st_size,
+                "created": now,
+                "last_used": now,
+            }
+            self._evict(keep=key)
+            self._save_index()
+            return path
+
+    def materialize(self, key: str, dest: str | Path) -> Path:
+        """
+        Places the cached audio for `key` at `dest` (hardlink, copy fallback).
+        An existing `dest` is unlinked first so a hardlinked cache object is
+        never written through.
+        """
+        with self._lock:
+            return _link(self.object_path(key), Path(dest))
+
+    # ----------------------------------------
+    # Eviction / stats
+    # ----------------------------------------
+    def total_bytes(self) -> int:
+        return sum(e.get("size", 0) for e in self.index.values())
+
+    def _evict(self, keep: str | None = None):
+        total = self.total_bytes()
+        if total <= self.max_bytes:
+            return
+
+        for key, entry in sorted(self.index.items(), key=lambda kv: kv[1].get("last_used", 0)):
+            if total <= self.max_bytes:
+                break
+            if key == keep:
+                continue
+            self.object_path(key).unlink(missing_ok=True)
+            total -= entry.get("size", 0)
+            del self.index[key]
+            self.evictions += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            return self._stats()
+
+    def _stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self.index),
+            "bytes": self.total_bytes(),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": (self.hits / lookups) if lookups else 0.0,
+        }
+
+    # ----------------------------------------
+    # Index persistence
+    # ----------------------------------------
+    def _load_index(self) -> dict:
+        if not self.index_path.exists():
+            return {}
+        try:
+            return json.loads(self.index_path.read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError) as e:
+            print(f"[SynthesisCache] Warning: unreadable index, starting empty: {e}")
+            return {}
+
+    def flush(self):
+        """Writes pending recency updates to index.json."""
+        with self._lock:
+            if self._dirty:
+                self._save_index()
+
+    def _save_index(self):
+        tmp = self.index_path.with_suffix(".json.tmp")
+        tmp.write_text(json.dumps(self.index, ensure_ascii=False, indent=2), encoding="utf-8")
+        os.replace(tmp, self.index_path)
+        self._dirty = False
+
+
+def _link(src: Path, dest: Path) -> Path:
+    """Hardlinks `src` at `dest` (copy fallback), replacing whatever was there."""
+    dest.parent.mkdir(parents=True, exist_ok=True)
+    if dest.exists() or dest.is_symlink():
+        dest.unlink()
+    try:
+        os.link(src, dest)
+    except OSError:
+        shutil.copy2(src, dest)
+    return dest
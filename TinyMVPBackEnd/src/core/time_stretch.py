@@ -0,0 +1,195 @@
+# src/core/time_stretch.py
+
+import numpy as np
+
+# PCM exchanged with pydub / ffmpeg pipes: signed 16-bit little endian
+INT16_SCALE = 32768.0
+
+
+def pcm_to_float(pcm: bytes, channels: int = 1) -> np.ndarray:
+    """s16le bytes -> float32 array of shape (frames, channels) in [-1, 1)."""
+    samples = np.frombuffer(pcm, dtype="<i2").astype(np.float32) / INT16_SCALE
+    return samples.reshape(-1, channels)
+
+
+def float_to_pcm(samples: np.ndarray) -> bytes:
+    """float32 (frames, channels) -> interleaved s16le bytes (clipped)."""
+    out = np.clip(samples * INT16_SCALE, -INT16_SCALE, INT16_SCALE - 1)
+    return out.astype("<i2").tobytes()
+
+
+class WSOLAStretcher:
+    """
+    Pitch-preserving time stretch (WSOLA), fed in streaming blocks.
+
+    factor < 1 slows down (0.90 -> output is 1/0.90 = 11% longer) without
+    lowering pitch, unlike rewriting frame_rate and resampling.
+
+    - Output frames are placed every `hop` samples (half a frame, Hann
+      window, so overlaps sum to one)
+    - Input frames are taken every `hop * factor` samples, each shifted by
+      up to +/- tolerance to best line up with the natural continuation of
+      the previous frame (FFT cross-correlation, normalized by energy)
+    - Memory is bounded: consumed input is dropped after every block
+
+    Usage:
+        st = WSOLAStretcher(0.9, frame_rate=24000)
+        for block in blocks:          # float32 (frames, channels)
+            out = st.process(block)
+        out = st.flush()
+    """
+
+    def __init__(self, factor: float, frame_rate: int = 24000, channels: int = 1,
+                 frame_ms: float = 40.0, tolerance_ms: float = 10.0):
+        if factor <= 0:
+            raise ValueError(f"time-stretch factor must be > 0, got {factor}")
+
+        self.factor = factor
+        self.frame_rate = frame_rate
+        self.channels = channels
+
+        self.frame_len = 2 * (int(frame_rate * frame_ms / 1000) // 2)
+        self.hop = self.frame_len // 2
+        self.analysis_hop = self.hop * factor
+        self.tolerance = int(frame_rate * tolerance_ms / 1000)
+
+        n = np.arange(self.frame_len)
+        self.window = (0.5 - 0.5 * np.cos(2 * np.pi * n / self.frame_len)).astype(np.float32)[:, None]
+
+        self._buf = np.zeros((0, channels), dtype=np.float32)
+        self._buf_start = 0          # absolute input index of _buf[0]
+        self._k = 0                  # next output frame index
+        self._prev = None            # absolute input start of the previous frame
+        self._tail = np.zeros((self.hop, channels), dtype=np.float32)
+        self._consumed = 0           # total input frames received
+        self._emitted = 0            # total output frames emitted
+
+    # ----------------------------------------
+    # Streaming API
+    # ----------------------------------------
+    def process(self, block: np.ndarray) -> np.ndarray:
+        """Feeds one block of input; returns whatever output is complete."""
+        block = np.asarray(block, dtype=np.float32).reshape(-1, self.channels)
+        self._buf = np.concatenate([self._buf, block]) if len(self._buf) else block
+        self._consumed += len(block)
+
+        out = self._run(final=False)
+        self._emitted += len(out)
+        return out
+
+    def flush(self) -> np.ndarray:
+        """Finishes the stream; total output length is input length / factor."""
+        out = self._run(final=True)
+        missing = int(round(self._consumed / self.factor)) - self._emitted - len(out)
+
+        if missing > 0:
+            pad = np.zeros((missing, self.channels), dtype=np.float32)
+            n = min(missing, self.hop)
+            pad[:n] = self._tail[:n]
+            out = np.concatenate([out, pad])
+        elif missing < 0:
+            out = out[:max(0, len(out) + missing)]
+
+        self._emitted += len(out)
+        return out
+
+    # ----------------------------------------
+    # Internals
+    # ----------------------------------------
+    def _run(self, final: bool) -> np.ndarray:
+        N, hop, tol = self.frame_len, self.hop, self.tolerance
+        end = self._buf_start + len(self._buf)
+        out = []
+
+        while True:
+            nominal = int(round(self._k * self.analysis_hop))
+            if final:
+                if nominal >= self._consumed:
+                    break
+            else:
+                needed = nominal + tol + N
+                if self._prev is not None:
+                    needed = max(needed, self._prev + hop + N)
+                if needed > end:
+                    break
+
+            pos = nominal if self._prev is None else self._best_position(nominal)
+            frame = self._slice(pos, N) * self.window
+
+            out.append(self._tail + frame[:hop])
+            self._tail = frame[hop:].copy()
+            self._prev = pos
+            self._k += 1
+
+        # Drop input no future frame can reach
+        keep_from = int(round(self._k * self.analysis_hop)) - tol
+        if self._prev is not None:
+            keep_from = min(keep_from, self._prev + hop)
+        drop = max(0, min(keep_from - self._buf_start, len(self._buf)))
+        if drop:
+            self._buf = self._buf[drop:]
+            self._buf_start += drop
+
+        if not out:
+            return np.zeros((0, self.channels), dtype=np.float32)
+        return np.concatenate(out)
+
+    def _best_position(self, nominal: int) -> int:
+        """
+        Shift in [nominal - tol, nominal + tol] whose frame best matches the
+        natural continuation of the previous frame.
+        """
+        N, tol = self.frame_len, self.tolerance
+        lo = max(0, nominal - tol)
+        hi = nominal + tol
+
+        template = self._slice(self._prev + self.hop, N).mean(axis=1)
+        region = self._slice(lo, hi - lo + N).mean(axis=1)
+
+        # Cross-correlation of every candidate offset via one FFT product
+        size = 1 << int(np.ceil(np.log2(len(region) + N)))
+        corr = np.fft.irfft(np.fft.rfft(region, size) * np.conj(np.fft.rfft(template, size)), size)
+        corr = corr[:hi - lo + 1]
+
+        # Normalize by candidate energy so loud regions don't always win
+        energy = np.concatenate([[0.0], np.cumsum(region.astype(np.float64) ** 2)])
+        cand_energy = energy[N:N + len(corr)] - energy[:len(corr)]
+        score = corr / np.sqrt(cand_energy + 1e-9)
+
+        return lo + int(np.argmax(score))
+
+    def _slice(self, start: int, length: int) -> np.ndarray:
+        """Input samples [start, start + length), zero padded past the end."""
+        a = start - self._buf_start
+        chunk = self._buf[max(0, a):a + length]
+        if a < 0 or len(chunk) < length:
+            padded = np.zeros((length, self.channels), dtype=np.float32)
+            offset = max(0, -a)
+            padded[offset:offset + len(chunk)] = chunk
+            return padded
+        return chunk
+
+
+# ----------------------------------------
+# Helpers
+# ----------------------------------------
+def stretch_pcm(pcm: bytes, factors, frame_rate: int = 24000, channels: int = 1,
+                block_frames: int = 65536) -> dict:
+    """
+    Time-stretches one decoded buffer to several factors in a single pass.
+    Returns {factor: s16le bytes}.
+    """
+    samples = pcm_to_float(pcm, channels)
+    stretchers = {f: WSOLAStretcher(f, frame_rate, channels) for f in factors}
+    chunks = {f: [] for f in factors}
+
+    for start in range(0, len(samples), block_frames):
+        block = samples[start:start + block_frames]
+        for f, st in stretchers.items():
+            chunks[f].append(st.process(block))
+
+    result = {}
+    for f, st in stretchers.items():
+        chunks[f].append(st.flush())
+        result[f] = float_to_pcm(np.concatenate(chunks[f]))
+    return result
@@ -0,0 +1,183 @@
+# src/core/tts_backends.py
+
+import os
+import queue
+import threading
+import wave
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import numpy as np
+
+STREAM_CHUNK_BYTES = 64 * 1024
+
+
+class TTSBackend:
+    """
+    What TTSEngine needs from a speech provider.
+
+    - model_id:         identity used in cache keys (model + settings)
+    - file_suffix:      extension of the audio files the backend writes
+    - batch_size:       phrases handed to one synthesize_batch call
+    - retryable_errors: exceptions TTSEngine retries with backoff
+    - supports_instructions: honors style instructions (VOICE_PROFILES);
+      they are then part of the cache key
+    """
+
+    model_id = "base"
+    file_suffix = ".mp3"
+    batch_size = 1
+    retryable_errors: tuple = ()
+    supports_instructions = False
+
+    def synthesize_to_file(self, text: str, voice: str, target: Path, instructions: str | None = None):
+        raise NotImplementedError
+
+    def synthesize_batch(self, texts: list[str], voice: str, targets: list[Path],
+                         instructions: str | None = None):
+        """Default: one call per phrase. Backends override to amortize setup."""
+        for text, target in zip(texts, targets):
+            self.synthesize_to_file(text, voice, target, instructions)
+
+
+# ----------------------------------------
+# OpenAI /audio/speech
+# ----------------------------------------
+class OpenAIBackend(TTSBackend):
+    """
+    Streams MP3 from OpenAI's speech endpoint.
+
+    The client comes from tts_clients (one pooled client per API key for
+    the whole process) unless one is passed in. It is created on first
+    use, and the openai package is only imported then, so planning and
+    previews work offline and start fast.
+    """
+
+    file_suffix = ".mp3"
+    supports_instructions = True
+
+    def __init__(self, api_key: str | None = None, model: str = "gpt-4o-mini-tts", client=None):
+        self._client = client
+        self.api_key = api_key
+        self.model_id = model
+
+    @property
+    def retryable_errors(self) -> tuple:
+        import openai
+
+        return (
+            openai.RateLimitError,
+            openai.InternalServerError,
+            openai.APIConnectionError,
+            openai.APITimeoutError,
+        )
+
+    @property
+    def client(self):
+        if self._client is None:
+            from src.core.tts_clients import shared_openai_client
+            self._client = shared_openai_client(self.api_key)
+        return self._client
+
+    def synthesize_to_file(self, text: str, voice: str, target: Path, instructions: str | None = None):
+        extra = {"instructions": instructions} if instructions else {}
+        with self.client.audio.speech.with_streaming_response.create(
+            model=self.model_id,
+            voice=voice,
+            input=text,
+            **extra,
+        ) as response:
+            with open(target, "wb") as f:
+                for chunk in response.iter_bytes(STREAM_CHUNK_BYTES):
+                    f.write(chunk)
+
+
+# ----------------------------------------
+# Local Kokoro ONNX (see MVP/Test/main.py)
+# ----------------------------------------
+class KokoroBackend(TTSBackend):
+    """
+    Offline synthesis with kokoro_onnx.
+
+    - The model is loaded once per session; `sessions` sessions are kept in
+      a pool and checked out per batch, so TTSEngine.synthesize_many with
+      max_concurrency = sessions keeps every core busy (onnxruntime
+      releases the GIL during inference)
+    - Each session gets cpu_count // sessions intra-op threads
+    - A batch of phrases is phonemized and run on one checked-out session
+    - Output is 16-bit PCM WAV: no MP3 encode here and no ffmpeg decode in
+      AudioPostProcessor (pydub reads WAV natively)
+    - onnxruntime and the model are loaded on the first synthesis, so an
+      engine that only plans never pays for them
+    """
+
+    file_suffix = ".wav"
+
+    # Kokoro voice names start with a language letter: af_heart, bf_emma, ef_dora...
+    LANG_BY_PREFIX = {"a": "en-us", "b": "en-gb", "e": "es", "f": "fr-fr", "i": "it", "p": "pt-br"}
+
+    def __init__(self, model_path: str | Path, voices_path: str | Path,
+                 sessions: int = 1, batch_size: int = 8, speed: float = 1.0):
+        self.model_path = Path(model_path)
+        self.voices_path = Path(voices_path)
+        self.speed = speed
+        self.batch_size = batch_size
+        self.sessions = max(1, sessions)
+        self.model_id = f"{self.model_path.stem}@speed={speed}"
+        self._pool: queue.Queue | None = None
+        self._load_lock = threading.Lock()
+
+    def _sessions(self) -> queue.Queue:
+        """The session pool, loaded on first use."""
+        with self._load_lock:
+            if self._pool is not None:
+                return self._pool
+
+            import onnxruntime as rt
+            from kokoro_onnx import Kokoro
+
+            threads = max(1, (os.cpu_count() or 1) // self.sessions)
+            pool = queue.Queue()
+            for _ in range(self.sessions):
+                options = rt.SessionOptions()
+                options.intra_op_num_threads = threads
+                options.inter_op_num_threads = 1
+                session = rt.InferenceSession(
+                    str(self.model_path), options, providers=["CPUExecutionProvider"]
+                )
+                pool.put(Kokoro.from_session(session, str(self.voices_path)))
+
+            print(f"[KokoroBackend] Loaded {self.model_path.name}: {self.sessions} sessions x {threads} threads")
+            self._pool = pool
+            return pool
+
+    def lang_for(self, voice: str) -> str:
+        return self.LANG_BY_PREFIX.get(voice[:1], "en-us")
+
+    def synthesize_to_file(self, text: str, voice: str, target: Path, instructions: str | None = None):
+        self.synthesize_batch([text], voice, [target])
+
+    def synthesize_batch(self, texts: list[str], voice: str, targets: list[Path],
+                         instructions: str | None = None):
+        pool = self._sessions()
+        kokoro = pool.get()
+        try:
+            lang = self.lang_for(voice)
+            for text, target in zip(texts, targets):
+                samples, sample_rate = kokoro.create(text, voice=voice, speed=self.speed, lang=lang)
+                write_wav(target, samples, sample_rate)
+        finally:
+            pool.put(kokoro)
+
+
+def write_wav(target: str | Path, samples: "np.ndarray", sample_rate: int):
+    """float32 mono samples -> 16-bit PCM WAV."""
+    import numpy as np
+
+    pcm = np.clip(np.asarray(samples, dtype=np.float32) * 32768.0, -32768, 32767).astype("<i2")
+    with wave.open(str(target), "wb") as w:
+        w.setnchannels(1)
+        w.setsampwidth(2)
+        w.setframerate(sample_rate)
+        w.writeframes(pcm.tobytes())
@@ -0,0 +1,67 @@
+# src/core/tts_clients.py
+"""
+Process-wide registry of speech API clients.
+
+Every OpenAIBackend (and so every TTSEngine, whatever its model or voice)
+gets its client from here, so all of them share one httpx connection
+pool: keep-alive connections (and HTTP/2 when the `h2` package is
+installed) stay warm across engines, voice profiles and lessons instead
+of paying a TLS handshake per engine.
+
+Pool size and timeouts come from config (TTS_HTTP_*).
+"""
+
+import importlib.util
+import os
+import threading
+
+_clients: dict[tuple, object] = {}
+_lock = threading.Lock()
+
+
+def shared_openai_client(api_key: str | None = None, base_url: str | None = None):
+    """The OpenAI client for (api_key, base_url), created on first use."""
+    api_key = api_key or os.getenv("OPENAI_API_KEY")
+    key = ("openai", api_key, base_url)
+
+    with _lock:
+        client = _clients.get(key)
+        if client is None:
+            client = _make_openai_client(api_key, base_url)
+            _clients[key] = client
+        return client
+
+
+def close_all():
+    """Closes every pooled connection (end of a long-running process / tests)."""
+    with _lock:
+        for client in _clients.values():
+            client.close()
+        _clients.clear()
+
+
+def _make_openai_client(api_key: str | None, base_url: str | None):
+    import httpx
+    from openai import OpenAI
+    from src import config
+
+    http2 = config.TTS_HTTP2
+    if http2 and importlib.util.find_spec("h2") is None:     # httpx needs it for HTTP/2
+        print("[tts_clients] 'h2' not installed, using HTTP/1.1 keep-alive")
+        http2 = False
+
+    http_client = httpx.Client(
+        http2=http2,
+        limits=httpx.Limits(
+            max_connections=config.TTS_HTTP_POOL_SIZE,
+            max_keepalive_connections=config.TTS_HTTP_POOL_SIZE,
+            keepalive_expiry=config.TTS_HTTP_KEEPALIVE_S,
+        ),
+        timeout=httpx.Timeout(
+            config.TTS_HTTP_READ_TIMEOUT_S,
+            connect=config.TTS_HTTP_CONNECT_TIMEOUT_S,
+        ),
+    )
+
+    # Retries are handled by TTSEngine (Retry-After aware, jittered), not by the SDK
+    return OpenAI(api_key=api_key, base_url=base_url, http_client=http_client, max_retries=0)
@@ -1,23 +1,149 @@
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import os
-from openai import OpenAI
+import random
+import shutil
+import threading
+import time
+
+from src.core import instrumentation as trace
+from src.core.synthesis_cache import SynthesisCache
+from src.core.tts_backends import TTSBackend, OpenAIBackend, KokoroBackend
 
 # Voices currently supported by gpt-4o-mini-tts:
 # alloy, echo, fable, onyx, nova, shimmer,
 # coral, verse, ballad, ash, sage, marin, cedar
 
+
 class TTSEngine:
     def __init__(self, api_key: str | None = None,
                  model: str = "gpt-4o-mini-tts",
-                 voice: str = "marin"):
+                 voice: str = "marin",
+                 cache: SynthesisCache | None = None,
+                 max_concurrency: int = 6,
+                 max_retries: int = 5,
+                 backoff_base_s: float = 1.0,
+                 backoff_cap_s: float = 30.0,
+                 backend: TTSBackend | None = None,
+                 instructions: str | None = None,
+                 pack_phrases: int = 1):
         """
-        Basic TTS wrapper around OpenAI's /audio/speech endpoint.
-        - model: e.g. "gpt-4o-mini-tts"
+        TTS wrapper around a speech backend (OpenAI's /audio/speech by default).
+        - model: e.g. "gpt-4o-mini-tts" (ignored when `backend` is given)
         - voice: any of the supported voice names
+        - instructions: default speaking style (backends that support it)
+        - cache: optional SynthesisCache; hits skip the backend entirely
+        - max_concurrency: requests in flight, engine-wide: concurrent
+          synthesize_many calls (and views) share this budget
+        - max_retries: retries per request on 429 / 5xx / connection errors
+        - backend: e.g. KokoroBackend for offline synthesis
+        - pack_phrases: > 1 sends up to this many same-voice phrases per
+          request and splits the audio at the pauses (see phrase_packing);
+          phrase files are then WAV. Only for one-phrase-per-call backends
         """
-        self.client = OpenAI(api_key=api_key or os.getenv("OPENAI_API_KEY"))
-        self.model = model
+        self.backend = backend or OpenAIBackend(api_key=api_key, model=model)
+        self.model = self.backend.model_id
         self.voice = voice
+        self.instructions = instructions
+        self.cache = cache
+        self.max_concurrency = max_concurrency
+        self._slots = threading.BoundedSemaphore(max(1, max_concurrency))
+        self.max_retries = max_retries
+        self.backoff_base_s = backoff_base_s
+        self.backoff_cap_s = backoff_cap_s
+        self.pack_phrases = max(1, pack_phrases)
+
+    @classmethod
+    def from_config(cls, cache: SynthesisCache | None = None) -> "TTSEngine":
+        """Engine for config.TTS_BACKEND ("openai" or "kokoro")."""
+        from src import config
+
+        if config.TTS_BACKEND == "kokoro":
+            backend = KokoroBackend(
+                config.KOKORO_MODEL_PATH,
+                config.KOKORO_VOICES_PATH,
+                sessions=config.KOKORO_SESSIONS,
+                batch_size=config.KOKORO_BATCH_SIZE,
+            )
+            return cls(voice=config.KOKORO_VOICE, cache=cache, backend=backend,
+                       max_concurrency=config.KOKORO_SESSIONS, max_retries=0)
+
+        return cls(
+            model=config.DEFAULT_TTS_MODEL,
+            voice=config.DEFAULT_TTS_VOICE,
+            api_key=config.OPENAI_API_KEY,
+            cache=cache,
+            max_concurrency=config.TTS_MAX_CONCURRENCY,
+            max_retries=config.TTS_MAX_RETRIES,
+            pack_phrases=config.TTS_PACK_PHRASES,
+        )
+
+    def view(self, model: str | None = None, voice: str | None = None,
+             instructions: str | None = None) -> "TTSEngine":
+        """
+        Engine for another voice, instructions and/or model that shares
+        this one's connections, cache and concurrency / retry settings.
+        Only OpenAI models can be switched; other backends keep theirs.
+        """
+        backend = self.backend
+        if model and model != self.model:
+            if not isinstance(backend, OpenAIBackend):
+                raise ValueError(f"{type(backend).__name__} cannot switch to model '{model}'")
+            backend = OpenAIBackend(model=model, client=backend.client)
+
+        engine = TTSEngine(
+            voice=voice or self.voice,
+            cache=self.cache,
+            max_concurrency=self.max_concurrency,
+            max_retries=self.max_retries,
+            backoff_base_s=self.backoff_base_s,
+            backoff_cap_s=self.backoff_cap_s,
+            backend=backend,
+            instructions=instructions or self.instructions,
+            pack_phrases=self.pack_phrases,
+        )
+        engine._slots = self._slots     # one request budget for the engine and its views
+        return engine
+
+    def voice_settings(self, profile: dict | None) -> dict:
+        """
+        Job fields ({"voice", "instructions", "model"}) that make this
+        engine speak with a VOICE_PROFILES entry. Empty (engine defaults)
+        when there is no profile or the backend has its own voice set
+        (e.g. Kokoro); the model only switches on OpenAI backends.
+        """
+        if not profile or not self.backend.supports_instructions:
+            return {}
+        settings = {"voice": profile["voice"], "instructions": profile.get("instructions")}
+        if isinstance(self.backend, OpenAIBackend) and profile.get("model", self.model) != self.model:
+            settings["model"] = profile["model"]
+        return settings
+
+    @property
+    def client(self):
+        """The backend's API client (None for local backends)."""
+        return getattr(self.backend, "client", None)
+
+    @property
+    def packing(self) -> bool:
+        """True when phrases are packed several per request (pack_phrases)."""
+        return self.pack_phrases > 1 and self.backend.batch_size == 1
+
+    @property
+    def file_suffix(self) -> str:
+        """Extension of the phrase files this engine produces (.mp3 / .wav)."""
+        return ".wav" if self.packing else self.backend.file_suffix
+
+    def phrase_key(self, text: str, voice: str | None = None, instructions: str | None = None,
+                   model: str | None = None) -> str:
+        """Content identity of a phrase as this engine would synthesize it."""
+        instructions = instructions or self.instructions
+        if not self.backend.supports_instructions:
+            instructions = None     # ignored by the backend, so not part of the identity
+        model = model or self.model
+        if self.packing:
+            model += "+packed"      # split from a packed request, stored as WAV
+        return SynthesisCache.make_key(model, voice or self.voice, text, instructions)
 
     def synthesize(self, text: str, filename: str | Path, voice: str | None = None) -> Path:
         """
@@ -26,28 +152,275 @@ class TTSEngine:
         - `voice` parameter overrides the default voice if provided.
         - Returns the Path to the created file.
         """
-        filename = Path(filename)
-        filename.parent.mkdir(parents=True, exist_ok=True)
+        return self._synthesize_batch([{"text": text, "out": filename, "voice": voice}])[0]["path"]
 
-        chosen_voice = voice or self.voice
-        print(f"Generating {filename.name} with voice='{chosen_voice}'...")
+    def synthesize_many(self, jobs: list[dict], max_workers: int | None = None) -> list[dict]:
+        """
+        Synthesizes many phrases with up to `max_workers` requests in flight
+        (never more than max_concurrency across every caller of the engine).
 
-        try:
-            response = self.client.audio.speech.create(
-                model=self.model,
-                voice=chosen_voice,
-                input=text,
-                #instructions="Speak clearly and naturally.",
+        jobs = [{"text": ..., "out": path,
+                 "voice" / "instructions" / "model": optional overrides}, ...]
+
+        Jobs are grouped per (model, voice, instructions), wherever they
+        sit in the list, and every group's requests share one worker pool,
+        so an EN and an ES speaker are synthesized side by side. Backends
+        with batch_size > 1 get one synthesize_batch call per group chunk.
+
+        Jobs with the same phrase key are requested once and the file is
+        copied to the others (their results count as "cached").
+
+        Returns one result per job, in the same order as `jobs`:
+            {"text", "path", "voice", "cached", "attempts", "latency_s"}
+        The first failing job re-raises after all in-flight work finishes.
+        """
+        results = [None] * len(jobs)
+        for i, result in self.iter_synthesize(jobs, max_workers):
+            results[i] = result
+        return results
+
+    def iter_synthesize(self, jobs: list[dict], max_workers: int | None = None):
+        """
+        synthesize_many as a generator: yields (job index, result) as soon
+        as each phrase is on disk, in completion order, so callers can
+        start working on early phrases while later ones are in flight
+        (see lesson_pipeline).
+        """
+        started = time.perf_counter()
+
+        # Each phrase key is requested once; jobs repeating it get a copy
+        # of the first one's file
+        first = {}
+        repeats = {}
+        for i, job in enumerate(jobs):
+            key = self.phrase_key(job["text"], job.get("voice"), job.get("instructions"), job.get("model"))
+            if key in first:
+                repeats.setdefault(first[key], []).append(i)
+            else:
+                first[key] = i
+        unique = list(first.values())
+
+        batches = self._batches([jobs[i] for i in unique])
+        workers = max(1, min(max_workers or self.max_concurrency, len(batches) or 1))
+
+        results = []
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="tts") as pool:
+            futures = {
+                pool.submit(engine._synthesize_batch, [jobs[unique[i]] for i in indices]):
+                    [unique[i] for i in indices]
+                for engine, indices in batches
+            }
+            for future in as_completed(futures):
+                for i, r in zip(futures[future], future.result()):
+                    results.append(r)
+                    yield i, r
+                    for j in repeats.get(i, []):
+                        out = Path(jobs[j]["out"])
+                        if out != r["path"]:
+                            out.parent.mkdir(parents=True, exist_ok=True)
+                            shutil.copy2(r["path"], out)
+                        copy = {**r, "path": out, "cached": True, "attempts": 0}
+                        results.append(copy)
+                        yield j, copy
+
+        if self.cache is not None:
+            self.cache.flush()
+
+        elapsed = time.perf_counter() - started
+        fetched = [r for r in results if not r["cached"]]
+        if fetched:
+            latencies = sorted(r["latency_s"] for r in fetched)
+            p50 = latencies[len(latencies) // 2]
+            voices = len({r["voice"] for r in fetched})
+            print(
+                f"[TTSEngine] {len(results)} phrases in {elapsed:.1f}s "
+                f"({len(fetched)} requested, {voices} voice(s), {workers} in flight, "
+                f"p50 {p50:.2f}s, max {latencies[-1]:.2f}s, "
+                f"{sum(r['attempts'] - 1 for r in fetched)} retries)"
             )
+        else:
+            print(f"[TTSEngine] {len(results)} phrases in {elapsed:.1f}s (all cached)")
+
+    # ----------------------------------------
+    # Internals
+    # ----------------------------------------
+    def _batches(self, jobs: list[dict]) -> list[tuple["TTSEngine", list[int]]]:
+        """
+        Groups job indices per (model, voice, instructions) into chunks of
+        <= batch_size (pack_phrases when packing), each paired with the
+        engine (self, or a view for another model) that synthesizes it.
+        Groups fill in job order, so a pack holds consecutive phrases.
+        """
+        size = self.pack_phrases if self.packing else max(1, self.backend.batch_size)
+        engines = {self.model: self}
+        open_batches = {}
+        batches = []
+        for i, job in enumerate(jobs):
+            model = job.get("model") or self.model
+            group = (model, job.get("voice") or self.voice, job.get("instructions") or self.instructions)
+            batch = open_batches.get(group)
+            if batch is None or len(batch[1]) >= size:
+                if model not in engines:
+                    engines[model] = self.view(model=model)
+                batch = (engines[model], [])
+                open_batches[group] = batch
+                batches.append(batch)
+            batch[1].append(i)
+        return batches
+
+    def _synthesize_batch(self, jobs: list[dict]) -> list[dict]:
+        """
+        Resolves cache hits, synthesizes the misses in one backend call,
+        and returns one result per job (in order). Jobs share one voice
+        and instructions (see _batches).
+        """
+        started = time.perf_counter()
+        instructions = jobs[0].get("instructions") or self.instructions
+        results = []
+        misses = []
 
-            audio_bytes = response.read()
+        for job in jobs:
+            filename = Path(job["out"])
+            filename.parent.mkdir(parents=True, exist_ok=True)
+            voice = job.get("voice") or self.voice
+            result = {"text": job["text"], "path": filename, "voice": voice,
+                      "cached": False, "attempts": 0}
+            results.append(result)
 
-            with open(filename, "wb") as f:
-                f.write(audio_bytes)
+            if self.cache is not None:
+                key = self.phrase_key(job["text"], voice, instructions)
+                if self.cache.fetch(key, filename) is not None:
+                    print(f"Cached {filename.name} (voice='{voice}')")
+                    trace.count("cache.hits")
+                    result["cached"] = True
+                    result["latency_s"] = time.perf_counter() - started
+                    continue
+            misses.append(result)
 
-            print(f"Saved {filename}")
-            return filename
+        if misses:
+            trace.count("cache.misses", len(misses))
+            voice = misses[0]["voice"]
+
+            # Jobs are unique per phrase key (iter_synthesize fans repeats out)
+            keys = [self.phrase_key(r["text"], voice, instructions) for r in misses]
+            texts = [r["text"] for r in misses]
+            if self.cache is not None:
+                targets = [self.cache.staging_path(k) for k in keys]
+            else:
+                targets = [r["path"] for r in misses]
+
+            label = ", ".join(r["path"].name for r in misses)
+            request = self._request_packed if self.packing else self._request
+            attempts = request(texts, voice, targets, label, instructions)
+
+            if self.cache is not None:
+                for key, r, target in zip(keys, misses, targets):
+                    self.cache.put(key, target, dests=[r["path"]], meta={
+                        "model": self.model, "voice": voice, "instructions": instructions,
+                        "text": r["text"], "suffix": self.file_suffix,
+                    })
+
+            for r in misses:
+                print(f"Saved {r['path']}")
+                r["attempts"] = attempts
+                r["latency_s"] = time.perf_counter() - started
+
+        return results
+
+    def _request(self, texts: list[str], voice: str, targets: list[Path], label: str,
+                 instructions: str | None = None) -> int:
+        """
+        Runs the backend for `texts`, writing each to a .part file that is
+        renamed onto its target once the whole batch succeeded.
+        Retries throttled / transient failures; returns the attempt count.
+        """
+        print(f"Generating {label} with voice='{voice}'...")
+
+        tmps = [Path(t).with_name(Path(t).name + ".part") for t in targets]
+        attempt = 0
+        while True:
+            attempt += 1
+            try:
+                with self._slots, \
+                        trace.span("synthesize", phrases=len(texts), voice=voice, attempt=attempt) as s:
+                    self.backend.synthesize_batch(texts, voice, tmps, instructions)
+                    s["bytes"] = sum(tmp.stat().st_size for tmp in tmps)
+                for tmp, target in zip(tmps, targets):
+                    os.replace(tmp, target)
+                return attempt
+
+            except self.backend.retryable_errors as e:
+                for tmp in tmps:
+                    tmp.unlink(missing_ok=True)
+                if attempt > self.max_retries:
+                    print(f"[TTSEngine] ERROR while generating {label}: {e} (gave up after {attempt} attempts)")
+                    raise
+                delay = self._retry_delay(e, attempt)
+                trace.count("tts.retries")
+                print(f"[TTSEngine] {label}: {type(e).__name__}, retrying in {delay:.1f}s "
+                      f"({attempt}/{self.max_retries})")
+                time.sleep(delay)
+
+            except Exception as e:
+                for tmp in tmps:
+                    tmp.unlink(missing_ok=True)
+                print(f"[TTSEngine] ERROR while generating {label}: {e}")
+                raise
+
+    def _request_packed(self, texts: list[str], voice: str, targets: list[Path], label: str,
+                        instructions: str | None = None) -> int:
+        """
+        One request for all of `texts` (pack_text), split into a WAV per
+        target at the pauses. When the split doesn't line up, the phrases
+        are requested one by one instead. Returns the attempt count.
+        """
+        from src.core.phrase_packing import FRAME_RATE, decode_pcm, pack_text, split_packed, write_pcm_wav
+
+        first = Path(targets[0])
+        packed = first.with_name(first.name + ".packed" + self.backend.file_suffix)
+        attempts = self._request([pack_text(texts)], voice, [packed], label, instructions)
+        try:
+            with trace.span("split", phrases=len(texts)):
+                clips = split_packed(decode_pcm(packed), FRAME_RATE, texts)
+        finally:
+            packed.unlink(missing_ok=True)
+
+        if clips is None:
+            trace.count("tts.pack_fallbacks")
+            print(f"[TTSEngine] {label}: packed audio did not split into {len(texts)} phrases, "
+                  f"requesting them one by one")
+            clips = []
+            for text, target in zip(texts, targets):
+                target = Path(target)
+                single = target.with_name(target.name + ".single" + self.backend.file_suffix)
+                # Only this phrase's retries add to the count
+                attempts += self._request([text], voice, [single], target.name, instructions) - 1
+                try:
+                    clips.append(decode_pcm(single))
+                finally:
+                    single.unlink(missing_ok=True)
+        else:
+            trace.count("tts.packed_phrases", len(texts))
+
+        for clip, target in zip(clips, targets):
+            tmp = Path(target).with_name(Path(target).name + ".part")
+            write_pcm_wav(tmp, clip)
+            os.replace(tmp, target)
+        return attempts
+
+    def _retry_delay(self, error: Exception, attempt: int) -> float:
+        """
+        Honors the server's Retry-After header when present; otherwise
+        exponential backoff with full jitter.
+        """
+        response = getattr(error, "response", None)
+        retry_after = response.headers.get("retry-after") if response is not None else None
+        if retry_after:
+            try:
+                wait = float(retry_after)
+                return wait + random.uniform(0, 0.25 * wait + 0.1)
+            except ValueError:
+                pass
 
-        except Exception as e:
-            print(f"[TTSEngine] ERROR while generating {filename.name}: {e}")
-            raise
+        ceiling = min(self.backoff_cap_s, self.backoff_base_s * 2 ** (attempt - 1))
+        return random.uniform(0, ceiling)
@@ -0,0 +1,7 @@
+# tests/conftest.py
+"""Run from TinyMVPBackEnd/:  python -m pytest -q"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
@@ -0,0 +1,94 @@
+# tests/test_build_manifest.py
+
+from src.core.build_manifest import BuildManifest
+
+
+def jobs_for(root, keys):
+    return [{"key": k, "text": f"text {k}", "out": root / f"phrase_{i:02d}.mp3"}
+            for i, k in enumerate(keys, start=1)]
+
+
+def synthesize(jobs):
+    for job in jobs:
+        job["out"].write_text(job["key"])
+
+
+def build(root, keys, fail=False):
+    manifest = BuildManifest(root)
+    jobs = jobs_for(root, keys)
+    pending = manifest.reconcile_phrases("normal", jobs)
+    if fail:
+        raise RuntimeError("synthesis failed")
+    synthesize(pending)
+    manifest.save()
+    return jobs, pending
+
+
+def test_first_build_synthesizes_everything(tmp_path):
+    jobs, pending = build(tmp_path, ["A", "B"])
+    assert [j["key"] for j in pending] == ["A", "B"]
+
+
+def test_insert_reuses_and_shifts_files(tmp_path):
+    build(tmp_path, ["A", "B"])
+    jobs, pending = build(tmp_path, ["X", "A", "B"])
+    assert [j["key"] for j in pending] == ["X"]
+    assert [j["out"].read_text() for j in jobs] == ["X", "A", "B"]
+
+
+def test_removed_phrase_files_are_deleted(tmp_path):
+    build(tmp_path, ["A", "B", "C"])
+    jobs, pending = build(tmp_path, ["A", "C"])
+    assert pending == []
+    assert [j["out"].read_text() for j in jobs] == ["A", "C"]
+    assert not (tmp_path / "phrase_03.mp3").exists()
+
+
+def test_interrupted_build_keeps_files_and_manifest_consistent(tmp_path):
+    build(tmp_path, ["A", "B"])
+    try:
+        build(tmp_path, ["X", "A", "B"], fail=True)
+    except RuntimeError:
+        pass
+
+    jobs, pending = build(tmp_path, ["X", "A", "B"])
+    assert [j["key"] for j in pending] == ["X"]
+    assert [j["out"].read_text() for j in jobs] == ["X", "A", "B"]
+
+
+def test_interrupted_build_then_original_lesson(tmp_path):
+    build(tmp_path, ["A", "B"])
+    try:
+        build(tmp_path, ["X", "A", "B"], fail=True)
+    except RuntimeError:
+        pass
+
+    jobs, pending = build(tmp_path, ["A", "B"])
+    assert pending == []
+    assert [j["out"].read_text() for j in jobs] == ["A", "B"]
+
+
+def test_outputs_stay_fresh_across_reconcile(tmp_path):
+    out = tmp_path / "lesson.mp3"
+    out.write_bytes(b"mp3")
+    manifest = BuildManifest(tmp_path)
+    manifest.reconcile_phrases("normal", jobs_for(tmp_path, ["A"]))
+    synthesize(jobs_for(tmp_path, ["A"]))
+    digest = BuildManifest.inputs_hash(["A"], {})
+    manifest.record_output(out, digest)
+    manifest.save()
+
+    manifest = BuildManifest(tmp_path)
+    manifest.reconcile_phrases("normal", jobs_for(tmp_path, ["A"]))
+    assert BuildManifest(tmp_path).is_fresh(out, digest)
+
+
+def test_repeated_phrase_reuses_its_file_everywhere(tmp_path):
+    build(tmp_path, ["A", "B", "A"])
+    jobs, pending = build(tmp_path, ["A", "B", "A"])
+    assert pending == []
+    assert [j["out"].read_text() for j in jobs] == ["A", "B", "A"]
+
+    jobs, pending = build(tmp_path, ["X", "A", "B", "A", "A"])
+    assert [j["key"] for j in pending] == ["X"]
+    assert [j["out"].read_text() for j in jobs] == ["X", "A", "B", "A", "A"]
@@ -0,0 +1,64 @@
+# tests/test_lesson_pipeline.py
+
+import shutil
+
+import pytest
+
+from benchmarks.mock_speech import MockSpeechBackend
+from src import config
+from src.core.audio_postprocessor import AudioPostProcessor
+from src.core.ffmpeg_stream import FFMPEG
+from src.core.lesson_builder import plan_lesson
+from src.core.lesson_pipeline import build_lesson_pipelined
+from src.core.synthesis_cache import SynthesisCache
+from src.core.tts_engine import TTSEngine
+
+pytestmark = pytest.mark.skipif(shutil.which(FFMPEG) is None, reason="ffmpeg not installed")
+
+LESSON = """¿¿ Hola a todos.
+
+Good morning. / Buenos días.
+
+See you later. / Hasta luego.
+
+Good morning. / Buenos días.
+"""
+
+
+@pytest.fixture
+def lesson(tmp_path, monkeypatch):
+    monkeypatch.setattr(config, "TRACE_ENABLED", False)
+    path = tmp_path / "lesson.txt"
+    path.write_text(LESSON, encoding="utf-8")
+    backend = MockSpeechBackend(latency_s=0.0, jitter_s=0.0)
+    tts = TTSEngine(backend=backend, voice="mock", cache=SynthesisCache(tmp_path / "cache"))
+
+    def build():
+        plan = plan_lesson(path, tts, output_root=tmp_path / "out")
+        return plan, build_lesson_pipelined(plan, tts, AudioPostProcessor())
+    return build
+
+
+def test_first_build_renders_every_output(lesson):
+    plan, result = lesson()
+    assert len(plan["pending"]) == 4
+    assert sorted(p.name for p in result["rendered"]) == [
+        "full_normal.mp3", "full_slow.mp3", "section_main_lesson.mp3", "section_spanish_intro.mp3",
+    ]
+
+
+def test_unchanged_rebuild_does_nothing(lesson):
+    lesson()
+    plan, result = lesson()
+    assert plan["pending"] == []
+    assert result["rendered"] == []
+
+
+def test_phrase_restored_from_cache_keeps_outputs_fresh(lesson):
+    plan, _ = lesson()
+    plan["normal_jobs"][1]["out"].unlink()
+
+    plan, result = lesson()
+    assert [job["text"] for job in plan["pending"]] == ["See you later."]
+    assert result["rendered"] == []
+    assert plan["normal_jobs"][1]["out"].exists()
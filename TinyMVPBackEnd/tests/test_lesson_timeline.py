@@ -0,0 +1,138 @@
+# tests/test_lesson_timeline.py
+
+import json
+import shutil
+import wave
+
+import numpy as np
+import pytest
+
+from src.core.ffmpeg_stream import FFMPEG, StreamingEncoder
+from src.core.lesson_timeline import (
+    build_timeline, layout_sections, load_layout, mp3_frame_index, timeline_path, wav_layout, write_timeline,
+)
+
+RATE = 24000
+needs_ffmpeg = pytest.mark.skipif(shutil.which(FFMPEG) is None, reason="ffmpeg not installed")
+
+# MPEG-1 Layer III, 128 kbps, 44.1 kHz, no padding: 144 * 128000 // 44100 = 417 bytes
+MPEG1_HEADER = bytes([0xFF, 0xFB, 0x90, 0x00])
+MPEG1_FRAME = 417
+
+
+def _write_wav(path, ms: int):
+    with wave.open(str(path), "wb") as w:
+        w.setnchannels(1)
+        w.setsampwidth(2)
+        w.setframerate(RATE)
+        w.writeframes(bytes(int(RATE * ms / 1000) * 2))
+
+
+def _layout():
+    return layout_sections([[1000, 500], [250]], [[300, 200], 100])
+
+
+def _texts():
+    return [[{"en": "one", "es": "uno"}, {"en": "two", "es": "dos"}], [{"en": "three", "es": "tres"}]]
+
+
+def test_layout_sections():
+    assert _layout() == [
+        {"start_ms": 0.0, "end_ms": 2000.0, "phrases": [[0.0, 1000.0], [1300.0, 1800.0]]},
+        {"start_ms": 2000.0, "end_ms": 2350.0, "phrases": [[2000.0, 2250.0]]},
+    ]
+
+
+def test_wav_layout(tmp_path):
+    path = tmp_path / "lesson.wav"
+    _write_wav(path, 100)
+    assert wav_layout(path) == (44, RATE, 2)
+
+    (tmp_path / "bad.wav").write_bytes(b"not a wav file")
+    with pytest.raises(ValueError):
+        wav_layout(tmp_path / "bad.wav")
+
+
+def test_wav_byte_offsets(tmp_path):
+    path = tmp_path / "lesson.wav"
+    _write_wav(path, 2350)
+
+    timeline = build_timeline(path, _layout(), ["intro", "main"], _texts())
+
+    assert timeline["fields"][:4] == ["start_ms", "end_ms", "byte_start", "byte_end"]
+    assert timeline["bytes"] == path.stat().st_size
+    starts = [(row[2], row[3]) for row in timeline["phrases"]]
+    assert starts == [
+        (44, 44 + RATE * 2 - 1),
+        (44 + int(1.3 * RATE) * 2, 44 + int(1.8 * RATE) * 2 - 1),
+        (44 + 2 * RATE * 2, 44 + int(2.25 * RATE) * 2 - 1),
+    ]
+    assert [s["first"] for s in timeline["sections"]] == [0, 2]
+
+
+def test_write_and_load_scaled_timeline(tmp_path):
+    path = tmp_path / "full_slow.wav"
+    _write_wav(path, 2350 * 2)
+
+    sidecar = write_timeline(path, _layout(), ["intro", "main"], _texts(), time_scale=2.0)
+
+    assert sidecar == timeline_path(path)
+    data = json.loads(sidecar.read_text(encoding="utf-8"))
+    assert data["duration_ms"] == 4700.0
+    assert data["phrases"][1][:2] == [2600.0, 3600.0]
+    assert load_layout(path) == _layout()
+
+
+def test_mp3_frame_index_of_hand_built_frames(tmp_path):
+    frame = MPEG1_HEADER + bytes(MPEG1_FRAME - 4)
+    id3 = b"ID3\x03\x00\x00\x00\x00\x00\x05" + bytes(5)
+    path = tmp_path / "frames.mp3"
+    path.write_bytes(id3 + frame + b"\x00\x00\x00" + frame + frame)     # junk between frames
+
+    index = mp3_frame_index(path)
+
+    first = len(id3)
+    assert index["sample_rate"] == 44100
+    assert index["samples_per_frame"] == 1152
+    assert index["delay_samples"] == 0
+    assert index["offsets"] == [first, first + MPEG1_FRAME + 3, first + 2 * MPEG1_FRAME + 3]
+
+
+@needs_ffmpeg
+def test_mp3_frame_index_of_encoded_audio(tmp_path):
+    path = tmp_path / "lesson.mp3"
+    t = np.arange(RATE) / RATE
+    with StreamingEncoder(path, frame_rate=RATE, codec_args=["-b:a", "64k"]) as enc:
+        enc.write((8000 * np.sin(2 * np.pi * 220 * t)).astype("<i2").tobytes())
+
+    index = mp3_frame_index(path)
+    data = path.read_bytes()
+    offsets = index["offsets"]
+
+    assert index["sample_rate"] == RATE
+    assert index["samples_per_frame"] == 576          # MPEG-2 Layer III
+    assert index["delay_samples"] > 0                 # from the Info frame's LAME tag
+    assert all(data[o] == 0xFF and data[o + 1] & 0xE0 == 0xE0 for o in offsets)
+    assert offsets == sorted(offsets) and offsets[-1] < len(data)
+    # Frames cover the audio plus encoder delay / padding, not much more
+    audio = len(offsets) * 576 - index["delay_samples"]
+    assert RATE <= audio <= RATE + 2 * 576
+
+
+@needs_ffmpeg
+def test_mp3_byte_offsets(tmp_path):
+    path = tmp_path / "lesson.mp3"
+    with StreamingEncoder(path, frame_rate=RATE, codec_args=["-b:a", "64k"]) as enc:
+        enc.write_silence(2350)
+
+    index = mp3_frame_index(path)
+    size = path.stat().st_size
+    rows = build_timeline(path, _layout(), ["intro", "main"], _texts())["phrases"]
+
+    for start_ms, end_ms, byte_start, byte_end, _, _ in rows:
+        assert byte_start in index["offsets"]
+        assert byte_start < byte_end <= size - 1
+    # Phrase ranges follow the audio; the first starts at the first audio frame
+    assert rows[0][2] == index["offsets"][0]
+    assert [r[2] for r in rows] == sorted(r[2] for r in rows)
+    assert rows[-1][3] == size - 1 or rows[-1][3] + 1 in index["offsets"]
@@ -0,0 +1,65 @@
+# tests/test_pause_planner.py
+
+import wave
+
+import pytest
+
+from src import config
+from src.core.pause_planner import PausePlanner, probe_duration_ms
+
+PROFILES = {
+    "intro": {"base_ms": 2000, "scale": 0.0},
+    "main": {"base_ms": 1000, "scale": 1.0, "min_ms": 2500, "max_ms": 9000},
+}
+
+
+def test_fixed_gap():
+    assert PausePlanner(PROFILES).plan_section("intro", [500, 3000, 12000]) == [2000, 2000, 2000]
+
+
+def test_scaled_pause_is_clamped():
+    planner = PausePlanner(PROFILES)
+    assert planner.pause_ms("main", 500) == 2500        # min_ms
+    assert planner.pause_ms("main", 3000) == 4000       # base + duration
+    assert planner.pause_ms("main", 20000) == 9000      # max_ms
+
+
+def test_default_profile_and_unknown_section():
+    assert PausePlanner({"default": {"base_ms": 700}}).pause_ms("anything", 1000) == 700
+    with pytest.raises(KeyError):
+        PausePlanner(PROFILES).pause_ms("missing", 1000)
+
+
+def test_plan_lesson_layout():
+    plan = PausePlanner(PROFILES).plan_lesson([("intro", [1000, 1000]), ("main", [3000])])
+    assert plan["pauses"] == [[2000, 2000], [4000]]
+    assert plan["duration_ms"] == plan["layout"][-1]["end_ms"]
+    assert plan["layout"][0]["start_ms"] == 0
+
+
+def test_estimate_from_text():
+    assert PausePlanner(PROFILES, estimate_ms_per_char=50).estimate_duration_ms("x" * 20) == 1000
+
+
+def test_default_profiles_are_the_fixed_gaps():
+    planner = PausePlanner(config.PAUSE_PROFILES)
+    for duration in (300, 2500, 15000):
+        assert planner.pause_ms("main_lesson", duration) == config.SILENCE_BETWEEN_PHRASES_MS
+        assert planner.pause_ms("spanish_intro", duration) == config.SILENCE_SPANISH_SECTION_MS
+
+
+def test_probe_wav(tmp_path):
+    path = tmp_path / "phrase.wav"
+    with wave.open(str(path), "wb") as w:
+        w.setnchannels(1)
+        w.setsampwidth(2)
+        w.setframerate(24000)
+        w.writeframes(bytes(2 * 36000))
+    assert probe_duration_ms(path) == pytest.approx(1500)
+
+
+def test_probe_unknown_format_is_none(tmp_path):
+    path = tmp_path / "phrase.ogg"
+    path.write_bytes(b"OggS")
+    assert probe_duration_ms(path) is None
+    assert probe_duration_ms(tmp_path / "missing.wav") is None
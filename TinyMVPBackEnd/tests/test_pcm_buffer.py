@@ -0,0 +1,61 @@
+# tests/test_pcm_buffer.py
+
+import numpy as np
+import pytest
+
+from src.core.pcm_buffer import PCMConcatenator
+
+
+def _pcm(*samples) -> bytes:
+    return np.array(samples, dtype="<i2").tobytes()
+
+
+def _samples(buf) -> list[int]:
+    return np.frombuffer(bytes(buf), dtype="<i2").tolist()
+
+
+def test_gaps_are_zero_frames_after_each_chunk():
+    cat = PCMConcatenator(frame_rate=1000)        # 1 ms = 1 frame
+    buf = cat.concat_raw([_pcm(1, 2), _pcm(3)], gaps_ms=2)
+
+    assert len(buf) == 4 + 2 + 2 * cat.silence_bytes(2)
+    assert _samples(buf) == [1, 2, 0, 0, 3, 0, 0]
+
+
+def test_gap_per_chunk():
+    cat = PCMConcatenator(frame_rate=1000)
+    assert _samples(cat.concat_raw([_pcm(1), _pcm(2), _pcm(3)], gaps_ms=[1, 0, 3])) == [1, 0, 2, 3, 0, 0, 0]
+
+    with pytest.raises(ValueError):
+        cat.concat_raw([_pcm(1), _pcm(2)], gaps_ms=[1])
+
+
+def test_silence_is_frame_aligned():
+    cat = PCMConcatenator(frame_rate=24000, channels=2)
+    assert cat.silence_bytes(1000) == 24000 * 4
+    assert cat.silence_bytes(0.05) == 4           # 1.2 frames -> 1 frame
+
+
+def test_trims_keep_only_the_frame_range():
+    cat = PCMConcatenator(frame_rate=1000)
+    buf = cat.concat_raw([_pcm(1, 2, 3, 4), _pcm(5, 6, 7)], gaps_ms=1, trims=[(1, 3), (0, 1)])
+    assert _samples(buf) == [2, 3, 0, 5, 0]
+
+
+def test_trims_are_frames_not_samples():
+    cat = PCMConcatenator(frame_rate=1000, channels=2)
+    buf = cat.concat_raw([_pcm(1, -1, 2, -2, 3, -3)], trims=[(1, 2)])
+    assert _samples(buf) == [2, -2]
+
+
+def test_gains_are_applied_and_clipped():
+    cat = PCMConcatenator(frame_rate=1000)
+    double = 20 * np.log10(2)
+    buf = cat.concat_raw([_pcm(100, -100, 20000), _pcm(100)], gaps_ms=1, gains_db=[double, 0.0])
+    assert _samples(buf) == [200, -200, 32767, 0, 100, 0]
+
+
+def test_gain_and_trim_together():
+    cat = PCMConcatenator(frame_rate=1000)
+    buf = cat.concat_raw([_pcm(10, 20, 30)], trims=[(1, 3)], gains_db=[-20 * np.log10(2)])
+    assert _samples(buf) == [10, 15]
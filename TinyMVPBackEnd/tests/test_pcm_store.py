@@ -0,0 +1,126 @@
+# tests/test_pcm_store.py
+
+import os
+import threading
+import time
+
+from src.core import pcm_store
+from src.core.pcm_store import PCMStore
+
+RATE = 24000
+PHRASE_BYTES = 4800     # 100 ms of 24 kHz mono
+
+
+class FakeDecoder:
+    """Decoder that records every call and what the store held at that moment."""
+
+    def __init__(self, store_ref: list):
+        self.store_ref = store_ref
+        self.calls = []
+
+    def __call__(self, sources, frame_rate, channels):
+        store = self.store_ref[0]
+        written = sum(1 for _ in store.root.glob("*/*.pcm"))
+        self.calls.append({"sources": list(sources), "written_before": written})
+        return [bytes([int(str(s).rsplit("_", 1)[1]) % 256]) * PHRASE_BYTES for s in sources]
+
+
+def make_store(tmp_path, batch_files):
+    ref = []
+    decoder = FakeDecoder(ref)
+    store = PCMStore(tmp_path / "store", decoder=decoder, batch_files=batch_files)
+    ref.append(store)
+    return store, decoder
+
+
+def items(n):
+    return [(f"phrase_{i}", f"{i:064x}") for i in range(n)]
+
+
+def test_prefetch_decodes_in_bounded_batches(tmp_path):
+    store, decoder = make_store(tmp_path, batch_files=8)
+    assert store.prefetch(items(30), RATE, 1) == 30
+
+    assert [len(c["sources"]) for c in decoder.calls] == [8, 8, 8, 6]
+    # Each batch is in the store before the next one is decoded
+    assert [c["written_before"] for c in decoder.calls] == [0, 8, 16, 24]
+
+
+def test_prefetch_skips_stored_entries(tmp_path):
+    store, decoder = make_store(tmp_path, batch_files=8)
+    store.prefetch(items(5), RATE, 1)
+    assert store.prefetch(items(12), RATE, 1) == 7
+    assert sum(len(c["sources"]) for c in decoder.calls) == 12
+
+
+def test_pcm_reads_back_prefetched_entry(tmp_path):
+    store, decoder = make_store(tmp_path, batch_files=4)
+    store.prefetch(items(3), RATE, 1)
+    view = store.pcm("phrase_2", f"{2:064x}", RATE, 1)
+    assert bytes(view) == bytes([2]) * PHRASE_BYTES
+    assert store.stats() == {"hits": 1, "misses": 3}
+
+
+def test_entries_are_per_format(tmp_path):
+    store, decoder = make_store(tmp_path, batch_files=4)
+    store.prefetch(items(2), RATE, 1)
+    assert store.prefetch(items(2), 48000, 1) == 2
+
+
+def test_truncated_entry_is_decoded_again(tmp_path):
+    store, decoder = make_store(tmp_path, batch_files=4)
+    store.prefetch(items(1), RATE, 1)
+    entry = store.path_for(f"{0:064x}", RATE, 1)
+    entry.write_bytes(entry.read_bytes()[:100])
+    assert store.prefetch(items(1), RATE, 1) == 1
+
+
+def test_prune_removes_least_recently_used(tmp_path):
+    store, decoder = make_store(tmp_path, batch_files=4)
+    store.prefetch(items(4), RATE, 1)
+    entry_size = store.path_for(f"{0:064x}", RATE, 1).stat().st_size
+    assert store.prune(max_bytes=2 * entry_size) == 2
+    assert store.total_bytes() == 2 * entry_size
+
+
+def test_threads_filling_the_same_entry(tmp_path):
+    def slow_decoder(sources, frame_rate, channels):
+        def chunks():
+            for _ in range(4):
+                time.sleep(0.005)
+                yield bytes([7]) * (PHRASE_BYTES // 4)
+        return chunks()
+
+    store = PCMStore(tmp_path / "store", decoder=slow_decoder)
+    start = threading.Barrier(8)
+    results, errors = [], []
+
+    def read():
+        start.wait()
+        try:
+            results.append(bytes(store.pcm("phrase_7", "7" * 64, RATE, 1)))
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=read) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert errors == []
+    assert results == [bytes([7]) * PHRASE_BYTES] * 8
+    assert list(store.root.glob("*/*.tmp")) == []
+
+
+def test_entry_stored_by_another_writer_is_a_hit(tmp_path, monkeypatch):
+    store, decoder = make_store(tmp_path, batch_files=4)
+    real_replace = os.replace
+
+    def lose_the_race(src, dst):
+        real_replace(src, dst)          # the other writer's rename lands first
+        raise FileNotFoundError(src)
+
+    monkeypatch.setattr(pcm_store.os, "replace", lose_the_race)
+    assert bytes(store.pcm("phrase_3", f"{3:064x}", RATE, 1)) == bytes([3]) * PHRASE_BYTES
+    assert list(store.root.glob("*/*.tmp")) == []
@@ -0,0 +1,134 @@
+# tests/test_pdf_ingest.py
+"""Pairing runs on text extracted from the course PDFs (tests/fixtures)."""
+
+from pathlib import Path
+
+from src.core import pdf_ingest
+from src.core.pdf_ingest import ingest_directory, lesson_text, phrases_from_text
+from src.core.phrase_parser import PhraseParser
+
+FIXTURES = Path(__file__).parent / "fixtures"
+
+
+def fixture_phrases(name: str) -> list[dict]:
+    return phrases_from_text((FIXTURES / f"{name}.txt").read_text(encoding="utf-8"))
+
+
+def sentences(phrases: list[dict]) -> list[dict]:
+    return [p for p in phrases if len(p["en"].split()) > 4]
+
+
+def test_contrast_pairs_line_up():
+    pairs = {p["en"]: p["es"] for p in fixture_phrases("contrast")}
+    assert pairs["It’s a small car, yet it’s surprisingly wide."] == \
+        "Es un coche pequeño, aún así es sorprendentemente ancho."
+    assert pairs["I bought the new phone, but I didn't like it that much."] == \
+        "Compré el nuevo teléfono, pero no me gustó tanto."
+    # The first sentence of the PDF starts the English run it belongs to
+    assert pairs["He’s quite tall, on the contrary his brother is short."].startswith("Él es bastante alto")
+
+
+def test_contrast_vocabulary():
+    pairs = {p["en"]: p["es"] for p in fixture_phrases("contrast")}
+    assert pairs["Even though"] == "Aunque, a pesar de que"
+    assert pairs["Nevertheless"] == "Sin embargo"
+
+
+def test_explanations_are_not_paired():
+    phrases = fixture_phrases("wanna_gonna")
+    assert all(not p["es"].startswith("En inglés") for p in phrases)
+    assert all(not p["en"].startswith("Casual") for p in phrases)
+
+
+def test_wanna_gonna_examples():
+    pairs = {p["en"]: p["es"] for p in fixture_phrases("wanna_gonna")}
+    assert pairs["They’re probably not gonna wanna listen to us."] == \
+        "Probablemente no van a querer escucharnos."
+    assert pairs["It’s gonna be fine. Don’t worry. Everything’s gonna work out."].startswith("Todo va a estar bien")
+    # "(cuz/'cause = because)" is a note, not part of the sentence
+    assert "She’s gonna wanna change this color. I’m sure, cuz I know her." in pairs
+
+
+def test_page_headers_and_labels_are_skipped():
+    phrases = sentences(fixture_phrases("zh_sound"))
+    assert all("zh" not in p["en"] for p in phrases)
+    assert all(not p["es"].endswith(":") for p in phrases)
+    pairs = {p["en"]: p["es"] for p in phrases}
+    assert pairs["It’s a casual dinner so I’m gonna wear casual clothes."] == \
+        "Es una cena informal, así que voy a llevar ropa informal."
+    assert pairs["In conclusion, I wouldn't do it."] == "En conclusión, yo no lo haría."
+
+
+def test_mismatched_runs_are_dropped():
+    text = "\n".join([
+        "I like this house a lot.",
+        "We went to the beach yesterday.",
+        "Me gusta mucho esta casa.",
+    ])
+    assert phrases_from_text(text) == []
+
+
+def test_diverging_lengths_are_dropped():
+    text = "\n".join([
+        "I like it.",
+        "We went to the beach yesterday.",
+        "Fuimos a la playa ayer por la tarde con todos los amigos del colegio y sus padres.",
+        "Me gusta.",
+    ])
+    assert phrases_from_text(text) == []
+
+
+def test_lesson_text_has_no_stray_slashes():
+    phrases = fixture_phrases("contrast")
+    parsed = PhraseParser().parse(lesson_text("Contrast", phrases))
+    assert len(parsed["phrases"]) == len({(p["en"], p["es"]) for p in phrases})
+    assert all("/" not in p["es"] for p in parsed["phrases"])
+
+
+# ----------------------------------------
+# Directory ingestion
+# ----------------------------------------
+def cache_text(cache_dir: Path, pdf: Path, text: str):
+    """Stores `text` as pdf's extracted text, so ingestion never opens it."""
+    pdf_ingest._write_json(pdf_ingest._cache_path(cache_dir, pdf_ingest.file_sha256(pdf)),
+                           {"text": text, "pages": 1})
+
+
+def make_dirs(tmp_path):
+    dirs = [tmp_path / d for d in ("pdf", "lessons", "cache")]
+    for d in dirs:
+        d.mkdir()
+    return dirs
+
+
+def test_unreadable_pdf_does_not_stop_ingestion(tmp_path):
+    pdf_dir, lesson_dir, cache_dir = make_dirs(tmp_path)
+    good = pdf_dir / "good.pdf"
+    good.write_bytes(b"good")
+    cache_text(cache_dir, good, (FIXTURES / "contrast.txt").read_text(encoding="utf-8"))
+    (pdf_dir / "broken.pdf").write_bytes(b"not a pdf")
+
+    rows = {r["pdf"]: r for r in ingest_directory(pdf_dir, lesson_dir, cache_dir, workers=1)}
+    assert rows["broken.pdf"]["error"]
+    assert not (lesson_dir / "broken.txt").exists()
+    assert rows["good.pdf"]["written"] and (lesson_dir / "good.txt").exists()
+
+
+def test_stale_lessons_are_removed(tmp_path):
+    pdf_dir, lesson_dir, cache_dir = make_dirs(tmp_path)
+    for name in ("kept", "emptied", "deleted"):
+        pdf = pdf_dir / f"{name}.pdf"
+        pdf.write_bytes(name.encode())
+        cache_text(cache_dir, pdf, (FIXTURES / "contrast.txt").read_text(encoding="utf-8"))
+    handwritten = lesson_dir / "mine.txt"
+    handwritten.write_text("Hello / Hola\n", encoding="utf-8")
+    ingest_directory(pdf_dir, lesson_dir, cache_dir, workers=1)
+
+    (pdf_dir / "deleted.pdf").unlink()
+    emptied = pdf_dir / "emptied.pdf"
+    emptied.write_bytes(b"emptied, new version")
+    cache_text(cache_dir, emptied, "Just a title page")
+    rows = {r["pdf"]: r for r in ingest_directory(pdf_dir, lesson_dir, cache_dir, workers=1)}
+
+    assert rows["emptied.pdf"]["removed"]
+    assert sorted(p.name for p in lesson_dir.glob("*.txt")) == ["kept.txt", "mine.txt"]
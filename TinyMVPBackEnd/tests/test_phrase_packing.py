@@ -0,0 +1,66 @@
+# tests/test_phrase_packing.py
+
+import numpy as np
+
+from src.core.phrase_packing import pack_text, silent_gaps, split_packed
+
+RATE = 24000
+
+
+def _tone(ms: float, freq: float = 200.0) -> np.ndarray:
+    t = np.arange(int(RATE * ms / 1000)) / RATE
+    return (8000 * np.sin(2 * np.pi * freq * t)).astype("<i2")
+
+
+def _silence(ms: float) -> np.ndarray:
+    return np.zeros(int(RATE * ms / 1000), dtype="<i2")
+
+
+def _speech(*parts) -> bytes:
+    """parts = ("tone", ms) / ("pause", ms) in order."""
+    return np.concatenate([_tone(ms) if kind == "tone" else _silence(ms) for kind, ms in parts]).tobytes()
+
+
+def test_pack_text_one_sentence_per_paragraph():
+    assert pack_text(["Hello", "How  are\nyou?", "Fine!"]) == "Hello.\n\nHow are you?\n\nFine!"
+
+
+def test_split_cuts_in_the_middle_of_each_pause():
+    pcm = _speech(("pause", 100), ("tone", 1000), ("pause", 400), ("tone", 2000),
+                  ("pause", 400), ("tone", 1000), ("pause", 100))
+    texts = ["one phrase", "a phrase twice as long", "one phrase"]
+
+    clips = split_packed(pcm, RATE, texts)
+
+    assert clips is not None and len(clips) == 3
+    assert b"".join(clips) == pcm
+    ms = [len(c) / 2 / RATE * 1000 for c in clips]
+    assert abs(ms[0] - 1300) <= 20        # lead-in + tone + half the pause
+    assert abs(ms[1] - 2400) <= 20
+    assert abs(ms[2] - 1300) <= 20
+
+
+def test_short_dips_are_not_sentence_breaks():
+    pcm = _speech(("tone", 800), ("pause", 60), ("tone", 800), ("pause", 300), ("tone", 1500))
+    gaps = silent_gaps(pcm, RATE)
+    assert len(gaps) == 1
+
+    clips = split_packed(pcm, RATE, ["first phrase here", "second one"])
+    assert clips is not None
+    assert abs(len(clips[0]) / 2 / RATE * 1000 - 1810) <= 20
+
+
+def test_single_text_is_returned_whole():
+    pcm = _speech(("tone", 500))
+    assert split_packed(pcm, RATE, ["only"]) == [pcm]
+
+
+def test_missing_pauses_fall_back():
+    pcm = _speech(("tone", 1000), ("pause", 300), ("tone", 1000))
+    assert split_packed(pcm, RATE, ["one", "two", "three"]) is None
+
+
+def test_disproportionate_clips_fall_back():
+    # The pause sits right after a tiny blip, not between the two texts
+    pcm = _speech(("tone", 100), ("pause", 300), ("tone", 3000))
+    assert split_packed(pcm, RATE, ["a long first sentence here", "and a second one"]) is None
@@ -0,0 +1,68 @@
+# tests/test_render_service.py
+
+import os
+import time
+
+from src.core.render_service import RenderService
+
+
+class StubEngine:
+    model = "stub"
+    voice = "v"
+    cache = None
+    max_concurrency = 2
+
+
+def finished_job(service, job_id: str, age_s: float, state: str = "done") -> dict:
+    folder = service.output_root / job_id
+    folder.mkdir()
+    (folder / "lesson.mp3").write_bytes(b"mp3")
+    (service.output_root / f"{job_id}.txt").write_text("Hello / Hola\n")
+    job = {"id": job_id, "state": state, "finished_at": time.time() - age_s}
+    service.jobs[job_id] = job
+    return job
+
+
+def make_service(tmp_path, **kwargs) -> RenderService:
+    return RenderService(StubEngine(), tmp_path, job_workers=1, render_workers=1, **kwargs)
+
+
+def test_expired_jobs_and_files_are_pruned(tmp_path):
+    service = make_service(tmp_path, job_ttl_s=60)
+    try:
+        finished_job(service, "old", age_s=120)
+        finished_job(service, "failed", age_s=120, state="failed")
+        finished_job(service, "new", age_s=1)
+        service.jobs["running"] = {"id": "running", "state": "rendering", "finished_at": None}
+
+        assert service.prune() == 2
+        assert sorted(service.jobs) == ["new", "running"]
+        assert not (tmp_path / "old").exists() and not (tmp_path / "old.txt").exists()
+        assert (tmp_path / "new" / "lesson.mp3").exists()
+    finally:
+        service.shutdown()
+
+
+def test_finished_jobs_are_capped(tmp_path):
+    service = make_service(tmp_path, max_jobs=2)
+    try:
+        for i in range(4):
+            finished_job(service, f"job{i}", age_s=10 - i)
+        assert service.prune() == 2
+        assert sorted(service.jobs) == ["job2", "job3"]
+        assert not (tmp_path / "job0").exists()
+    finally:
+        service.shutdown()
+
+
+def test_stale_folders_are_removed_at_startup(tmp_path):
+    (tmp_path / "leftover").mkdir()
+    (tmp_path / "leftover.txt").write_text("Hello / Hola\n")
+    (tmp_path / "recent").mkdir()
+    old = time.time() - 7200
+    os.utime(tmp_path / "leftover", (old, old))
+    os.utime(tmp_path / "leftover.txt", (old, old))
+
+    service = make_service(tmp_path, job_ttl_s=3600)
+    service.shutdown()
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["recent"]
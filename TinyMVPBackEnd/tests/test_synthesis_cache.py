@@ -0,0 +1,61 @@
+# tests/test_synthesis_cache.py
+
+import threading
+
+from src.core.synthesis_cache import SynthesisCache
+
+
+def put_bytes(cache, key: str, data: bytes, dests=()):
+    staging = cache.staging_path(key)
+    staging.write_bytes(data)
+    return cache.put(key, staging, meta={"suffix": ".mp3"}, dests=dests)
+
+
+def test_fetch_hit_and_miss(tmp_path):
+    cache = SynthesisCache(tmp_path / "cache")
+    put_bytes(cache, "a" * 64, b"audio")
+    assert cache.fetch("a" * 64, tmp_path / "out" / "p1.mp3").read_bytes() == b"audio"
+    assert cache.fetch("b" * 64, tmp_path / "out" / "p2.mp3") is None
+    assert not (tmp_path / "out" / "p2.mp3").exists()
+
+
+def test_entry_larger_than_cache_is_kept_until_next_insert(tmp_path):
+    cache = SynthesisCache(tmp_path / "cache", max_bytes=10)
+    put_bytes(cache, "a" * 64, b"x" * 100)
+    assert cache.fetch("a" * 64, tmp_path / "p1.mp3") is not None
+
+    put_bytes(cache, "b" * 64, b"y" * 5)
+    assert cache.fetch("a" * 64, tmp_path / "p2.mp3") is None
+    assert cache.fetch("b" * 64, tmp_path / "p3.mp3") is not None
+
+
+def test_put_places_destinations_before_eviction(tmp_path):
+    cache = SynthesisCache(tmp_path / "cache", max_bytes=10)
+    dests = [tmp_path / "lesson1" / "p.mp3", tmp_path / "lesson2" / "p.mp3"]
+    put_bytes(cache, "a" * 64, b"x" * 8, dests=dests)
+    put_bytes(cache, "b" * 64, b"y" * 8)        # evicts "a"
+    assert [d.read_bytes() for d in dests] == [b"x" * 8] * 2
+
+
+def test_concurrent_put_and_fetch(tmp_path):
+    cache = SynthesisCache(tmp_path / "cache", max_bytes=64)
+    errors = []
+
+    def worker(n):
+        try:
+            for i in range(50):
+                key = f"{n}{i:03d}".ljust(64, "0")
+                put_bytes(cache, key, bytes([n]) * 16)
+                out = tmp_path / f"w{n}" / f"{i}.mp3"
+                if cache.fetch(key, out) is not None:
+                    assert out.read_bytes() == bytes([n]) * 16
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(6)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert errors == []
+    assert cache.total_bytes() <= 64
@@ -0,0 +1,65 @@
+# tests/test_time_stretch.py
+
+import numpy as np
+import pytest
+
+from src.core.time_stretch import WSOLAStretcher, float_to_pcm, pcm_to_float, stretch_pcm
+
+RATE = 24000
+
+
+def _sine(freq: float, seconds: float, amplitude: float = 0.5) -> bytes:
+    t = np.arange(int(RATE * seconds)) / RATE
+    return float_to_pcm((amplitude * np.sin(2 * np.pi * freq * t))[:, None])
+
+
+def _dominant_hz(pcm: bytes) -> float:
+    x = pcm_to_float(pcm)[:, 0]
+    spectrum = np.abs(np.fft.rfft(x * np.hanning(len(x))))
+    return float(np.fft.rfftfreq(len(x), 1 / RATE)[np.argmax(spectrum)])
+
+
+def test_output_length_follows_factor():
+    pcm = _sine(220, 2.0)
+    frames = len(pcm) // 2
+    out = stretch_pcm(pcm, [0.9, 0.75, 1.25], frame_rate=RATE)
+
+    assert set(out) == {0.9, 0.75, 1.25}
+    for factor, stretched in out.items():
+        assert len(stretched) % 2 == 0
+        assert abs(len(stretched) // 2 - frames / factor) <= RATE * 0.04     # within one 40 ms frame
+
+
+def test_pitch_is_preserved():
+    pcm = _sine(220, 2.0)
+    out = stretch_pcm(pcm, [0.75], frame_rate=RATE)[0.75]
+
+    # Resampling to the same length would move it to 165 Hz
+    assert _dominant_hz(pcm) == pytest.approx(220, abs=2)
+    assert _dominant_hz(out) == pytest.approx(220, abs=2)
+
+
+def test_block_size_does_not_change_length():
+    pcm = _sine(330, 1.5)
+    whole = stretch_pcm(pcm, [0.8], frame_rate=RATE)[0.8]
+    blocks = stretch_pcm(pcm, [0.8], frame_rate=RATE, block_frames=1000)[0.8]
+    assert abs(len(whole) - len(blocks)) <= 2 * RATE * 0.04
+
+
+def test_factor_must_be_positive():
+    with pytest.raises(ValueError):
+        WSOLAStretcher(0)
+    with pytest.raises(ValueError):
+        WSOLAStretcher(-0.5)
+
+
+def test_pcm_float_round_trip():
+    pcm = np.array([0, 1000, -1000, 32767, -32768], dtype="<i2").tobytes()
+    samples = pcm_to_float(pcm)
+    assert samples.shape == (5, 1)
+    assert float_to_pcm(samples) == pcm
+
+
+def test_stereo_layout():
+    pcm = np.array([1, -1, 2, -2], dtype="<i2").tobytes()
+    assert pcm_to_float(pcm, channels=2).shape == (2, 2)
@@ -0,0 +1,103 @@
+# tests/test_tts_engine.py
+
+import threading
+import time
+
+from src.core.synthesis_cache import SynthesisCache
+from src.core.tts_backends import TTSBackend
+from src.core.tts_engine import TTSEngine
+
+
+class CountingBackend(TTSBackend):
+    """Writes a stub file per phrase and records the most requests ever in flight."""
+
+    model_id = "counting"
+
+    def __init__(self, latency_s: float = 0.05):
+        self.latency_s = latency_s
+        self.in_flight = 0
+        self.peak = 0
+        self.texts = []
+        self._lock = threading.Lock()
+
+    def synthesize_to_file(self, text, voice, target, instructions=None):
+        with self._lock:
+            self.texts.append(text)
+            self.in_flight += 1
+            self.peak = max(self.peak, self.in_flight)
+        time.sleep(self.latency_s)
+        target.write_bytes(text.encode())
+        with self._lock:
+            self.in_flight -= 1
+
+
+def phrase_jobs(root, prefix, n):
+    return [{"text": f"{prefix} phrase {i}", "out": root / f"{prefix}_{i:02d}.mp3"} for i in range(n)]
+
+
+def test_one_caller_uses_the_whole_budget(tmp_path):
+    backend = CountingBackend()
+    tts = TTSEngine(backend=backend, voice="v", max_concurrency=4)
+    results = tts.synthesize_many(phrase_jobs(tmp_path, "a", 12))
+    assert all(r["path"].read_text() == f"a phrase {i}" for i, r in enumerate(results))
+    assert backend.peak == 4
+
+
+def test_concurrent_callers_share_the_budget(tmp_path):
+    backend = CountingBackend()
+    tts = TTSEngine(backend=backend, voice="v", max_concurrency=4)
+    threads = [
+        threading.Thread(target=tts.synthesize_many, args=(phrase_jobs(tmp_path, f"job{n}", 8),))
+        for n in range(3)
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert backend.peak == 4
+    assert len(list(tmp_path.glob("*.mp3"))) == 24
+
+
+def test_views_share_the_budget(tmp_path):
+    backend = CountingBackend()
+    tts = TTSEngine(backend=backend, voice="v", max_concurrency=2)
+    other = tts.view(voice="w")
+    threads = [
+        threading.Thread(target=engine.synthesize_many, args=(phrase_jobs(tmp_path, name, 6),))
+        for name, engine in (("en", tts), ("es", other))
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert backend.peak == 2
+
+
+def repeated_jobs(root):
+    texts = ["hello", "bye", "hello", "again", "hello", "bye"]
+    jobs = [{"text": t, "out": root / f"phrase_{i:02d}.mp3"} for i, t in enumerate(texts)]
+    jobs.append({"text": "hello", "out": root / "other_voice.mp3", "voice": "w"})
+    return texts + ["hello"], jobs
+
+
+def test_repeated_phrases_are_requested_once(tmp_path):
+    backend = CountingBackend(latency_s=0.01)
+    tts = TTSEngine(backend=backend, voice="v", max_concurrency=6)
+    texts, jobs = repeated_jobs(tmp_path)
+
+    results = tts.synthesize_many(jobs)
+
+    assert sorted(backend.texts) == ["again", "bye", "hello", "hello"]     # "hello" once per voice
+    assert [r["path"] for r in results] == [job["out"] for job in jobs]
+    assert [r["path"].read_text() for r in results] == texts
+    assert sum(not r["cached"] for r in results) == 4
+
+
+def test_repeated_phrases_with_cache(tmp_path):
+    backend = CountingBackend(latency_s=0.01)
+    tts = TTSEngine(backend=backend, voice="v", cache=SynthesisCache(tmp_path / "cache"))
+    texts, jobs = repeated_jobs(tmp_path / "out")
+
+    tts.synthesize_many(jobs)
+    assert len(backend.texts) == 4
+    assert [job["out"].read_text() for job in jobs] == texts